@@ -1,35 +1,108 @@
-# A simple script to run benchmark programs and visualize the data.
-# Assumes that the benchmark program has already been built.
+# A simple script to run benchmark programs, record and compare their timings,
+# and visualize the data. Assumes that the benchmark programs have already
+# been built.
+#
+# Examples:
+#   python analyze.py run -a                      # run, store and plot all
+#   python analyze.py run poisson_benchmark -r 10
+#   python analyze.py compare <baseline-commit>   # HEAD vs baseline
+#   python analyze.py plot gaussian_benchmark     # re-plot from docs/data
 
 import argparse
-import matplotlib.pyplot as plt
+import os
+import sys
+
+import pandas as pd
+
+import harness
 import path_names
-import analyze_binomial_benchmark as abb
-import analyze_gaussian_benchmark as agb
-import analyze_binomial_two_class_benchmark as btcb
-
-parser = argparse.ArgumentParser(description='Collects data and produces plots of benchmark programs.')
-parser.add_argument('bench_names', nargs='*',
-                    help='list of benchmark program names to analyze.')
-parser.add_argument('-a', action='store_const', const=True,
-                    help='analyze all benchmark programs in build/release/benchmark.')
-args = parser.parse_args()
-
-if len(args.bench_names) == 0 and not args.a:
-    raise RuntimeError(
-        'At least one benchmark name must be specified if -a is not specified.')
-
-# Dictionary of bench name to module name
-bench_to_module = {
-    abb.TESTNAME : abb,
-    agb.TESTNAME : agb,
-    btcb.TESTNAME : btcb
-}
-
-mods = [bench_to_module[bench_name] for bench_name in args.bench_names]
-for mod in mods:
-    mod.plot(mod.run(path_names.bench_dir,
-                     path_names.data_dir,
-                     path_names.ref_dir,
-                     path_names.data_scr_dir),
-             path_names.fig_dir)
+
+
+def run(args):
+    names = harness.discover(args.bench_dir) if args.a else args.bench_names
+    if len(names) == 0:
+        raise RuntimeError(
+            'At least one benchmark name must be specified if -a is not specified.')
+
+    ctx = harness.context(os.path.dirname(os.path.abspath(args.bench_dir)))
+    if ctx['dirty']:
+        print('Warning: working tree has uncommitted changes; results are '
+              'stored under {c}, apart from the clean commit.'.format(c=ctx['commit']))
+    for name in names:
+        df = harness.run(name, args.bench_dir, repetitions=args.repetitions,
+                         bench_filter=args.filter)
+        harness.append(df, ctx, args.store)
+        if not args.no_plot:
+            rel = harness.relative(df)
+            rel.to_csv(os.path.join(path_names.data_dir, name + '.csv'))
+            harness.plot(rel, name, path_names.fig_dir)
+
+
+def compare(args):
+    store = harness.load(args.store)
+    if store.empty:
+        raise RuntimeError('Results store {s} is empty.'.format(s=args.store))
+    candidate = args.candidate or harness.context()['commit']
+    df = harness.compare(store, args.baseline, candidate, machine=args.machine,
+                         significance=args.significance,
+                         tolerance=args.tolerance)
+    if args.benchmark:
+        df = df[df['benchmark'].isin(args.benchmark)]
+
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        print(df.sort_values('ratio', ascending=False).to_string(index=False))
+    regressions = df[df['regression']]
+    print('{r} of {t} configurations regressed.'.format(r=len(regressions), t=len(df)))
+    return 1 if len(regressions) else 0
+
+
+def plot(args):
+    for name in args.bench_names:
+        df = pd.read_csv(os.path.join(path_names.data_dir, name + '.csv'), index_col=0)
+        harness.plot(df, name, path_names.fig_dir)
+
+
+parser = argparse.ArgumentParser(
+    description='Collects data, detects regressions and produces plots of benchmark programs.')
+parser.add_argument('--store', default=path_names.store_path,
+                    help='csv results store (default: %(default)s).')
+subparsers = parser.add_subparsers(dest='command', required=True)
+
+run_parser = subparsers.add_parser('run', help='run benchmarks and store their results.')
+run_parser.add_argument('bench_names', nargs='*',
+                        help='list of benchmark program names to analyze.')
+run_parser.add_argument('-a', action='store_const', const=True,
+                        help='analyze all benchmark programs in build/release/benchmark.')
+run_parser.add_argument('-r', '--repetitions', type=int, default=5,
+                        help='repetitions per configuration (default: %(default)s).')
+run_parser.add_argument('--filter', default=None,
+                        help='Google Benchmark filter on the run names.')
+run_parser.add_argument('--bench-dir', default=path_names.bench_dir,
+                        help='directory of the built benchmark programs.')
+run_parser.add_argument('--no-plot', action='store_true',
+                        help='only store results; leave docs/data and docs/figs alone.')
+run_parser.set_defaults(func=run)
+
+compare_parser = subparsers.add_parser(
+    'compare', help='flag significant slowdowns of a commit relative to a baseline.')
+compare_parser.add_argument('baseline', help='baseline commit.')
+compare_parser.add_argument('candidate', nargs='?', default=None,
+                            help='candidate commit (default: HEAD).')
+compare_parser.add_argument('--machine', default=None,
+                            help='machine id to compare on (default: this machine).')
+compare_parser.add_argument('--benchmark', nargs='*', default=None,
+                            help='restrict the comparison to these benchmark programs.')
+compare_parser.add_argument('--significance', type=float, default=0.01,
+                            help='p-value threshold (default: %(default)s).')
+compare_parser.add_argument('--tolerance', type=float, default=0.05,
+                            help='ignored relative slowdown (default: %(default)s).')
+compare_parser.set_defaults(func=compare)
+
+plot_parser = subparsers.add_parser('plot', help='re-plot stored docs/data tables.')
+plot_parser.add_argument('bench_names', nargs='+',
+                         help='list of benchmark program names to plot.')
+plot_parser.set_defaults(func=plot)
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    sys.exit(args.func(args))
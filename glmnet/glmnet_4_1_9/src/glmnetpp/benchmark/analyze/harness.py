@@ -0,0 +1,270 @@
+# A reusable harness around the glmnetpp benchmark programs.
+#
+# Every benchmark program registers a `glmnetpp` and a `legacy` variant of the
+# same fixture, so a Google Benchmark run name looks like
+#
+#     <fixture>/<engine>/<arg0>/<arg1>/...
+#
+# The harness uses that convention to run any benchmark program without a
+# dedicated analyzer, appends the raw repetitions to a results store keyed by
+# commit, machine and configuration, and compares two commits measured on the
+# same machine to flag statistically significant slowdowns.
+
+import io
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+# Suffixes Google Benchmark appends to aggregate rows when repetitions > 1.
+AGGREGATE_SUFFIXES = ('_mean', '_median', '_stddev', '_cv')
+
+# Columns that Google Benchmark always emits in csv format.
+RESERVED_COLUMNS = ('name', 'iterations', 'real_time', 'cpu_time', 'time_unit',
+                    'bytes_per_second', 'items_per_second', 'label',
+                    'error_occurred', 'error_message')
+
+# Conversion factors from the reported time unit to seconds.
+TIME_UNITS = {'ns': 1e-9, 'us': 1e-6, 'ms': 1e-3, 's': 1.}
+
+# Engine names as they appear in benchmark names, and the column names used
+# for them in docs/data.
+ENGINES = {'legacy': 'glmnet', 'glmnetpp': 'glmnetpp'}
+
+# Appended to the commit of runs made from a working tree with uncommitted
+# changes.
+DIRTY_SUFFIX = '-dirty'
+
+# Columns identifying a single stored measurement series.
+KEY_COLUMNS = ['machine', 'benchmark', 'engine', 'config']
+
+
+# Returns the sorted names of all benchmark programs in bench_dir.
+# A benchmark program is any executable file whose name ends in _benchmark.
+def discover(bench_dir):
+    names = []
+    for name in os.listdir(bench_dir):
+        path = os.path.join(bench_dir, name)
+        if (name.endswith('_benchmark') and os.path.isfile(path)
+                and os.access(path, os.X_OK)):
+            names.append(name)
+    return sorted(names)
+
+
+# Returns a dictionary describing the commit and machine a run belongs to.
+# repo_dir is any directory inside the git repository being measured.
+# Runs of a working tree with uncommitted changes are keyed '<sha>-dirty', so
+# they never mix with the measurements of the clean commit.
+def context(repo_dir='.'):
+    def git(*args):
+        try:
+            out = subprocess.check_output(('git',) + args, cwd=repo_dir,
+                                          stderr=subprocess.DEVNULL)
+            return out.decode('utf-8').strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ''
+
+    commit = git('rev-parse', 'HEAD') or 'unknown'
+    dirty = bool(git('status', '--porcelain', '--untracked-files=no'))
+    if dirty:
+        commit += DIRTY_SUFFIX
+    machine = '{node}-{arch}-{ncpu}cpu'.format(node=platform.node(),
+                                               arch=platform.machine(),
+                                               ncpu=os.cpu_count())
+    return {
+        'commit': commit,
+        'dirty': dirty,
+        'machine': machine,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+
+
+# Parses the csv output of one benchmark program into one row per repetition.
+# Columns: benchmark, fixture, engine, config, repetition, real_time, cpu_time
+# (both in seconds) and counters (a json string of the user counters).
+def parse(csv_text, bench_name):
+    # Google Benchmark may print context lines before the csv header.
+    lines = csv_text.splitlines()
+    start = next(i for i, line in enumerate(lines) if line.startswith('name,'))
+    df = pd.read_csv(io.StringIO('\n'.join(lines[start:])), sep=',')
+
+    df = df[~df['name'].str.endswith(AGGREGATE_SUFFIXES)]
+    if 'error_occurred' in df:
+        # pandas reads the flag as bool when every row is set and as object
+        # (True/NaN) or float when some are missing, so compare its text.
+        failed = df['error_occurred'].astype(str).str.lower().isin(('true', '1', '1.0'))
+        df = df[~failed]
+
+    parts = df['name'].str.split('/')
+    counter_cols = [c for c in df.columns if c not in RESERVED_COLUMNS]
+    scale = df['time_unit'].map(TIME_UNITS)
+
+    out = pd.DataFrame({
+        'benchmark': bench_name,
+        'fixture': parts.str[0],
+        'engine': parts.str[1],
+        'config': parts.str[0] + '/' + parts.str[2:].str.join('/'),
+        'real_time': df['real_time'] * scale,
+        'cpu_time': df['cpu_time'] * scale,
+        'counters': df[counter_cols].apply(
+            lambda row: json.dumps({k: float(v) for k, v in row.items()
+                                    if k != 'glmnetpp' and pd.notna(v)},
+                                   sort_keys=True),
+            axis=1) if counter_cols else '{}',
+    })
+    out['repetition'] = out.groupby(['engine', 'config']).cumcount()
+    return out.reset_index(drop=True)
+
+
+# Runs one benchmark program and returns its parsed repetitions.
+# bench_dir     directory to glmnetpp benchmark program (e.g. build/release/benchmark)
+# repetitions   number of repetitions per configuration (samples for the tests)
+# bench_filter  optional Google Benchmark regular expression on the run names
+def run(bench_name, bench_dir, repetitions=5, bench_filter=None):
+    bench_path = os.path.abspath(os.path.join(bench_dir, bench_name))
+    print('Benchmark path: {p}'.format(p=bench_path))
+
+    args = [bench_path, '--benchmark_format=csv',
+            '--benchmark_repetitions={r}'.format(r=repetitions)]
+    if bench_filter:
+        args.append('--benchmark_filter={f}'.format(f=bench_filter))
+    data = subprocess.check_output(args, cwd=bench_dir).decode('utf-8')
+    return parse(data, bench_name)
+
+
+# Appends measurements to the csv store at store_path, tagged with ctx.
+# The store is created (including its directory) on first use.
+def append(df, ctx, store_path):
+    df = df.copy()
+    for key, value in ctx.items():
+        df[key] = value
+    columns = ['commit', 'dirty', 'machine', 'timestamp', 'benchmark',
+               'fixture', 'engine', 'config', 'repetition', 'real_time',
+               'cpu_time', 'counters']
+    store_dir = os.path.dirname(store_path)
+    if store_dir:
+        os.makedirs(store_dir, exist_ok=True)
+    exists = os.path.exists(store_path)
+    df[columns].to_csv(store_path, mode='a', header=not exists, index=False)
+    return df[columns]
+
+
+# Loads the csv store, or an empty frame if nothing was recorded yet.
+def load(store_path):
+    if not os.path.exists(store_path):
+        return pd.DataFrame()
+    return pd.read_csv(store_path, dtype={'commit': str, 'config': str})
+
+
+# Resolves a possibly abbreviated commit against the commits in the store.
+# '<sha>-dirty' only matches dirty runs and a plain sha only clean ones.
+def _resolve(store, commit):
+    commits = pd.Series(store['commit'].unique())
+    dirty = commit.endswith(DIRTY_SUFFIX)
+    if dirty:
+        commit = commit[:-len(DIRTY_SUFFIX)]
+    matches = commits[commits.str.startswith(commit)
+                      & (commits.str.endswith(DIRTY_SUFFIX) == dirty)]
+    if len(matches) != 1:
+        raise ValueError(
+            'Commit {c} matches {m} stored commits.'.format(c=commit, m=len(matches)))
+    return matches.iloc[0]
+
+
+# One-sided Welch t-test that the candidate samples are slower than the
+# baseline samples. Returns the p-value.
+def _slower_pvalue(baseline, candidate):
+    from scipy import stats
+    if len(baseline) < 2 or len(candidate) < 2:
+        return np.nan
+    if np.std(baseline) == 0 and np.std(candidate) == 0:
+        return 0. if np.mean(candidate) > np.mean(baseline) else 1.
+    return stats.ttest_ind(candidate, baseline, equal_var=False,
+                           alternative='greater').pvalue
+
+
+# Compares candidate against baseline measurements taken on the same machine.
+# store         frame returned by load()
+# baseline      baseline commit (may be abbreviated)
+# candidate     candidate commit (may be abbreviated)
+# machine       machine id; defaults to the current machine
+# significance  p-value below which a slowdown is considered significant
+# tolerance     relative slowdown of the median below which it is ignored
+# Returns one row per (benchmark, engine, config) with a boolean regression
+# column; configurations measured on only one side are dropped.
+def compare(store, baseline, candidate, machine=None, time_col='real_time',
+            significance=0.01, tolerance=0.05):
+    if machine is None:
+        machine = context()['machine']
+    store = store[store['machine'] == machine]
+    if store.empty:
+        raise ValueError('No stored results for machine {m}.'.format(m=machine))
+    baseline = _resolve(store, baseline)
+    candidate = _resolve(store, candidate)
+
+    base = store[store['commit'] == baseline].groupby(KEY_COLUMNS)[time_col]
+    cand = store[store['commit'] == candidate].groupby(KEY_COLUMNS)[time_col]
+    base_samples = dict(list(base))
+    rows = []
+    for key, samples in cand:
+        if key not in base_samples:
+            continue
+        b = base_samples[key].to_numpy()
+        c = samples.to_numpy()
+        ratio = np.median(c) / np.median(b)
+        pvalue = _slower_pvalue(b, c)
+        rows.append(dict(zip(KEY_COLUMNS, key),
+                         baseline=np.median(b), candidate=np.median(c),
+                         ratio=ratio, pvalue=pvalue,
+                         regression=bool(pvalue < significance
+                                         and ratio > 1. + tolerance)))
+    return pd.DataFrame(rows, columns=KEY_COLUMNS + [
+        'baseline', 'candidate', 'ratio', 'pvalue', 'regression'])
+
+
+# Reduces measurements of one benchmark to the glmnet/glmnetpp comparison
+# table stored in docs/data: one row per configuration with the median time
+# of each engine and their ratio. Counters become columns.
+def relative(df):
+    df = df.copy()
+    df['engine'] = df['engine'].map(ENGINES)
+    medians = (df.groupby(['config', 'engine'])['real_time'].median()
+                 .unstack('engine'))
+    counters = (df.groupby('config')['counters'].first()
+                  .apply(json.loads).apply(pd.Series))
+    out = counters.join(medians).reset_index(drop=True)
+    out['relative'] = out['glmnet'] / out['glmnetpp']
+    return out
+
+
+# Plots glmnet/glmnetpp relative time against p, one panel per combination
+# of the remaining counters. n is read from the data rather than assumed.
+def plot(df, bench_name, fig_dir):
+    import matplotlib.pyplot as plt
+
+    group_cols = [c for c in df.columns
+                  if c not in ('p', 'glmnet', 'glmnetpp', 'relative')]
+    grouped = df.groupby(group_cols) if group_cols else [((), df)]
+    groups = list(grouped)
+    ncols = min(2, len(groups))
+    nrows = int(np.ceil(len(groups) / ncols))
+    fig, axes = plt.subplots(nrows=nrows, ncols=ncols, figsize=(12, 3 * nrows),
+                             sharey=True, squeeze=False)
+
+    for ax in axes.flatten()[len(groups):]:
+        ax.set_visible(False)
+    for (key, group), ax in zip(groups, axes.flatten()):
+        key = key if isinstance(key, tuple) else (key,)
+        group.sort_values('p').plot(ax=ax, x='p', y='relative')
+        ax.set_title(', '.join('{k}={v:g}'.format(k=k, v=v)
+                               for k, v in zip(group_cols, key)))
+        ax.legend()
+        ax.set_ylabel('Relative Time')
+
+    plt.tight_layout()
+    plt.savefig(os.path.join(fig_dir, bench_name + '_fig.png'))
+    plt.close(fig)
@@ -3,3 +3,4 @@ bench_dir = '../../build/release/benchmark'
 data_dir = '../../docs/data'
 ref_dir = '../reference'
 data_scr_dir = '../data/script'
+store_path = '../store/benchmark_store.csv'
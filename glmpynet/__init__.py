@@ -1,3 +1,31 @@
 # In glmpynet/glmpynet/__init__.py
+#
+# Public names are imported lazily (PEP 562), so `import glmpynet` does not
+# import scikit-learn until an estimator is actually used.
 
-from .logistic_regression import LogisticRegression
+import importlib
+
+from ._version import __version__
+
+_LAZY_ATTRIBUTES = {
+    "ElasticNet": "glmpynet.elastic_net",
+    "GramAccumulator": "glmpynet.gram",
+    "LogisticRegression": "glmpynet.logistic_regression",
+    "fit_many": "glmpynet.batch",
+    "share": "glmpynet.shared",
+    "stability_path": "glmpynet.stability",
+}
+
+__all__ = ["__version__"] + sorted(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'glmpynet' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
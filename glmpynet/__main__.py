@@ -1,19 +1,305 @@
 """
 Main entry point for glmpynet.
+
+Runs file-based batch jobs::
+
+    python -m glmpynet fit --X X.npy --y y.npy --output model.glmpynet
+    python -m glmpynet cv --X train.svm --alpha-grid 0.5 1.0 --output model.glmpynet
+    python -m glmpynet predict --model model.glmpynet --X X.npy --output proba.npy
+
+Supported inputs are `.npy` files and CSC directories written by
+`glmpynet.storage.save_csc` (both memory-mapped), `.npz` archives (dense
+`X`/`y` arrays or a scipy sparse matrix), svmlight/libsvm files and parquet
+files. Every stage logs its wall time and the peak resident memory.
 """
+import argparse
 import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("glmpynet")
+
+SVMLIGHT_SUFFIXES = (".svm", ".svmlight", ".libsvm")
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MiB, or None if unavailable."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+@contextmanager
+def stage(name):
+    """Log the wall time and peak memory of a stage of a job."""
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    peak = _peak_rss_mb()
+    peak_str = "n/a" if peak is None else f"{peak:.1f} MiB"
+    logger.info("stage=%s elapsed=%.3fs peak_rss=%s", name, elapsed, peak_str)
+
+
+def load_data(path, target=None):
+    """
+    Load a design matrix and, if the file contains one, a target vector.
+
+    Parameters
+    ----------
+    path : str
+        Input file or CSC directory.
+    target : str, optional
+        Name of the target column of a parquet file.
+
+    Returns
+    -------
+    X : array-like or sparse matrix of shape (n_samples, n_features)
+    y : ndarray of shape (n_samples,) or None
+    """
+    import numpy as np
+
+    from .storage import open_csc, open_npy
+
+    lower = path.lower()
+    if os.path.isdir(path):
+        return open_csc(path), None
+    if lower.endswith(".npy"):
+        return open_npy(path), None
+    if lower.endswith(".npz"):
+        with np.load(path, allow_pickle=False) as archive:
+            if "format" in archive.files:
+                import scipy.sparse as sp
+
+                return sp.load_npz(path), None
+            if "X" not in archive.files:
+                raise ValueError(f"{path} must contain an array named 'X'.")
+            y = archive["y"] if "y" in archive.files else None
+            return archive["X"], y
+    if lower.endswith(SVMLIGHT_SUFFIXES):
+        from sklearn.datasets import load_svmlight_file
+
+        return load_svmlight_file(path)
+    if lower.endswith(".parquet"):
+        import pandas as pd
+
+        frame = pd.read_parquet(path)
+        if target is None:
+            return frame.to_numpy(dtype=np.float64), None
+        y = frame.pop(target).to_numpy()
+        return frame.to_numpy(dtype=np.float64), y
+    raise ValueError(f"Unsupported input format: {path}")
+
+
+def load_target(path):
+    """Load a target vector from a `.npy`/`.npz` file or a text file."""
+    import numpy as np
+
+    if path.lower().endswith(".npy"):
+        return np.load(path)
+    if path.lower().endswith(".npz"):
+        with np.load(path, allow_pickle=False) as archive:
+            return archive["y"]
+    return np.loadtxt(path)
+
+
+def _load_training_data(args):
+    with stage("load"):
+        X, y = load_data(args.X, target=args.target)
+        if args.y is not None:
+            y = load_target(args.y)
+        if y is None:
+            raise ValueError(
+                f"No target found in {args.X}; pass --y or --target."
+            )
+        logger.info("loaded X with shape %s from %s", X.shape, args.X)
+    return X, y
+
 
+def _estimator(args, **overrides):
+    from .logistic_regression import LogisticRegression
 
-def main():
+    params = dict(penalty=args.penalty, C=args.C, alpha=args.alpha, nlambda=args.nlambda,
+                  dfmax=args.dfmax, pmax=args.pmax, standardize=args.standardize)
+    params.update(overrides)
+    return LogisticRegression(**params)
+
+
+def _save(model, path):
+    with stage("save"):
+        model.save(path)
+        logger.info("wrote model to %s", path)
+
+
+def fit_command(args):
+    """Fit a single model and write it in the compact model format."""
+    X, y = _load_training_data(args)
+    with stage("fit"):
+        model = _estimator(args).fit(X, y)
+        logger.info("fitted %d lambdas, using lambda index %d",
+                    model.path_.n_lambdas, model.lambda_index_)
+    _save(model, args.output)
+    return 0
+
+
+def cv_command(args):
+    """Select hyperparameters by cross-validation and write the best model."""
+    from sklearn.model_selection import GridSearchCV
+
+    X, y = _load_training_data(args)
+    grid = {}
+    if args.alpha_grid:
+        grid["alpha"] = args.alpha_grid
+    if args.nlambda_grid:
+        grid["nlambda"] = args.nlambda_grid
+    if not grid:
+        raise ValueError("cv needs at least one of --alpha-grid, --nlambda-grid.")
+
+    with stage("cv"):
+        search = GridSearchCV(_estimator(args), grid, cv=args.folds,
+                              scoring=args.scoring, n_jobs=args.n_jobs)
+        if args.n_jobs is None or args.n_jobs == 1:
+            search.fit(X, y)
+        else:
+            # Workers attach to one published copy of X instead of each
+            # receiving their own, and fit folds as weights over it.
+            from .shared import share
+
+            with share(X) as shared:
+                search.fit(shared, y)
+        for params, score in zip(search.cv_results_["params"],
+                                 search.cv_results_["mean_test_score"]):
+            logger.info("params=%s mean_%s=%.5f", params, args.scoring, score)
+        logger.info("best params=%s", search.best_params_)
+    _save(search.best_estimator_, args.output)
+    return 0
+
+
+def predict_command(args):
+    """Score a file in row chunks and stream the results to the output file."""
+    import numpy as np
+    import scipy.sparse as sp
+    from scipy.special import expit
+
+    from .logistic_regression import LogisticRegression
+
+    with stage("load"):
+        model = LogisticRegression.load(args.model, mmap=True)
+        X, _ = load_data(args.X, target=args.target)
+        logger.info("loaded X with shape %s from %s", X.shape, args.X)
+
+    n_samples = X.shape[0]
+    proba = not args.labels
+    dtype = np.float64 if proba else np.asarray(model.classes_).dtype
+    with stage("predict"):
+        if args.output.lower().endswith(".npy"):
+            out = np.lib.format.open_memmap(args.output, mode="w+", dtype=dtype, shape=(n_samples,))
+            write = out.__setitem__
+        else:
+            out = open(args.output, "w")
+            fmt = "%.17g" if proba else "%s"
+
+            def write(rows, values):
+                np.savetxt(out, values, fmt=fmt)
+
+        try:
+            scorer = model.make_scorer()
+            scores = None
+            if sp.issparse(X) and X.format == "csc":
+                # Each row slice of a CSC matrix is a pass over all of its
+                # columns; one column-wise product scores every row instead.
+                scores = scorer.decision_function(X)
+            for start in range(0, n_samples, args.chunk_size):
+                rows = slice(start, min(start + args.chunk_size, n_samples))
+                if scores is None:
+                    chunk = X[rows]
+                    values = scorer.score(chunk) if proba else scorer.predict(chunk)
+                elif proba:
+                    values = expit(scores[rows])
+                else:
+                    values = scorer.classes[(scores[rows] > 0).astype(int)]
+                write(rows, values)
+        finally:
+            if isinstance(out, np.memmap):
+                out.flush()
+            else:
+                out.close()
+        logger.info("wrote %d %s to %s", n_samples,
+                    "probabilities" if proba else "labels", args.output)
+    return 0
+
+
+def _build_parser():
+    parser = argparse.ArgumentParser(prog="python -m glmpynet",
+                                     description="Batch jobs for glmpynet models.")
+    parser.add_argument("--log-level", default="INFO", help="logging level (default: INFO).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_data_args(p):
+        p.add_argument("--X", required=True, help="design matrix file or CSC directory.")
+        p.add_argument("--target", default=None, help="target column of a parquet input.")
+
+    def add_estimator_args(p):
+        p.add_argument("--y", default=None, help="target vector file (.npy, .npz or text).")
+        p.add_argument("--penalty", default="l2", choices=["l1", "l2"])
+        p.add_argument("--C", type=float, default=1.0)
+        p.add_argument("--alpha", type=float, default=None)
+        p.add_argument("--nlambda", type=int, default=100)
+        p.add_argument("--dfmax", type=int, default=None,
+                       help="stop the path once more features are nonzero.")
+        p.add_argument("--pmax", type=int, default=None,
+                       help="maximum number of features ever in the model.")
+        p.add_argument("--no-standardize", dest="standardize", action="store_false",
+                       help="fit on the raw feature scales.")
+        p.add_argument("--output", required=True, help="model file to write.")
+
+    fit = subparsers.add_parser("fit", help="fit a regularization path.")
+    add_data_args(fit)
+    add_estimator_args(fit)
+    fit.set_defaults(func=fit_command)
+
+    cv = subparsers.add_parser("cv", help="cross-validate hyperparameters.")
+    add_data_args(cv)
+    add_estimator_args(cv)
+    cv.add_argument("--alpha-grid", type=float, nargs="+", default=None)
+    cv.add_argument("--nlambda-grid", type=int, nargs="+", default=None)
+    cv.add_argument("--folds", type=int, default=5)
+    cv.add_argument("--scoring", default="roc_auc")
+    cv.add_argument("--n-jobs", type=int, default=None)
+    cv.set_defaults(func=cv_command)
+
+    predict = subparsers.add_parser("predict", help="score a file in row chunks.")
+    add_data_args(predict)
+    predict.add_argument("--model", required=True, help="model file written by fit or cv.")
+    predict.add_argument("--output", required=True,
+                         help="output file; .npy is written through a memory map, "
+                              "anything else as text.")
+    predict.add_argument("--chunk-size", type=int, default=65536,
+                         help="rows scored per chunk (default: 65536).")
+    predict.add_argument("--labels", action="store_true",
+                         help="write class labels instead of positive-class probabilities.")
+    predict.set_defaults(func=predict_command)
+    return parser
+
+
+def main(argv=None):
     """
     Initializes and runs the glmpynet workflow.
 
     """
+    args = _build_parser().parse_args(argv)
+
     # Configure the root logger for the application.
     logging.basicConfig(
-        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+        level=args.log_level.upper(), format="%(asctime)s - %(levelname)s - %(message)s"
     )
+    return args.func(args)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""
+This module contains `fit_many`, which fits many small, independent binomial
+models in one call, and the `ModelCollection` it returns.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.special import expit
+from sklearn.utils.multiclass import type_of_target, unique_labels
+from sklearn.utils.validation import check_consistent_length, check_X_y, column_or_1d
+
+from .binding import resolve_binding
+from .logistic_regression import LogisticRegression, _check_n_jobs, _check_path
+from .scoring import LogisticScorer
+from .shared import share
+
+# The data a `fit_many` worker process fits its groups on.
+_worker_state = {}
+
+
+class ModelCollection:
+    """
+    A compact, array-backed collection of binary logistic models, one per group.
+
+    Parameters
+    ----------
+    groups : ndarray of shape (n_groups,)
+        The sorted, unique group ids.
+    coef : ndarray of shape (n_groups, n_features)
+        Row `g` holds the coefficients of the model of `groups[g]`.
+    intercept : ndarray of shape (n_groups,)
+        The intercepts.
+    classes : ndarray of shape (2,)
+        The class labels shared by all models.
+    """
+
+    def __init__(self, groups, coef, intercept, classes):
+        self.groups_ = groups
+        self.coef_ = coef
+        self.intercept_ = intercept
+        self.classes_ = classes
+        self.n_features_in_ = coef.shape[1]
+
+    def __len__(self):
+        return self.groups_.shape[0]
+
+    def group_index(self, groups):
+        """
+        Map group ids to row positions in `coef_`.
+
+        Raises
+        ------
+        KeyError
+            If any group id was not fitted.
+        """
+        groups = np.asarray(groups)
+        index = np.searchsorted(self.groups_, groups)
+        index = np.minimum(index, len(self) - 1)
+        unknown = self.groups_[index] != groups
+        if np.any(unknown):
+            missing = np.unique(groups[unknown])
+            raise KeyError(f"No model was fitted for groups {missing[:10].tolist()}.")
+        return index
+
+    def decision_function(self, X, groups):
+        """
+        Linear decision function of each row under the model of its group.
+
+        Parameters
+        ----------
+        X : array-like of shape (n_samples, n_features), or sparse matrix
+        groups : array-like of shape (n_samples,)
+            The group id of each row.
+
+        Returns
+        -------
+        ndarray of shape (n_samples,)
+        """
+        groups = column_or_1d(groups)
+        check_consistent_length(X, groups)
+        index = self.group_index(groups)
+        if sp.issparse(X):
+            X = sp.csr_matrix(X)
+            self._check_n_features(X.shape[1])
+            rows = np.repeat(np.arange(X.shape[0]), np.diff(X.indptr))
+            products = X.data * self.coef_[index[rows], X.indices]
+            scores = np.bincount(rows, weights=products, minlength=X.shape[0])
+        else:
+            X = np.asarray(X, dtype=np.float64)
+            self._check_n_features(X.shape[1])
+            scores = np.einsum("ij,ij->i", X, self.coef_[index])
+        return scores + self.intercept_[index]
+
+    def _check_n_features(self, n_features):
+        if n_features != self.n_features_in_:
+            raise ValueError(
+                f"X has {n_features} features, but the models are expecting "
+                f"{self.n_features_in_} features as input."
+            )
+
+    def predict_proba(self, X, groups):
+        """
+        Probability estimates of each row under the model of its group.
+
+        Returns
+        -------
+        ndarray of shape (n_samples, 2)
+        """
+        p1 = expit(self.decision_function(X, groups))
+        return np.column_stack((1 - p1, p1))
+
+    def predict(self, X, groups):
+        """
+        Predict class labels of each row under the model of its group.
+        """
+        scores = self.decision_function(X, groups)
+        return self.classes_[(scores > 0).astype(int)]
+
+    def make_scorer(self, group):
+        """
+        Return a `LogisticScorer` for the model of a single group.
+        """
+        g = self.group_index([group])[0]
+        return LogisticScorer(self.coef_[g], self.intercept_[g], self.classes_)
+
+
+def fit_many(groups, X, y, *, penalty='l2', C=1.0, alpha=None, nlambda=100,
+             dfmax=None, pmax=None, standardize=True, binding=None, n_jobs=None):
+    """
+    Fit one binary logistic regression per group in a single call.
+
+    Parameters are validated and the data is checked once for all groups.
+    The rows are then gathered once so that every group is a contiguous
+    block. With `n_jobs`, the gathered matrix is published once with
+    `glmpynet.share` and the blocks are fitted in worker processes that
+    attach to it, since the bindings hold the GIL for much of a fit. Each
+    model uses the same lambda selection as `LogisticRegression`.
+
+    Parameters
+    ----------
+    groups : array-like of shape (n_samples,)
+        The group id of each row. Every group must contain both classes.
+    X : array-like of shape (n_samples, n_features), or sparse matrix
+    y : array-like of shape (n_samples,)
+        Binary target.
+    penalty, C, alpha, nlambda, dfmax, pmax, standardize, binding
+        As for `LogisticRegression`.
+    n_jobs : int, optional
+        Number of worker processes; -1 uses all CPUs and -2 all but one.
+        None runs the groups sequentially in this process.
+
+    Returns
+    -------
+    ModelCollection
+    """
+    template = LogisticRegression(penalty=penalty, C=C, alpha=alpha, nlambda=nlambda,
+                                  dfmax=dfmax, pmax=pmax, standardize=standardize,
+                                  binding=binding)
+    glmnet_params = template._validate_and_translate_params()
+    n_workers = _check_n_jobs(n_jobs)
+
+    X, y = check_X_y(X, y, accept_sparse="csr")
+    groups = column_or_1d(groups)
+    check_consistent_length(X, groups)
+    y_type = type_of_target(y)
+    if y_type != "binary":
+        raise ValueError(
+            "Only binary classification is supported. The type of the target "
+            f"is {y_type}."
+        )
+    classes = unique_labels(y)
+    if classes.shape[0] < 2:
+        raise ValueError("Classifier can't train when only one class is present.")
+
+    group_ids, inverse = np.unique(groups, return_inverse=True)
+    positives = np.bincount(inverse, weights=(y == classes[1]))
+    single_class = (positives == 0) | (positives == np.bincount(inverse))
+    if np.any(single_class):
+        raise ValueError(
+            f"Groups {group_ids[single_class][:10].tolist()} contain only one class; "
+            "every group needs both classes."
+        )
+
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.searchsorted(inverse[order], np.arange(len(group_ids) + 1))
+    X, y = X[order], y[order]
+
+    binding_ = resolve_binding(binding)
+    params = dict(alpha=glmnet_params['alpha'], nlambda=glmnet_params['nlambda'],
+                  dfmax=glmnet_params['dfmax'], pmax=glmnet_params['pmax'],
+                  standardize=glmnet_params['standardize'])
+    n_groups = len(group_ids)
+    if n_workers == 1:
+        state = dict(X=X, y=y, bounds=bounds, group_ids=group_ids, binding=binding_,
+                     params=params)
+        fitted = [_fit_group(state, g) for g in range(n_groups)]
+    else:
+        n_workers = min(n_workers, n_groups)
+        with share(X) as shared, ProcessPoolExecutor(
+                max_workers=n_workers, initializer=_start_worker,
+                initargs=(shared, y, bounds, group_ids, binding_, params)) as pool:
+            fitted = list(pool.map(_fit_in_worker, range(n_groups),
+                                   chunksize=max(1, n_groups // (4 * n_workers))))
+    intercept = np.array([a0 for a0, _ in fitted])
+    coef = np.vstack([beta for _, beta in fitted])
+
+    return ModelCollection(group_ids, coef, intercept, classes)
+
+
+def _start_worker(shared, y, bounds, group_ids, binding, params):
+    """Attach a pool worker to the shared design and keep what every fit needs."""
+    _worker_state.update(shared=shared, X=shared.matrix, y=y, bounds=bounds,
+                         group_ids=group_ids, binding=binding, params=params)
+
+
+def _fit_in_worker(g):
+    return _fit_group(_worker_state, g, copy=True)
+
+
+def _fit_group(state, g, copy=False):
+    """
+    Fit the model of the `g`-th group and return its selected intercept and coefficients.
+
+    With `copy`, the rows of the group are copied out of the shared matrix
+    first; a group is small, and bindings may not accept shared memory.
+    """
+    rows = slice(state["bounds"][g], state["bounds"][g + 1])
+    x = state["X"][rows]
+    if copy:
+        x = x.copy()
+    results = state["binding"].fit(x=x, y=state["y"][rows], **state["params"])
+    try:
+        path = _check_path(results, x.shape[1])
+    except RuntimeError as exc:
+        raise RuntimeError(
+            f"Fitting group {state['group_ids'].tolist()[g]!r} failed: {exc}") from exc
+    index = min(state["params"]["nlambda"] // 2, path.n_lambdas - 1)
+    return path.a0[index], path.coef(index)
@@ -0,0 +1,111 @@
+"""
+Registry of glmnet bindings (backends).
+
+Bindings are registered by name together with the dotted path of their
+class, and are only imported the first time they are requested. This keeps
+`import glmpynet` free of the compiled extension and of any heavy
+dependencies a backend might have.
+
+Built-in names:
+
+* ``"native"``: the compiled glmnetpp extension (`glmpynet._glmnet`).
+* ``"reference"``: a pure-NumPy implementation of glmnet's path algorithm.
+* ``"mock"``: an alias of the reference solver kept for existing tests.
+
+Third-party packages can provide additional bindings through the
+``glmpynet.bindings`` entry-point group; the entry-point name is the
+binding name and its value must point to a `GlmNetBinding` subclass.
+"""
+
+import importlib
+
+#: Entry-point group scanned for third-party bindings.
+ENTRY_POINT_GROUP = "glmpynet.bindings"
+
+#: Bindings tried, in order, when an estimator is created with ``binding=None``.
+DEFAULT_BINDINGS = ("native", "reference")
+
+_registry = {
+    "native": "glmpynet.binding.native:NativeGlmNetBinding",
+    "reference": "glmpynet.binding.reference:ReferenceGlmNetBinding",
+    "mock": "glmpynet.binding.mock:MockGlmNetBinding",
+}
+
+
+def register_binding(name, target):
+    """
+    Register a binding under `name`.
+
+    Parameters
+    ----------
+    name : str
+        The name used in ``LogisticRegression(binding=name)``.
+    target : str or type
+        Either a ``"module:attribute"`` path, imported on first use, or a
+        `GlmNetBinding` subclass.
+    """
+    _registry[name] = target
+
+
+def _entry_points():
+    from importlib.metadata import entry_points
+
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        return {ep.name: ep for ep in eps.select(group=ENTRY_POINT_GROUP)}
+    return {ep.name: ep for ep in eps.get(ENTRY_POINT_GROUP, [])}  # Python < 3.10
+
+
+def available_bindings():
+    """Return the sorted names of all registered and installed bindings."""
+    return sorted(set(_registry) | set(_entry_points()))
+
+
+def _load(target):
+    if isinstance(target, str):
+        module_name, _, attribute = target.partition(":")
+        return getattr(importlib.import_module(module_name), attribute)
+    return target
+
+
+def get_binding(name):
+    """
+    Import (on first use) and instantiate the binding registered as `name`.
+
+    Raises
+    ------
+    ValueError
+        If no binding with that name is registered or installed.
+    ImportError
+        If the binding is known but cannot be loaded on this platform.
+    """
+    if name not in _registry:
+        eps = _entry_points()
+        if name not in eps:
+            raise ValueError(
+                f"Unknown binding '{name}'. Available bindings: {available_bindings()}."
+            )
+        _registry[name] = eps[name].load()
+    binding_cls = _load(_registry[name])
+    _registry[name] = binding_cls
+    return binding_cls()
+
+
+def resolve_binding(binding):
+    """
+    Turn the value of an estimator's `binding` parameter into a binding instance.
+
+    `None` selects the first of `DEFAULT_BINDINGS` that can be loaded, a
+    string is looked up in the registry, and anything else is assumed to
+    already be a `GlmNetBinding`.
+    """
+    if binding is None:
+        for name in DEFAULT_BINDINGS[:-1]:
+            try:
+                return get_binding(name)
+            except ImportError:
+                continue
+        return get_binding(DEFAULT_BINDINGS[-1])
+    if isinstance(binding, str):
+        return get_binding(binding)
+    return binding
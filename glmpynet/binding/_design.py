@@ -0,0 +1,416 @@
+"""
+Design-matrix adapters used by the reference binding.
+
+The path algorithm only needs a handful of products with the (implicitly)
+standardized design matrix. Each adapter computes them from the raw data,
+so dense arrays, memory maps and sparse matrices are never centered,
+scaled or otherwise copied as a whole; dense products with a subset of the
+columns work through bounded row blocks.
+
+Products that take a `center` treat the columns as centered. Linear
+products subtract `center` times the sums of the other operand afterwards,
+which only loses about eps * offset in absolute terms. Second moments and
+Gram matrices subtract it from the columns of each block before
+multiplying instead: for features with large offsets (timestamps, IDs) the
+raw second moments are dominated by the offset and the corrections would
+cancel catastrophically.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+#: Number of elements gathered at a time from a dense design; bounds the
+#: temporaries of products with a subset of its columns (2 MB of float64).
+BLOCK_ELEMENTS = 2**18
+
+#: Linear products with more than this fraction of the columns of a dense
+#: design multiply with every column and select afterwards: a single BLAS
+#: call over the whole array is faster than gathering that many columns.
+GATHER_FRACTION = 0.1
+
+
+def _row_blocks(n_rows, n_cols):
+    """Yield slices of rows such that a block of `n_cols` columns stays small."""
+    step = max(1, BLOCK_ELEMENTS // max(n_cols, 1))
+    for start in range(0, n_rows, step):
+        yield slice(start, min(start + step, n_rows))
+
+
+class DenseDesign:
+    """
+    Products with a dense (possibly memory-mapped) design matrix.
+
+    Linear products with more than `GATHER_FRACTION` of the columns are
+    single BLAS calls on the array itself. Products with fewer columns, and
+    the centered Gram matrix, work on row blocks of about `BLOCK_ELEMENTS`
+    values, so the active columns are never copied as a whole.
+    """
+
+    def __init__(self, x):
+        self.x = x
+        self.n_samples, self.n_features = x.shape
+
+    def column_moments(self, w):
+        """Weighted column means and variances for weights summing to one."""
+        mean = self.x.T @ w
+        var = np.empty(self.n_features)
+        # Column blocks keep the temporary small for tall matrices.
+        step = max(1, BLOCK_ELEMENTS // max(self.n_samples, 1))
+        for start in range(0, self.n_features, step):
+            block = self.x[:, start:start + step] - mean[start:start + step]
+            var[start:start + step] = (block * block).T @ w
+        return mean, var
+
+    def _blocks(self, cols, center=None):
+        """Yield row slices and the matching rows of X[:, cols] - center."""
+        every = _is_every_column(cols, self.n_features)
+        for rows in _row_blocks(self.n_samples, len(cols)):
+            block = self.x[rows] if every else self.x[rows, cols]
+            yield rows, block if center is None else block - center
+
+    def rmatvec(self, u, cols=None, center=None):
+        """Return (X - center)' u, or (X[:, cols] - center)' u."""
+        if cols is None:
+            out = self.x.T @ u
+        elif len(cols) > GATHER_FRACTION * self.n_features:
+            out = (self.x.T @ u)[cols]
+        else:
+            out = np.zeros(len(cols))
+            for rows, block in self._blocks(cols):
+                out += block.T @ u[rows]
+        return out if center is None else out - center * u.sum()
+
+    def matvec(self, cols, beta, center=None):
+        """Return (X[:, cols] - center) @ beta."""
+        if len(cols) == 0:
+            return np.zeros(self.n_samples)
+        if len(cols) > GATHER_FRACTION * self.n_features:
+            full = np.zeros(self.n_features)
+            full[cols] = beta
+            out = self.x @ full
+        else:
+            out = np.empty(self.n_samples)
+            for rows, block in self._blocks(cols):
+                out[rows] = block @ beta
+        return out if center is None else out - center @ beta
+
+    def gram(self, cols, v, center=None):
+        """Return A' diag(v) A and A' v for A = X[:, cols] - center."""
+        m = len(cols)
+        xx = np.zeros((m, m))
+        xv = np.zeros(m)
+        for rows, block in self._blocks(cols, center):
+            weighted = block * v[rows, None]
+            xx += weighted.T @ block
+            xv += weighted.sum(axis=0)
+        return xx, xv
+
+    def grouped_sums(self, cols, v, codes, n_levels, center):
+        """Return the (n_levels, len(cols)) sums of v * (X[:, cols] - center) grouped by `codes`."""
+        out = np.empty((n_levels, len(cols)))
+        for i, j in enumerate(cols):
+            out[:, i] = np.bincount(codes, weights=v * (self.x[:, j] - center[i]),
+                                    minlength=n_levels)
+        return out
+
+
+class SparseDesign:
+    """
+    Products with a sparse design matrix, kept in CSC format.
+
+    Products with the design stay sparse and subtract `center` times the
+    sums of the other operand afterwards, which only loses about
+    eps * offset in absolute terms. The second moments and the Gram matrix,
+    where the offset would be squared, are centered before multiplying; the
+    Gram matrix over densified row blocks of the requested columns.
+    """
+
+    def __init__(self, x):
+        self.x = x.tocsc() if x.format != "csc" else x
+        self.n_samples, self.n_features = x.shape
+
+    def column_moments(self, w):
+        x = self.x
+        mean = x.T @ w
+        # Centered squares of the stored values, plus the implicit zeros,
+        # each of which contributes mean ** 2. The values share the index
+        # arrays of x; only the values are new.
+        column = np.repeat(np.arange(self.n_features), np.diff(x.indptr))
+        centered = sp.csc_matrix(((x.data - mean[column]) ** 2, x.indices, x.indptr),
+                                 shape=x.shape, copy=False)
+        pattern = sp.csc_matrix((np.ones_like(x.data), x.indices, x.indptr),
+                                shape=x.shape, copy=False)
+        # The weight of the implicit zeros; exactly zero for full columns,
+        # where the difference would only leave rounding error times mean ** 2.
+        zeros = np.where(np.diff(x.indptr) < self.n_samples,
+                         np.maximum(w.sum() - pattern.T @ w, 0.0), 0.0)
+        return mean, centered.T @ w + zeros * mean ** 2
+
+    def rmatvec(self, u, cols=None, center=None):
+        out = self.x.T @ u if cols is None else self.x[:, cols].T @ u
+        return out if center is None else out - center * u.sum()
+
+    def matvec(self, cols, beta, center=None):
+        if len(cols) == 0:
+            return np.zeros(self.n_samples)
+        out = self.x[:, cols] @ beta
+        return out if center is None else out - center @ beta
+
+    def gram(self, cols, v, center=None):
+        xs = self.x[:, cols].tocsr()
+        m = len(cols)
+        xx = np.zeros((m, m))
+        xv = np.zeros(m)
+        for rows in _row_blocks(self.n_samples, m):
+            block = xs[rows].toarray()
+            if center is not None:
+                block -= center
+            weighted = block * v[rows, None]
+            xx += weighted.T @ block
+            xv += weighted.sum(axis=0)
+        return xx, xv
+
+    def grouped_sums(self, cols, v, codes, n_levels, center):
+        x = self.x
+        out = np.empty((n_levels, len(cols)))
+        for i, j in enumerate(cols):
+            rows = x.indices[x.indptr[j]:x.indptr[j + 1]]
+            values = x.data[x.indptr[j]:x.indptr[j + 1]]
+            # Stored values minus the center, and -center on every implicit zero.
+            stored = np.bincount(codes[rows], weights=v[rows], minlength=n_levels)
+            out[:, i] = np.bincount(codes[rows], weights=v[rows] * (values - center[i]),
+                                    minlength=n_levels)
+            out[:, i] -= center[i] * (np.bincount(codes, weights=v, minlength=n_levels) - stored)
+        return out
+
+
+class CategoricalDesign:
+    """
+    A design whose categorical columns hold integer codes, expanded implicitly.
+
+    The expanded design has the columns of `x`, where the categorical columns
+    themselves are constant zero, followed by one indicator column per level
+    of each categorical column (levels 0 to the largest code). Products with
+    the indicators are grouped sums over the codes, so the one-hot matrix is
+    never built.
+    """
+
+    def __init__(self, design, categorical):
+        self.design = design
+        self.n_samples = design.n_samples
+        self.categorical = np.asarray(categorical, dtype=np.int64)
+        codes = _columns(design.x, self.categorical)
+        self.codes = [c.astype(np.int64) for c in codes.T]
+        self.n_levels = [int(c.max()) + 1 if len(c) else 0 for c in self.codes]
+        self.offsets = design.n_features + np.concatenate(([0], np.cumsum(self.n_levels)))
+        self.n_features = int(self.offsets[-1])
+
+    @property
+    def groups(self):
+        """The expanded column indices of the levels of each categorical column."""
+        return [np.arange(self.offsets[c], self.offsets[c + 1]) for c in range(len(self.codes))]
+
+    def _split(self, cols):
+        """
+        Split expanded column indices into numeric columns and (categorical, level) pairs.
+
+        Returns the positions in `cols` of the numeric columns of `x`, their
+        indices, and the positions and levels requested of each categorical.
+        The columns of the codes themselves are in neither; they are zero.
+        """
+        cols = np.asarray(cols, dtype=np.int64)
+        numeric = (cols < self.design.n_features) & ~np.isin(cols, self.categorical)
+        levels = []
+        for c in range(len(self.codes)):
+            in_c = (cols >= self.offsets[c]) & (cols < self.offsets[c + 1])
+            levels.append((np.flatnonzero(in_c), cols[in_c] - self.offsets[c]))
+        return np.flatnonzero(numeric), cols[numeric], levels
+
+    def column_moments(self, w):
+        mean, var = self.design.column_moments(w)
+        mean[self.categorical] = 0.0
+        var[self.categorical] = 0.0
+        level_means = [np.bincount(c, weights=w, minlength=k)
+                       for c, k in zip(self.codes, self.n_levels)]
+        # Indicators are their own squares.
+        return (np.concatenate([mean] + level_means),
+                np.concatenate([var] + [m * (w.sum() - m) for m in level_means]))
+
+    def rmatvec(self, u, cols=None, center=None):
+        every = cols is None
+        if every:
+            cols = np.arange(self.n_features)
+        raw_pos, raw, levels = self._split(cols)
+        out = np.zeros(len(cols))
+        if every:
+            full = self.design.rmatvec(u, None, None if center is None
+                                       else center[:self.design.n_features])
+            out[raw_pos] = full[raw]
+        else:
+            out[raw_pos] = self.design.rmatvec(u, raw, None if center is None else center[raw_pos])
+        for c, (pos, level) in enumerate(levels):
+            if len(pos):
+                out[pos] = np.bincount(self.codes[c], weights=u, minlength=self.n_levels[c])[level]
+        if center is not None:
+            # Indicator means are at most one, so they are centered afterwards.
+            shifted = _other_positions(raw_pos, len(cols))
+            out[shifted] -= center[shifted] * u.sum()
+        return out
+
+    def matvec(self, cols, beta, center=None):
+        raw_pos, raw, levels = self._split(cols)
+        out = self.design.matvec(raw, beta[raw_pos], None if center is None else center[raw_pos])
+        for c, (pos, level) in enumerate(levels):
+            if len(pos):
+                table = np.zeros(self.n_levels[c])
+                table[level] = beta[pos]
+                out = out + table[self.codes[c]]
+        if center is not None:
+            shifted = _other_positions(raw_pos, len(cols))
+            out -= center[shifted] @ beta[shifted]
+        return out
+
+    def gram(self, cols, v, center=None):
+        raw_pos, raw, levels = self._split(cols)
+        m = len(cols)
+        center = np.zeros(m) if center is None else np.asarray(center, dtype=np.float64)
+        # Products of the raw columns are centered blockwise; the indicators
+        # are centered below, from their uncentered products.
+        raw_center = center[raw_pos]
+        xx = np.zeros((m, m))
+        xv = np.zeros(m)
+        if len(raw):
+            xx_raw, xv_raw = self.design.gram(raw, v, raw_center)
+            xx[np.ix_(raw_pos, raw_pos)] = xx_raw
+            xv[raw_pos] = xv_raw
+        # Position of each row's level among the requested levels of each
+        # categorical, -1 for the other levels; sums over pairs of levels
+        # only visit rows whose levels are both requested.
+        positions = []
+        for c, (pos, level) in enumerate(levels):
+            lookup = np.full(self.n_levels[c], -1, dtype=np.int64)
+            lookup[level] = np.arange(len(level))
+            positions.append(lookup[self.codes[c]] if len(pos) else None)
+        for c, (pos, level) in enumerate(levels):
+            if not len(pos):
+                continue
+            counts = np.bincount(self.codes[c], weights=v, minlength=self.n_levels[c])
+            # Indicators of one categorical are disjoint: their block is diagonal.
+            xx[pos, pos] = counts[level]
+            xv[pos] = counts[level]
+            if len(raw):
+                # Rows of the other levels share one extra group, which is dropped.
+                codes = np.where(positions[c] >= 0, positions[c], len(level))
+                cross = self.design.grouped_sums(raw, v, codes, len(level) + 1,
+                                                 raw_center)[:-1]
+                xx[np.ix_(pos, raw_pos)] = cross
+                xx[np.ix_(raw_pos, pos)] = cross.T
+            for d in range(c):
+                other_pos, other_level = levels[d]
+                if not len(other_pos):
+                    continue
+                both = (positions[c] >= 0) & (positions[d] >= 0)
+                k = len(other_level)
+                cross = np.bincount(positions[c][both] * k + positions[d][both], weights=v[both],
+                                    minlength=len(level) * k).reshape(-1, k)
+                xx[np.ix_(pos, other_pos)] = cross
+                xx[np.ix_(other_pos, pos)] = cross.T
+        # Center the indicator (and zero) columns: with shifts d, zero for
+        # the numeric columns, sum v (a - d)(b - d)' = xx - xv d' - d xv' + sum(v) d d'.
+        shift = center.copy()
+        shift[raw_pos] = 0.0
+        if shift.any():
+            sv = v.sum()
+            xx += sv * np.outer(shift, shift) - np.outer(xv, shift) - np.outer(shift, xv)
+            xv -= sv * shift
+        return xx, xv
+
+
+def _other_positions(positions, n):
+    """Boolean mask of the positions in range(n) that are not in `positions`."""
+    other = np.ones(n, dtype=bool)
+    other[positions] = False
+    return other
+
+
+def _is_every_column(cols, n_features):
+    """Whether the sorted, unique indices `cols` select every column."""
+    return len(cols) == n_features and (n_features == 0 or cols[-1] == n_features - 1)
+
+
+def _columns(x, cols):
+    """Return the dense (n_samples, len(cols)) array of the given columns of x."""
+    if sp.issparse(x):
+        return x[:, cols].toarray()
+    return np.asarray(x[:, cols])
+
+
+def make_design(x, categorical=None):
+    """
+    Wrap x in the adapter matching its storage.
+
+    Columns listed in `categorical` hold integer codes and are expanded
+    implicitly by `CategoricalDesign`.
+    """
+    design = SparseDesign(x) if sp.issparse(x) else DenseDesign(x)
+    if categorical is not None and len(categorical):
+        return CategoricalDesign(design, categorical)
+    return design
+
+
+class StandardizedDesign:
+    """
+    The weighted, implicitly standardized view of a design used by glmnet.
+
+    Column j is treated as (x_j - xm_j) / xs_j, where xm and xs are the
+    weighted mean and standard deviation (xs = 1 when `standardize` is
+    False). Columns with zero variance are flagged in `ju` and never enter
+    the model, as in glmnet's `chkvars`.
+    """
+
+    def __init__(self, design, w, standardize=True):
+        self.design = design
+        self.n_samples = design.n_samples
+        self.n_features = design.n_features
+        mean, var = design.column_moments(w)
+        var = np.maximum(var, 0.0)
+        scale = np.sqrt((var + mean ** 2).max()) if self.n_features else 1.0
+        self.ju = var > (1e-10 * scale) ** 2
+        self.xm = mean
+        if standardize:
+            self.xs = np.where(self.ju, np.sqrt(var), 1.0)
+        else:
+            self.xs = np.ones(self.n_features)
+
+    def rmatvec(self, u, cols=None):
+        """Return Z' u, or Z[:, cols]' u, for the standardized design Z."""
+        if cols is None:
+            return self.design.rmatvec(u, None, self.xm) / self.xs
+        return self.design.rmatvec(u, cols, self.xm[cols]) / self.xs[cols]
+
+    def linear_predictor(self, a0, cols, beta):
+        """Return a0 + Z[:, cols] @ beta."""
+        return self.design.matvec(cols, beta / self.xs[cols], self.xm[cols]) + a0
+
+    def gram(self, cols, v):
+        """
+        Return the weighted Gram matrix of [1, Z[:, cols]].
+
+        Row and column 0 belong to the intercept.
+        """
+        xs = self.xs[cols]
+        xx, xv = self.design.gram(cols, v, self.xm[cols])
+        zv = xv / xs
+        zz = xx / np.outer(xs, xs)
+        m = len(cols)
+        g = np.empty((m + 1, m + 1))
+        g[0, 0] = v.sum()
+        g[0, 1:] = zv
+        g[1:, 0] = zv
+        g[1:, 1:] = zz
+        return g
+
+    def unstandardize(self, a0, beta, cols):
+        """Map an intercept and coefficients back to the original scale."""
+        b = beta / self.xs[cols]
+        return a0 - self.xm[cols] @ b, b
@@ -19,6 +19,12 @@ class GlmNetBinding(ABC):
         y: np.ndarray,
         alpha: float,
         nlambda: int,
+        dfmax: int = None,
+        pmax: int = None,
+        standardize: bool = True,
+        weights: np.ndarray = None,
+        categorical: np.ndarray = None,
+        group_penalty: bool = False,
         # ... other core glmnet parameters will be added here
     ) -> Dict[str, Any]:
         """
@@ -33,12 +39,78 @@ class GlmNetBinding(ABC):
             y (np.ndarray): The target vector of shape (n_samples,).
             alpha (float): The elastic net mixing parameter.
             nlambda (int): The number of lambda values in the regularization path.
+            dfmax (int, optional): The path stops once more than `dfmax`
+                features are nonzero (glmnet's `ne`). None means no limit.
+            pmax (int, optional): The maximum number of features that may ever
+                be nonzero along the path (glmnet's `nx`). It also bounds the
+                rows of the compressed coefficient matrix. None means glmnet's
+                default of min(2 * dfmax + 20, n_features).
+            standardize (bool): Standardize the features internally (glmnet's
+                `isd`). Coefficients are always returned on the original
+                scale; sparse input is centered implicitly and stays sparse.
+            weights (np.ndarray, optional): Non-negative observation weights of
+                shape (n_samples,). Rows with zero weight do not take part in
+                the fit, which lets callers fit row subsets of a shared matrix
+                without copying it. None means unit weights.
+            categorical (np.ndarray, optional): Indices of the columns of `x`
+                that hold non-negative integer category codes. They are
+                expanded implicitly: coefficients then refer to the columns of
+                `x` (zero for the categorical columns), followed by one column
+                per level 0..max(code) of each categorical column, in order.
+            group_penalty (bool): Penalize the levels of each categorical
+                column as one group (group lasso).
 
         Returns:
             A dictionary containing the results from the solver. The essential keys are:
                 - 'a0': The intercept vector for each lambda value.
                 - 'ca': The coefficient matrix for each lambda value.
                 - 'n_passes': The number of passes the solver took.
-                - 'jerr': An error code from the Fortran/C++ backend (0 for success).
+                - 'jerr': An error code from the Fortran/C++ backend (0 for success,
+                  -10000 - k when `pmax` was exceeded at the k-th lambda).
         """
-        pass
\ No newline at end of file
+        pass
+
+    def fit_gram(
+        self,
+        gram: np.ndarray,
+        xy: np.ndarray,
+        yy: float,
+        x_mean: np.ndarray,
+        y_mean: float,
+        n_samples: int,
+        alpha: float,
+        nlambda: int,
+        dfmax: int = None,
+        pmax: int = None,
+        standardize: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Fits a Gaussian elastic-net path from sufficient statistics alone.
+
+        This is the input of glmnet's covariance engine (`ElnetPath<gaussian,
+        cov>`): it never needs the rows of X, so the statistics can be
+        accumulated in chunks. Bindings that cannot fit from a Gram matrix do
+        not override this method.
+
+        Args:
+            gram (np.ndarray): The weighted covariance matrix of X, of shape
+                (n_features, n_features), for weights summing to one.
+            xy (np.ndarray): The weighted covariance of each feature with y.
+            yy (float): The weighted variance of y.
+            x_mean (np.ndarray): The weighted feature means.
+            y_mean (float): The weighted mean of y.
+            n_samples (int): The number of observations behind the statistics.
+            alpha (float): The elastic net mixing parameter.
+            nlambda (int): The number of lambda values in the regularization path.
+            dfmax (int, optional): As for `fit`.
+            pmax (int, optional): As for `fit`.
+            standardize (bool): Whether features are scaled to unit variance
+                before fitting; coefficients are returned on the original scale.
+
+        Returns:
+            A dictionary with the same keys as `fit`, where 'dev' is the
+            fraction of variance explained.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support fitting from sufficient statistics."
+        )
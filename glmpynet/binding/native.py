@@ -0,0 +1,132 @@
+import importlib
+import importlib.util
+from typing import Any, Dict
+
+import numpy as np
+import scipy.sparse as sp
+
+from ..storage import is_on_disk
+from .base import GlmNetBinding
+
+EXTENSION_MODULE = "glmpynet._glmnet"
+
+#: Functions the compiled extension must provide to be used.
+ENTRY_POINTS = ("fit_logistic_regression", "fit_logistic_regression_sparse")
+
+#: Rows of compressed coefficients (glmnet's `nx`) of the first attempt when
+#: `pmax` is not given; see `NativeGlmNetBinding.fit`.
+INITIAL_NX = 64
+
+
+class NativeGlmNetBinding(GlmNetBinding):
+    """
+    The binding to the compiled glmnetpp extension module.
+
+    The extension (`glmpynet._glmnet`, built from `glmnet_binding.cpp`) is
+    imported when the binding is created, which only happens once an
+    estimator fits. Builds that do not provide the path entry points are
+    rejected with an ImportError, so ``binding=None`` falls back to the
+    reference solver instead of using them.
+    """
+
+    def __init__(self):
+        if importlib.util.find_spec(EXTENSION_MODULE) is None:
+            raise ImportError(
+                f"The compiled extension '{EXTENSION_MODULE}' is not installed. "
+                "Build glmpynet with its C++ extension to use binding='native'."
+            )
+        self._module = None
+        missing = [name for name in ENTRY_POINTS if not hasattr(self._extension(), name)]
+        if missing:
+            raise ImportError(
+                f"The compiled extension '{EXTENSION_MODULE}' is out of date; it "
+                f"does not provide {', '.join(missing)}. Rebuild glmpynet."
+            )
+
+    def _extension(self):
+        if self._module is None:
+            self._module = importlib.import_module(EXTENSION_MODULE)
+        return self._module
+
+    def __getstate__(self):
+        # Module objects cannot be pickled; workers re-import lazily.
+        return {}
+
+    def __setstate__(self, state):
+        self._module = None
+
+    def fit(
+            self,
+            x: np.ndarray,
+            y: np.ndarray,
+            alpha: float,
+            nlambda: int,
+            dfmax: int = None,
+            pmax: int = None,
+            standardize: bool = True,
+            weights: np.ndarray = None,
+            categorical: np.ndarray = None,
+            group_penalty: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Calls the compiled glmnet binomial path solver.
+
+        glmnet's dense solver standardizes its input in place, so dense input
+        is copied once, in full, into the solver's own column-major array.
+        Memory-mapped and shared dense matrices (`glmpynet.storage.open_npy`,
+        `glmpynet.share`) are therefore rejected with NotImplementedError,
+        which makes estimators with the default binding fall back to the
+        reference solver instead of reading them into memory. CSC input is
+        used as it is. The outputs follow `ReferenceGlmNetBinding.fit`.
+
+        Without `pmax`, the path is first solved with room for `INITIAL_NX`
+        entered features and solved again with twice as much whenever that
+        is exceeded, up to glmnet's default of min(2 * dfmax + 20,
+        n_features).
+        """
+        if categorical is not None and len(categorical):
+            raise NotImplementedError(
+                "The native binding does not support categorical columns yet; "
+                "use binding='reference'."
+            )
+        if not sp.issparse(x) and is_on_disk(x):
+            raise NotImplementedError(
+                "The native binding copies dense input into memory; use "
+                "binding='reference' for memory-mapped or shared matrices."
+            )
+        ext = self._extension()
+        classes = np.unique(y)
+        y01 = (np.asarray(y) == classes[-1]).astype(np.float64)
+        nobs, nvars = x.shape
+        w = np.ones(nobs) if weights is None else np.asarray(weights, dtype=np.float64)
+
+        ne = nvars + 1 if dfmax is None else dfmax
+        # Rows with zero weight (e.g. outside a fold) do not count.
+        lambda_min_ratio = 1e-4 if np.count_nonzero(w) > nvars else 1e-2
+        params = dict(y=y01, w=w, alpha=alpha, nlambda=nlambda, ne=ne,
+                      lambda_min_ratio=lambda_min_ratio, standardize=bool(standardize))
+
+        if sp.issparse(x):
+            x = sp.csc_matrix(x)
+            data = dict(n_rows=nobs, n_cols=nvars, data=np.asarray(x.data, dtype=np.float64),
+                        indices=x.indices.astype(np.int32, copy=False),
+                        indptr=x.indptr.astype(np.int32, copy=False))
+            solver = ext.fit_logistic_regression_sparse
+        else:
+            # The extension copies x from its own layout; only other dtypes are converted first.
+            data = dict(x=np.asarray(x, dtype=np.float64))
+            solver = ext.fit_logistic_regression
+
+        if pmax is not None:
+            return dict(solver(nx=pmax, **data, **params))
+        # glmnet allocates nx rows of coefficients (and its work arrays) for
+        # every lambda up front, so the default of min(2 * ne + 20, nvars)
+        # costs nvars * nlambda for wide data. Start small and refit with
+        # twice the rows while the path overflows them (jerr = -10000 - k).
+        limit = min(2 * ne + 20, nvars)
+        nx = min(INITIAL_NX, limit)
+        while True:
+            results = dict(solver(nx=nx, **data, **params))
+            if nx >= limit or results["jerr"] > -10000:
+                return results
+            nx = min(2 * nx, limit)
@@ -0,0 +1,583 @@
+import numpy as np
+from scipy.special import expit
+from typing import Dict, Any
+
+from .base import GlmNetBinding
+from ._design import StandardizedDesign, make_design
+
+# Internal constants of glmnet's binomial path (see glmnet.control in R).
+PMIN = 1e-9       # fitted probabilities are clipped to [PMIN, 1 - PMIN]
+FDEV = 1e-5       # minimum fractional change in deviance to continue the path
+DEVMAX = 0.999    # maximum fraction of explained deviance
+MNLAM = 5         # minimum number of path points before early stopping
+INITIAL_ROWS = 64  # initial number of rows of the compressed coefficients
+REFRESH = 0.25    # relative change of an IRLS weight that rebuilds the Hessian
+EXTEND = 0.5      # largest fraction of new strong features added to a kept Hessian
+
+
+def _soft_threshold(u, t):
+    if u > t:
+        return u - t
+    if u < -t:
+        return u + t
+    return 0.0
+
+
+def _group_scores(g, groups):
+    """
+    Per-feature gradient scores compared against lambda * alpha.
+
+    Features of a penalized group share the score ||g_G|| / sqrt(|G|), so a
+    group enters the strong set, and fails the KKT check, as a whole.
+    """
+    if not groups:
+        return g
+    scores = g.copy()
+    for group in groups:
+        scores[group] = np.linalg.norm(g[group]) / np.sqrt(len(group))
+    return scores
+
+
+def _grow_rows(a, rows):
+    """Return a copy of `a` with `rows` rows, zero-padded at the bottom."""
+    grown = np.zeros((rows, a.shape[1]))
+    grown[:a.shape[0]] = a
+    return grown
+
+
+def _lambda_sequence(lambda_max, nlambda, lambda_min_ratio):
+    """The geometric lambda sequence from `lambda_max` down to a fraction of it."""
+    if nlambda > 1:
+        return lambda_max * lambda_min_ratio ** (np.arange(nlambda) / (nlambda - 1))
+    return np.array([lambda_max])
+
+
+class _PathOutput:
+    """
+    Path outputs in glmnet's compressed layout.
+
+    `ca` has a row per entered feature and grows on demand up to `pmax`
+    rows, so wide, sparse fits stay small.
+    """
+
+    def __init__(self, n_features, nlambda, pmax):
+        self.pmax = pmax
+        self.a0 = np.zeros(nlambda)
+        self.ca = np.zeros((min(pmax, INITIAL_ROWS), nlambda))
+        self.nin = np.zeros(nlambda, dtype=np.int64)
+        self.dev = np.zeros(nlambda)
+        self.ia = []                                    # features in order of entry
+        self.slot = np.full(n_features, -1, dtype=np.int64)  # position in ia
+        self.lmu = 0
+
+    def enter(self, active):
+        """
+        Register the features in `active`; False if that would exceed `pmax`.
+        """
+        new = active[self.slot[active] < 0]
+        if len(self.ia) + len(new) > self.pmax:
+            return False
+        self.slot[new] = np.arange(len(self.ia), len(self.ia) + len(new))
+        self.ia.extend(new.tolist())
+        if len(self.ia) > self.ca.shape[0]:
+            rows = min(self.pmax, max(2 * self.ca.shape[0], len(self.ia)))
+            self.ca = _grow_rows(self.ca, rows)
+        return True
+
+    @property
+    def entered(self):
+        return np.asarray(self.ia, dtype=np.int64)
+
+    def store(self, l, a0, coef, dev):
+        """Store the solution at lambda `l`; `coef` is ordered like `entered`."""
+        self.a0[l] = a0
+        self.ca[:len(self.ia), l] = coef
+        self.nin[l] = len(self.ia)
+        self.dev[l] = dev
+        self.lmu = l + 1
+
+    def converged(self, l):
+        """glmnet's rules for ending the path early on the explained deviance."""
+        if l + 1 < MNLAM:
+            return False
+        return self.dev[l] - self.dev[l - 1] < FDEV * self.dev[l] or self.dev[l] > DEVMAX
+
+    def results(self, lambdas, nlp, jerr):
+        return {
+            'a0': self.a0,
+            'ca': self.ca[:len(self.ia)],
+            'ia': self.entered,
+            'nin': self.nin,
+            'alm': lambdas,
+            'dev': self.dev,
+            'lmu': self.lmu,
+            'n_passes': nlp,
+            'jerr': jerr,
+        }
+
+
+class _Hessian:
+    """
+    The weighted Gram matrix of [1, Z[:, cols]] used by IRLS, kept across steps.
+
+    Building Z' diag(v) Z costs n * m**2 and dominated the fit when it was
+    rebuilt for every IRLS step. IRLS reaches the same solution with any
+    positive definite Hessian approximation (it only changes how many steps
+    are needed), so the matrix is rebuilt only once an IRLS weight has moved
+    by more than `REFRESH` of the value it was built with, or on request.
+    Features that join the strong set meanwhile add their rows and columns,
+    at n * m each, instead of rebuilding the whole matrix.
+    """
+
+    def __init__(self, design):
+        self.design = design
+        self.cols = None
+        self.v = None
+        self.matrix = None
+
+    def gram(self, cols, v, refresh=False):
+        stale = (self.v is None or refresh
+                 or np.any(np.abs(v - self.v) > REFRESH * self.v))
+        if stale:
+            self.v = v.copy()
+            self.matrix = self.design.gram(cols, self.v)
+        elif not np.array_equal(cols, self.cols):
+            new = np.setdiff1d(cols, self.cols)
+            if len(new) > EXTEND * len(cols) or not np.isin(self.cols, cols).all():
+                self.matrix = self.design.gram(cols, self.v)
+            else:
+                self.matrix = self._extend(cols, new)
+        self.cols = cols
+        return self.matrix
+
+    def _extend(self, cols, new):
+        """Insert the rows and columns of the features `new` into the kept matrix."""
+        m = len(cols)
+        kept = np.concatenate(([0], np.searchsorted(cols, self.cols) + 1))
+        g = np.empty((m + 1, m + 1))
+        g[np.ix_(kept, kept)] = self.matrix
+        for j, k in zip(new, np.searchsorted(cols, new) + 1):
+            vz = self.v * self.design.linear_predictor(0.0, np.array([j]), np.ones(1))
+            g[0, k] = g[k, 0] = vz.sum()
+            g[1:, k] = g[k, 1:] = self.design.rmatvec(vz, cols)
+        return g
+
+
+def _binomial_deviance(y, p, w):
+    """Weighted binomial deviance for 0/1 targets and clipped probabilities."""
+    return -2.0 * np.dot(w, y * np.log(p) + (1.0 - y) * np.log1p(-p))
+
+
+class ReferenceGlmNetBinding(GlmNetBinding):
+    """
+    A pure-NumPy implementation of glmnet's binomial and Gaussian path algorithms.
+
+    It follows the structure of glmnet's `lognet`: the data are (implicitly)
+    standardized with weights summing to one, the lambda sequence starts at
+    the smallest value for which all coefficients are zero, and each lambda
+    is solved by an IRLS outer loop around coordinate descent on the
+    quadratic approximation, warm-started from the previous solution. The
+    coordinate updates work on the weighted Gram matrix of the current strong
+    set ("covariance" updates), the strong rules screen the features, and a
+    KKT check over all features guards against screening mistakes.
+
+    `fit_gram` solves the Gaussian path with the same coordinate updates
+    directly on a covariance matrix, like glmnet's covariance engine.
+
+    The binding returns glmnet's compressed outputs (`a0`, `ca`, `ia`, `nin`,
+    `alm`, `dev`), which makes it usable as a fallback where the compiled
+    extension is not available and as an oracle when testing it.
+    """
+
+    def fit(
+            self,
+            x: np.ndarray,
+            y: np.ndarray,
+            alpha: float,
+            nlambda: int,
+            dfmax: int = None,
+            pmax: int = None,
+            standardize: bool = True,
+            weights: np.ndarray = None,
+            lambda_min_ratio: float = None,
+            lambdas: np.ndarray = None,
+            thresh: float = 1e-7,
+            maxit: int = 100000,
+            categorical: np.ndarray = None,
+            group_penalty: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Fits the binomial elastic-net path.
+
+        Args:
+            x: The training data matrix of shape (n_samples, n_features); dense,
+                memory-mapped or sparse.
+            y: The binary target of shape (n_samples,). The larger label is the
+                positive class.
+            alpha: The elastic net mixing parameter.
+            nlambda: The maximum number of lambda values.
+            dfmax: Stop the path once more than `dfmax` features are nonzero
+                (glmnet's `ne`). Defaults to n_features + 1, i.e. no limit.
+            pmax: The maximum number of features that may ever enter the
+                model (glmnet's `nx`). Defaults to min(2 * dfmax + 20,
+                n_features). Reaching it stops the path with jerr =
+                -10000 - k, where k is the (1-based) lambda that overflowed.
+            standardize: Scale the features to unit weighted variance before
+                fitting (glmnet's `isd`). Coefficients are returned on the
+                original scale either way.
+            weights: Observation weights; normalized to sum to one.
+            lambda_min_ratio: Smallest lambda as a fraction of the largest.
+                Defaults to 1e-4 if n_samples > n_features, else 1e-2.
+            lambdas: A user-supplied lambda sequence (glmnet's `ulam`), which
+                replaces `nlambda` and `lambda_min_ratio`. It is fitted in
+                decreasing order and, as in glmnet, the deviance-based early
+                stopping rules do not apply; `dfmax` and `pmax` still do.
+            thresh: Convergence threshold, relative to the null deviance.
+            maxit: Maximum total number of coordinate-descent passes.
+            categorical: Indices of the columns of `x` that hold integer
+                category codes. See `GlmNetBinding.fit`.
+            group_penalty: Penalize the levels of each categorical column as
+                a group (group lasso), so that it enters the model as a whole.
+
+        Returns:
+            A dictionary with the glmnet outputs. `ia` holds zero-based feature
+            indices and `lmu` the number of fitted lambdas. `ca` has one row
+            per entered feature.
+        """
+        n = x.shape[0]
+        y01, w, design, groups, ybar, g = self._null_model(
+            x, y, weights, standardize, categorical, group_penalty)
+        ju = design.ju
+        p = design.n_features
+        if dfmax is None:
+            dfmax = p + 1
+        if pmax is None:
+            pmax = min(2 * dfmax + 20, p)
+
+        a0 = np.log(ybar / (1.0 - ybar))
+        dev0 = _binomial_deviance(y01, np.full(n, ybar), w)
+        shr = thresh * dev0
+        vmin = (1.0 + PMIN) * PMIN * (1.0 - PMIN)
+
+        lambda_max = g.max() / max(alpha, 1e-3) if p else 0.0
+        user_lambdas = lambdas is not None
+        if user_lambdas:
+            lambdas = np.sort(np.asarray(lambdas, dtype=np.float64))[::-1]
+            nlambda = len(lambdas)
+        else:
+            if lambda_min_ratio is None:
+                lambda_min_ratio = self._default_lambda_min_ratio(w, p)
+            lambdas = _lambda_sequence(lambda_max, nlambda, lambda_min_ratio)
+
+        out = _PathOutput(p, nlambda, pmax)
+        hessian = _Hessian(design)
+        beta = np.zeros(p)                       # standardized coefficients
+        strong = np.zeros(p, dtype=bool)
+        eta = np.full(n, a0)
+        nlp = 0
+        jerr = 0
+        lam_prev = lambda_max
+
+        for l, lam in enumerate(lambdas):
+            l1 = lam * alpha
+            l2 = lam * (1.0 - alpha)
+            # Sequential strong rule, based on the gradient at the warm start.
+            strong |= ju & (g > alpha * (2.0 * lam - lam_prev))
+
+            while True:
+                cols = np.flatnonzero(strong)
+                a0, beta, eta, nlp, converged, vsum = self._irls(
+                    design, y01, w, cols, a0, beta, eta, l1, l2, shr, nlp, maxit, groups, hessian)
+                if not converged:
+                    jerr = -(l + 1)
+                    break
+                prob = np.clip(expit(eta), PMIN, 1.0 - PMIN)
+                if not (ju & ~strong).any():
+                    break
+                g = _group_scores(np.abs(design.rmatvec(w * (y01 - prob))), groups)
+                violators = ju & ~strong & (g > l1)
+                if not violators.any():
+                    break
+                strong |= violators
+            if jerr:
+                break
+
+            active = np.flatnonzero(beta)
+            if not out.enter(active):
+                jerr = -10000 - (l + 1)
+                break
+            entered = out.entered
+            a0_raw, b_raw = design.unstandardize(a0, beta[entered], entered)
+            out.store(l, a0_raw, b_raw, 1.0 - _binomial_deviance(y01, prob, w) / dev0)
+            lam_prev = lam
+
+            if len(active) > dfmax:
+                break
+            # Early stopping rules of lognet; skipped for user lambdas.
+            if not user_lambdas and (out.converged(l) or vsum <= vmin):
+                break
+
+        return out.results(lambdas, nlp, jerr)
+
+    def lambda_sequence(
+            self,
+            x: np.ndarray,
+            y: np.ndarray,
+            alpha: float,
+            nlambda: int,
+            standardize: bool = True,
+            weights: np.ndarray = None,
+            lambda_min_ratio: float = None,
+    ) -> np.ndarray:
+        """
+        Returns the default lambda sequence `fit` would use for these data.
+
+        It starts at the smallest lambda for which all coefficients are zero.
+        Passing it as `lambdas` to fits on subsets of the rows puts all of
+        their paths on a common grid.
+        """
+        _, w, design, _, _, g = self._null_model(x, y, weights, standardize)
+        p = design.n_features
+        if lambda_min_ratio is None:
+            lambda_min_ratio = self._default_lambda_min_ratio(w, p)
+        lambda_max = g.max() / max(alpha, 1e-3) if p else 0.0
+        return _lambda_sequence(lambda_max, nlambda, lambda_min_ratio)
+
+    @staticmethod
+    def _null_model(x, y, weights, standardize, categorical=None, group_penalty=False):
+        """
+        Prepare the weighted, standardized design and fit the intercept-only model.
+
+        Returns the 0/1 target, the normalized weights, the design, the
+        penalty groups, the null probability and the gradient score of each
+        feature (or group) at the null model.
+        """
+        labels = np.unique(y)
+        y01 = (np.asarray(y) == labels[-1]).astype(np.float64)
+        w = np.ones(x.shape[0]) if weights is None else np.asarray(weights, dtype=np.float64)
+        w = w / w.sum()
+
+        design = StandardizedDesign(make_design(x, categorical), w, standardize)
+        ju = design.ju
+        groups = []
+        if group_penalty and categorical is not None:
+            groups = [group[ju[group]] for group in design.design.groups]
+            groups = [group for group in groups if len(group)]
+
+        ybar = float(np.clip(w @ y01, PMIN, 1.0 - PMIN))
+        g = np.abs(design.rmatvec(w * (y01 - ybar)))
+        g[~ju] = 0.0
+        return y01, w, design, groups, ybar, _group_scores(g, groups)
+
+    @staticmethod
+    def _default_lambda_min_ratio(w, p):
+        # Rows with zero weight (e.g. outside a fold) do not count.
+        return 1e-4 if np.count_nonzero(w) > p else 1e-2
+
+    def fit_gram(
+            self,
+            gram: np.ndarray,
+            xy: np.ndarray,
+            yy: float,
+            x_mean: np.ndarray,
+            y_mean: float,
+            n_samples: int,
+            alpha: float,
+            nlambda: int,
+            dfmax: int = None,
+            pmax: int = None,
+            standardize: bool = True,
+            lambda_min_ratio: float = None,
+            thresh: float = 1e-7,
+            maxit: int = 100000,
+    ) -> Dict[str, Any]:
+        """
+        Fits the Gaussian elastic-net path from a weighted covariance matrix.
+
+        The objective is 1/2 * mean weighted squared error plus the elastic
+        net penalty on the (optionally standardized) coefficients. See
+        `GlmNetBinding.fit_gram` for the arguments; `lambda_min_ratio`,
+        `thresh` and `maxit` are as for `fit`.
+        """
+        p = gram.shape[0]
+        if dfmax is None:
+            dfmax = p + 1
+        if pmax is None:
+            pmax = min(2 * dfmax + 20, p)
+        if lambda_min_ratio is None:
+            lambda_min_ratio = 1e-4 if n_samples > p else 1e-2
+
+        var = np.maximum(gram.diagonal(), 0.0)
+        scale = np.sqrt((var + x_mean ** 2).max()) if p else 1.0
+        ju = var > (1e-10 * scale) ** 2
+        xs = np.where(ju, np.sqrt(var), 1.0) if standardize else np.ones(p)
+        c = gram / np.outer(xs, xs)
+        gz = xy / xs
+        dev0 = yy if yy > 0 else 1.0
+        shr = thresh * dev0
+
+        lambda_max = np.abs(gz[ju]).max() / max(alpha, 1e-3) if ju.any() else 0.0
+        lambdas = _lambda_sequence(lambda_max, nlambda, lambda_min_ratio)
+
+        out = _PathOutput(p, nlambda, pmax)
+        beta = np.zeros(p)
+        r = gz.copy()            # gradient gz - C beta, kept for all features
+        diag = c.diagonal()
+        strong = np.zeros(p, dtype=bool)
+        nlp = 0
+        jerr = 0
+        lam_prev = lambda_max
+
+        for l, lam in enumerate(lambdas):
+            l1 = lam * alpha
+            l2 = lam * (1.0 - alpha)
+            strong |= ju & (np.abs(r) > alpha * (2.0 * lam - lam_prev))
+
+            while True:
+                nlp, converged = self._covariance_cd(
+                    c, diag, r, beta, np.flatnonzero(strong), l1, l2, shr, nlp, maxit)
+                if not converged:
+                    jerr = -(l + 1)
+                    break
+                violators = ju & ~strong & (np.abs(r) > l1)
+                if not violators.any():
+                    break
+                strong |= violators
+            if jerr:
+                break
+
+            active = np.flatnonzero(beta)
+            if not out.enter(active):
+                jerr = -10000 - (l + 1)
+                break
+            entered = out.entered
+            coef = beta[entered] / xs[entered]
+            rsq = (beta @ gz + beta @ r) / dev0
+            out.store(l, y_mean - x_mean[entered] @ coef, coef, rsq)
+            lam_prev = lam
+
+            if len(active) > dfmax or out.converged(l):
+                break
+
+        return out.results(lambdas, nlp, jerr)
+
+    @staticmethod
+    def _covariance_cd(c, diag, r, beta, cols, l1, l2, shr, nlp, maxit):
+        """
+        Coordinate descent on 1/2 b'Cb - g'b + penalty over the features `cols`.
+
+        `beta` and the gradient `r` are updated in place. Returns the pass
+        count and whether it converged.
+        """
+        full_pass = True
+        while nlp < maxit:
+            nlp += 1
+            dlx = 0.0
+            idx = cols if full_pass else cols[beta[cols] != 0.0]
+            for k in idx:
+                hk = diag[k]
+                bk = beta[k]
+                new = _soft_threshold(r[k] + hk * bk, l1) / (hk + l2)
+                if new != bk:
+                    d = new - bk
+                    beta[k] = new
+                    r -= d * c[k]
+                    dlx = max(dlx, hk * d * d)
+            if dlx < shr:
+                if full_pass:
+                    return nlp, True
+                full_pass = True
+            else:
+                full_pass = False
+        return nlp, False
+
+    @staticmethod
+    def _irls(design, y, w, cols, a0, beta, eta, l1, l2, shr, nlp, maxit, groups=(), hessian=None):
+        """
+        Solve one lambda on the features `cols` by IRLS + coordinate descent.
+
+        Features in `groups` are updated block-wise with a group-lasso
+        proximal step; a group is either entirely in `cols` or not at all.
+        `hessian` carries the weighted Gram matrix from previous calls; it is
+        rebuilt for the third IRLS step in a row.
+
+        Returns the updated intercept, coefficients and linear predictor, the
+        pass count, whether it converged, and the total IRLS weight.
+        """
+        m = len(cols)
+        # Gram positions (0 is the intercept) of the penalized groups in cols.
+        blocks = [np.searchsorted(cols, group) + 1 for group in groups
+                  if len(cols) and np.isin(group[0], cols)]
+        in_block = np.zeros(m + 1, dtype=bool)
+        for block in blocks:
+            in_block[block] = True
+        singles = [k for k in range(m + 1) if not in_block[k]]
+        if hessian is None:
+            hessian = _Hessian(design)
+        steps = 0
+        while True:
+            prob = np.clip(expit(eta), PMIN, 1.0 - PMIN)
+            v = w * prob * (1.0 - prob)
+            r = w * (y - prob)
+            gram = hessian.gram(cols, v, refresh=steps >= 2)
+            # Gradient of the quadratic approximation at the expansion point.
+            grad = np.empty(m + 1)
+            grad[0] = r.sum()
+            grad[1:] = design.rmatvec(r, cols)
+
+            b = np.concatenate(([a0], beta[cols]))
+            b_start = b.copy()
+            diag = gram.diagonal().tolist()
+            # Step sizes of the block updates: the largest eigenvalue of each block.
+            lips = [np.linalg.eigvalsh(gram[np.ix_(block, block)])[-1] for block in blocks]
+            converged = False
+            full_pass = True
+            while nlp < maxit:
+                nlp += 1
+                dlx = 0.0
+                for block, lip in zip(blocks, lips):
+                    bg = b[block]
+                    if not full_pass and not bg.any():
+                        continue
+                    u = bg + grad[block] / lip
+                    norm = np.linalg.norm(u)
+                    shrink = max(0.0, 1.0 - l1 * np.sqrt(len(block)) / (lip * norm)) if norm else 0.0
+                    d = u * shrink / (1.0 + l2 / lip) - bg
+                    if d.any():
+                        b[block] += d
+                        grad -= d @ gram[block]
+                        dlx = max(dlx, lip * (d @ d))
+                idx = singles if full_pass else [k for k in singles if k == 0 or b[k] != 0.0]
+                for k in idx:
+                    hk = diag[k]
+                    if hk <= 0.0:
+                        continue
+                    bk = b[k]
+                    if k == 0:
+                        new = bk + grad[0] / hk
+                    else:
+                        new = _soft_threshold(grad[k] + hk * bk, l1) / (hk + l2)
+                    if new != bk:
+                        d = new - bk
+                        b[k] = new
+                        grad -= d * gram[k]
+                        dlx = max(dlx, hk * d * d)
+                if dlx < shr:
+                    if full_pass:
+                        converged = True
+                        break
+                    full_pass = True
+                else:
+                    full_pass = False
+            if not converged:
+                return a0, beta, eta, nlp, False, v.sum()
+
+            d = b - b_start
+            a0 = b[0]
+            beta = beta.copy()
+            beta[cols] = b[1:]
+            eta = design.linear_predictor(a0, cols, b[1:])
+            if np.max(np.asarray(diag) * d * d) < shr:
+                return a0, beta, eta, nlp, True, v.sum()
+            # A third step in a row means the kept matrix no longer fits well.
+            steps += 1
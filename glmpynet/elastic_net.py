@@ -0,0 +1,200 @@
+"""
+This module contains the ElasticNet class, a scikit-learn compatible wrapper
+for elastic-net penalized least squares that is fitted from streamed
+sufficient statistics.
+"""
+
+from typing import Union
+
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin
+from sklearn.utils._param_validation import InvalidParameterError
+from sklearn.utils.validation import _check_sample_weight, check_is_fitted, validate_data
+
+from .binding import get_binding, resolve_binding
+from .binding.base import GlmNetBinding
+from .gram import GramAccumulator
+from .logistic_regression import _check_path, _check_path_limits
+
+
+
+class ElasticNet(RegressorMixin, BaseEstimator):
+    """
+    A scikit-learn compatible estimator for elastic-net linear regression.
+
+    The model only needs the weighted means, X'X and X'y of the data, so
+    `partial_fit` can stream chunks that do not fit in memory together. The
+    accumulated statistics are kept in `stats_` and can be merged across
+    workers with `GramAccumulator.merge` and solved with `fit_stats`. The
+    whole path is solved from the Gram matrix, at a cost that depends on the
+    number of features but not on the number of rows. After `partial_fit`
+    the path is only solved when `predict` or one of the solved attributes
+    below is first used, so streaming many chunks solves it once.
+
+    Parameters
+    ----------
+    alpha : float, default=1.0
+        The elastic net mixing parameter, with 0 <= alpha <= 1. ``alpha=1``
+        is the lasso and ``alpha=0`` is ridge regression.
+    nlambda : int, default=100
+        The number of lambda values in the regularization path.
+    dfmax : int, optional
+        Stop the path once more than `dfmax` features are nonzero.
+    pmax : int, optional
+        The maximum number of features that may ever enter the model.
+    standardize : bool, default=True
+        Standardize the features inside the solver; `coef_` is reported on
+        the original scale.
+    binding : str or GlmNetBinding, optional
+        The backend that fits the path. It must implement
+        `GlmNetBinding.fit_gram`. Defaults to the ``"reference"`` solver when
+        the default binding cannot fit from sufficient statistics.
+
+    Attributes
+    ----------
+    stats_ : GramAccumulator
+        The accumulated sufficient statistics.
+    binding_ : GlmNetBinding
+        The backend that solved the path.
+    path_ : CoefficientPath
+        The solved regularization path.
+    lambda_index_ : int
+        The index of the lambda used by `coef_`, `intercept_` and `predict`.
+    coef_ : ndarray of shape (n_features,)
+        The coefficients at `lambda_index_`, on the original scale.
+    intercept_ : float
+        The intercept at `lambda_index_`.
+    """
+
+    def __init__(self, alpha: float = 1.0, nlambda: int = 100, dfmax: int = None,
+                 pmax: int = None, standardize: bool = True, binding: Union[str, GlmNetBinding] = None):
+        self.alpha = alpha
+        self.nlambda = nlambda
+        self.dfmax = dfmax
+        self.pmax = pmax
+        self.standardize = standardize
+        self.binding = binding
+
+    def _check_params(self):
+        if not 0 <= self.alpha <= 1:
+            raise InvalidParameterError(f"alpha must be in [0, 1]; got (alpha={self.alpha})")
+        _check_path_limits(self)
+
+    def fit(self, X, y, sample_weight=None):
+        """
+        Fit the model on all of `X` at once.
+
+        Parameters
+        ----------
+        X : array-like of shape (n_samples, n_features), or sparse matrix
+        y : array-like of shape (n_samples,)
+        sample_weight : array-like of shape (n_samples,), optional
+        """
+        for attribute in ("stats_", "n_features_in_"):
+            if hasattr(self, attribute):
+                delattr(self, attribute)
+        return self.partial_fit(X, y, sample_weight)._solve()
+
+    def partial_fit(self, X, y, sample_weight=None):
+        """
+        Add a chunk of data to the sufficient statistics.
+
+        The path is refitted lazily, when `coef_`, `predict` or another
+        fitted attribute is next used; errors of the solver surface there.
+
+        Parameters
+        ----------
+        X : array-like of shape (n_samples, n_features), or sparse matrix
+        y : array-like of shape (n_samples,)
+        sample_weight : array-like of shape (n_samples,), optional
+        """
+        self._check_params()
+        first_call = not hasattr(self, "stats_")
+        X, y = validate_data(self, X, y, accept_sparse=["csr", "csc"],
+                             dtype=np.float64, y_numeric=True, reset=first_call)
+        sample_weight = _check_sample_weight(sample_weight, X)
+        if first_call:
+            self.stats_ = GramAccumulator(self.n_features_in_)
+        self.stats_.update(X, y, sample_weight)
+        self._solution = None
+        return self
+
+    def fit_stats(self, stats):
+        """
+        Fit the model from accumulated statistics, e.g. merged from several workers.
+
+        Parameters
+        ----------
+        stats : GramAccumulator
+        """
+        self._check_params()
+        self.stats_ = stats
+        self.n_features_in_ = stats.n_features
+        self._solution = None
+        return self._solve()
+
+    @property
+    def binding_(self):
+        return self._solved("binding_")
+
+    @property
+    def path_(self):
+        return self._solved("path_")
+
+    @property
+    def lambda_index_(self):
+        return self._solved("lambda_index_")
+
+    @property
+    def intercept_(self):
+        return self._solved("intercept_")
+
+    @property
+    def coef_(self):
+        return self._solved("coef_")
+
+    def _solved(self, name):
+        # Solve statistics streamed by `partial_fit` on first use; an
+        # unfitted model has none of the solved attributes.
+        if "stats_" not in self.__dict__:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        if self._solution is None:
+            self._solve()
+        return self._solution[name]
+
+    def _solve(self):
+        gram, xy, yy = self.stats_.covariance()
+        binding = resolve_binding(self.binding)
+        kwargs = dict(
+            gram=gram, xy=xy, yy=yy, x_mean=self.stats_.x_mean_, y_mean=self.stats_.y_mean_,
+            n_samples=self.stats_.n_samples_seen_, alpha=self.alpha, nlambda=self.nlambda,
+            dfmax=self.dfmax, pmax=self.pmax, standardize=bool(self.standardize),
+        )
+        try:
+            results = binding.fit_gram(**kwargs)
+        except NotImplementedError:
+            if self.binding is not None:
+                raise
+            binding = get_binding("reference")
+            results = binding.fit_gram(**kwargs)
+        path = _check_path(results, self.n_features_in_)
+        lambda_index = min(self.nlambda // 2, path.n_lambdas - 1)
+        self._solution = dict(
+            binding_=binding, path_=path, lambda_index_=lambda_index,
+            intercept_=float(path.a0[lambda_index]), coef_=path.coef(lambda_index),
+        )
+        return self
+
+    def predict(self, X):
+        """
+        Predict using the linear model.
+        """
+        check_is_fitted(self)
+        X = validate_data(self, X, accept_sparse=True, reset=False)
+        return np.asarray(X @ self.coef_).ravel() + self.intercept_
+
+    def __sklearn_tags__(self):
+        tags = super().__sklearn_tags__()
+        tags.input_tags.sparse = True
+        tags.regressor_tags.poor_score = True
+        return tags
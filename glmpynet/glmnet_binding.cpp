@@ -1,139 +1,159 @@
+// pybind11 bindings to the glmnetpp path drivers.
+//
+// Built as glmpynet._glmnet by setup.py, with the glmnetpp headers of
+// glmnet/glmnet_4_1_9/src/glmnetpp/include and Eigen on the include path.
+#include <cmath>
+#include <stdexcept>
+
 #include <pybind11/pybind11.h>
 #include <pybind11/numpy.h>
 #include <pybind11/eigen.h>
 #include <Eigen/Dense>
 #include <Eigen/Sparse>
-#include "glmnet/glmnet_4_1_9/glmnetpp/include/glmnetpp_bits/elnet_driver.hpp"
-#include "glmnet/glmnet_4_1_9/glmnetpp/include/glmnetpp_bits/logit_driver.hpp"
-#include "glmnet/glmnet_4_1_9/glmnetpp/include/glmnetpp_bits/multi_driver.hpp"
-#include "glmnet/glmnet_4_1_9/glmnetpp/include/glmnetpp_bits/fish_driver.hpp"
-#include "glmnet/glmnet_4_1_9/glmnetpp/include/glmnetpp_bits/cox_driver.hpp"
-#include "glmnet/glmnet_4_1_9/glmnetpp/include/glmnetpp_bits/mrel_driver.hpp"
+#include <glmnetpp>
 
 namespace py = pybind11;
 
-void elnet(
-    double alpha, int nobs, int nvars, py::array_t<double> X, py::array_t<double> y,
-    py::array_t<double> weights, int nlam, py::array_t<double> lambda_path,
-    int max_iter, double tol, bool relax, py::array_t<double> coef
-) {
-    Eigen::Map<Eigen::MatrixXd> X_eigen(X.mutable_data(), nobs, nvars);
-    Eigen::Map<Eigen::VectorXd> y_eigen(y.mutable_data(), nobs);
-    Eigen::Map<Eigen::VectorXd> weights_eigen(weights.mutable_data(), nobs);
-    Eigen::Map<Eigen::VectorXd> lambda_eigen(lambda_path.mutable_data(), nlam);
-    Eigen::Map<Eigen::VectorXd> coef_eigen(coef.mutable_data(), nvars);
+namespace {
 
-    glmnetpp::GaussElNetDriver<double> driver;
-    if (relax) {
-        // Handle relaxed fit (placeholder; requires additional outputs)
-        driver.fit(alpha, X_eigen, y_eigen, weights_eigen, nlam, lambda_eigen, max_iter, tol, coef_eigen);
-    } else {
-        driver.fit(alpha, X_eigen, y_eigen, weights_eigen, nlam, lambda_eigen, max_iter, tol, coef_eigen);
-    }
-}
+// Internal constants of glmnet (see glmnet.control in the R package).
+struct InternalParams
+{
+    static constexpr double sml = 1e-5;
+    static constexpr double eps = 1e-6;
+    static constexpr double big = 9.9e35;
+    static constexpr int mnlam = 5;
+    static constexpr double rsqmax = 0.999;
+    static constexpr double pmin = 1e-9;
+    static constexpr double exmx = 250.0;
+    static constexpr int itrace = 0;
+    static constexpr double bnorm_thr = 1e-10;
+    static constexpr int bnorm_mxit = 100;
+    static constexpr double epsnr = 1e-6;
+    static constexpr int mxitnr = 25;
+};
 
-void lognet(
-    double alpha, int nobs, int nvars, py::array_t<double> X, py::array_t<double> y,
-    py::array_t<double> weights, int nlam, py::array_t<double> lambda_path,
-    int max_iter, double tol, bool relax, py::array_t<double> coef
-) {
-    Eigen::Map<Eigen::MatrixXd> X_eigen(X.mutable_data(), nobs, nvars);
-    Eigen::Map<Eigen::VectorXd> y_eigen(y.mutable_data(), nobs);
-    Eigen::Map<Eigen::VectorXd> weights_eigen(weights.mutable_data(), nobs);
-    Eigen::Map<Eigen::VectorXd> lambda_eigen(lambda_path.mutable_data(), nlam);
-    Eigen::Map<Eigen::VectorXd> coef_eigen(coef.mutable_data(), nvars);
+using dense_array = py::array_t<double, py::array::f_style | py::array::forcecast>;
+using strided_array = py::array_t<double, py::array::forcecast>;
+using index_array = py::array_t<int, py::array::c_style | py::array::forcecast>;
 
-    glmnetpp::LogitElNetDriver<double> driver;
-    if (relax) {
-        driver.fit(alpha, X_eigen, y_eigen, weights_eigen, nlam, lambda_eigen, max_iter, tol, coef_eigen);
-    } else {
-        driver.fit(alpha, X_eigen, y_eigen, weights_eigen, nlam, lambda_eigen, max_iter, tol, coef_eigen);
+// Runs the two-class binomial path of glmnetpp on x and returns glmnet's
+// compressed outputs, as R's lognet_exp does. `ia` is returned zero-based.
+template <class XType>
+py::dict lognet_path(
+    XType& x, const Eigen::Ref<const Eigen::VectorXd>& y01,
+    const Eigen::Ref<const Eigen::VectorXd>& w, double alpha, int nlam,
+    int ne, int nx, double flmin, bool isd, double thr, int maxit)
+{
+    using elnet_driver_t = glmnetpp::ElnetDriver<glmnetpp::util::glm_type::binomial>;
+    const Eigen::Index no = x.rows();
+    const Eigen::Index ni = x.cols();
+    if (y01.size() != no || w.size() != no) {
+        throw std::invalid_argument("x, y and w have inconsistent lengths.");
     }
-}
 
-void multnet(
-    double alpha, int nobs, int nvars, py::array_t<double> X, py::array_t<double> y,
-    py::array_t<double> weights, int nlam, py::array_t<double> lambda_path,
-    int max_iter, double tol, bool relax, py::array_t<double> coef
-) {
-    Eigen::Map<Eigen::MatrixXd> X_eigen(X.mutable_data(), nobs, nvars);
-    Eigen::Map<Eigen::MatrixXd> y_eigen(y.mutable_data(), nobs, y.shape()[1]); // Multi-class
-    Eigen::Map<Eigen::VectorXd> weights_eigen(weights.mutable_data(), nobs);
-    Eigen::Map<Eigen::VectorXd> lambda_eigen(lambda_path.mutable_data(), nlam);
-    Eigen::Map<Eigen::VectorXd> coef_eigen(coef.mutable_data(), nvars * y.shape()[1]);
-
-    glmnetpp::MultiElNetDriver<double> driver;
-    if (relax) {
-        driver.fit(alpha, X_eigen, y_eigen, weights_eigen, nlam, lambda_eigen, max_iter, tol, coef_eigen);
-    } else {
-        driver.fit(alpha, X_eigen, y_eigen, weights_eigen, nlam, lambda_eigen, max_iter, tol, coef_eigen);
-    }
-}
+    // The driver models the first column of y; rows carry the weights.
+    Eigen::MatrixXd y(no, 2);
+    y.col(0) = y01.cwiseProduct(w);
+    y.col(1) = (1.0 - y01.array()).matrix().cwiseProduct(w);
+    Eigen::MatrixXd g = Eigen::MatrixXd::Zero(no, 1);
+    Eigen::VectorXi jd = Eigen::VectorXi::Zero(1);
+    Eigen::VectorXd vp = Eigen::VectorXd::Ones(ni);
+    Eigen::MatrixXd cl(2, ni);
+    cl.row(0).setConstant(-InternalParams::big);
+    cl.row(1).setConstant(InternalParams::big);
+    Eigen::VectorXd ulam = Eigen::VectorXd::Zero(1);
 
-void fishnet(
-    double alpha, int nobs, int nvars, py::array_t<double> X, py::array_t<double> y,
-    py::array_t<double> weights, int nlam, py::array_t<double> lambda_path,
-    int max_iter, double tol, bool relax, py::array_t<double> coef
-) {
-    Eigen::Map<Eigen::MatrixXd> X_eigen(X.mutable_data(), nobs, nvars);
-    Eigen::Map<Eigen::VectorXd> y_eigen(y.mutable_data(), nobs);
-    Eigen::Map<Eigen::VectorXd> weights_eigen(weights.mutable_data(), nobs);
-    Eigen::Map<Eigen::VectorXd> lambda_eigen(lambda_path.mutable_data(), nlam);
-    Eigen::Map<Eigen::VectorXd> coef_eigen(coef.mutable_data(), nvars);
+    int lmu = 0, nlp = 0, jerr = 0;
+    double nulldev = 0.0;
+    Eigen::MatrixXd a0 = Eigen::MatrixXd::Zero(1, nlam);
+    Eigen::VectorXd ca = Eigen::VectorXd::Zero(static_cast<Eigen::Index>(nx) * nlam);
+    Eigen::VectorXi ia = Eigen::VectorXi::Zero(nx);
+    Eigen::VectorXi nin = Eigen::VectorXi::Zero(nlam);
+    Eigen::VectorXd dev = Eigen::VectorXd::Zero(nlam);
+    Eigen::VectorXd alm = Eigen::VectorXd::Zero(nlam);
 
-    glmnetpp::FishElNetDriver<double> driver;
-    if (relax) {
-        driver.fit(alpha, X_eigen, y_eigen, weights_eigen, nlam, lambda_eigen, max_iter, tol, coef_eigen);
-    } else {
-        driver.fit(alpha, X_eigen, y_eigen, weights_eigen, nlam, lambda_eigen, max_iter, tol, coef_eigen);
+    {
+        py::gil_scoped_release release;
+        elnet_driver_t driver;
+        try {
+            driver.fit(alpha, x, y, g, jd, vp, cl, ne, nx, nlam, flmin, ulam, thr,
+                       isd, true, maxit, 0, lmu, a0, ca, ia, nin, nulldev, dev, alm,
+                       nlp, jerr, [](int) {}, InternalParams());
+        } catch (const std::bad_alloc&) {
+            jerr = glmnetpp::util::bad_alloc_error().err_code();
+        } catch (const std::exception&) {
+            jerr = 10001;
+        }
     }
-}
-
-void coxnet(
-    double alpha, int nobs, int nvars, py::array_t<double> X, py::array_t<double> time,
-    py::array_t<double> status, py::array_t<double> weights, int nlam,
-    py::array_t<double> lambda_path, int max_iter, double tol, bool relax,
-    py::array_t<double> coef
-) {
-    Eigen::Map<Eigen::MatrixXd> X_eigen(X.mutable_data(), nobs, nvars);
-    Eigen::Map<Eigen::VectorXd> time_eigen(time.mutable_data(), nobs);
-    Eigen::Map<Eigen::VectorXd> status_eigen(status.mutable_data(), nobs);
-    Eigen::Map<Eigen::VectorXd> weights_eigen(weights.mutable_data(), nobs);
-    Eigen::Map<Eigen::VectorXd> lambda_eigen(lambda_path.mutable_data(), nlam);
-    Eigen::Map<Eigen::VectorXd> coef_eigen(coef.mutable_data(), nvars);
 
-    glmnetpp::CoxElNetDriver<double> driver;
-    if (relax) {
-        driver.fit(alpha, X_eigen, time_eigen, status_eigen, weights_eigen, nlam, lambda_eigen, max_iter, tol, coef_eigen);
-    } else {
-        driver.fit(alpha, X_eigen, time_eigen, status_eigen, weights_eigen, nlam, lambda_eigen, max_iter, tol, coef_eigen);
+    // ca is stored column-major as (nx, nlam); only the entered rows matter.
+    const int n_entered = lmu > 0 ? nin.head(lmu).maxCoeff() : 0;
+    Eigen::MatrixXd ca_mat = Eigen::Map<Eigen::MatrixXd>(ca.data(), nx, nlam)
+                                 .topLeftCorner(n_entered, lmu);
+    Eigen::VectorXi ia0 = ia.head(n_entered).array() - 1;
+    // glmnet reports the first lambda as `big`; the sequence is geometric,
+    // so recover lambda_max from the second value (R's fix.lam).
+    if (lmu >= 2 && flmin < 1.0) {
+        alm(0) = alm(1) * std::pow(flmin, -1.0 / (nlam - 1));
     }
+
+    py::dict out;
+    out["a0"] = Eigen::VectorXd(a0.row(0).head(lmu).transpose());
+    out["ca"] = ca_mat;
+    out["ia"] = ia0;
+    out["nin"] = Eigen::VectorXi(nin.head(lmu));
+    out["alm"] = Eigen::VectorXd(alm.head(lmu));
+    out["dev"] = Eigen::VectorXd(dev.head(lmu));
+    out["nulldev"] = nulldev;
+    out["lmu"] = lmu;
+    out["n_passes"] = nlp;
+    out["jerr"] = jerr;
+    return out;
 }
 
-void mrelnet(
-    double alpha, int nobs, int nvars, py::array_t<double> X, py::array_t<double> y,
-    py::array_t<double> weights, int nlam, py::array_t<double> lambda_path,
-    int max_iter, double tol, bool relax, py::array_t<double> coef
-) {
-    Eigen::Map<Eigen::MatrixXd> X_eigen(X.mutable_data(), nobs, nvars);
-    Eigen::Map<Eigen::MatrixXd> y_eigen(y.mutable_data(), nobs, y.shape()[1]);
-    Eigen::Map<Eigen::VectorXd> weights_eigen(weights.mutable_data(), nobs);
-    Eigen::Map<Eigen::VectorXd> lambda_eigen(lambda_path.mutable_data(), nlam);
-    Eigen::Map<Eigen::VectorXd> coef_eigen(coef.mutable_data(), nvars * y.shape()[1]);
+py::dict fit_logistic_regression(
+    strided_array x, Eigen::Ref<const Eigen::VectorXd> y01, Eigen::Ref<const Eigen::VectorXd> w,
+    double alpha, int nlam, int ne, int nx, double flmin, bool isd, double thr, int maxit)
+{
+    if (x.ndim() != 2) throw std::invalid_argument("x must be two-dimensional.");
+    // The dense driver standardizes x in place, so it works on a copy, as
+    // R's lognet_exp does. The copy is made straight from x's own layout,
+    // so C-ordered input is not converted to Fortran order first.
+    using strided_map = Eigen::Map<const Eigen::MatrixXd, 0, Eigen::Stride<Eigen::Dynamic, Eigen::Dynamic>>;
+    const Eigen::Index item = static_cast<Eigen::Index>(sizeof(double));
+    Eigen::MatrixXd x_copy = strided_map(
+        x.data(), x.shape(0), x.shape(1),
+        Eigen::Stride<Eigen::Dynamic, Eigen::Dynamic>(x.strides(1) / item, x.strides(0) / item));
+    return lognet_path(x_copy, y01, w, alpha, nlam, ne, nx, flmin, isd, thr, maxit);
+}
 
-    glmnetpp::MultiGaussElNetDriver<double> driver;
-    if (relax) {
-        driver.fit(alpha, X_eigen, y_eigen, weights_eigen, nlam, lambda_eigen, max_iter, tol, coef_eigen);
-    } else {
-        driver.fit(alpha, X_eigen, y_eigen, weights_eigen, nlam, lambda_eigen, max_iter, tol, coef_eigen);
-    }
+py::dict fit_logistic_regression_sparse(
+    int n_rows, int n_cols, dense_array data, index_array indices, index_array indptr,
+    Eigen::Ref<const Eigen::VectorXd> y01, Eigen::Ref<const Eigen::VectorXd> w,
+    double alpha, int nlam, int ne, int nx, double flmin, bool isd, double thr, int maxit)
+{
+    if (indptr.size() != n_cols + 1) throw std::invalid_argument("indptr must have n_cols + 1 entries.");
+    // The sparse driver centers implicitly and never writes to x.
+    Eigen::Map<const Eigen::SparseMatrix<double>> x(
+        n_rows, n_cols, static_cast<Eigen::Index>(data.size()),
+        indptr.data(), indices.data(), data.data());
+    return lognet_path(x, y01, w, alpha, nlam, ne, nx, flmin, isd, thr, maxit);
 }
 
+}  // namespace
+
 PYBIND11_MODULE(_glmnet, m) {
-    m.def("elnet", &elnet, "GLMNet Gaussian regression");
-    m.def("lognet", &lognet, "GLMNet logistic regression");
-    m.def("multnet", &multnet, "GLMNet multinomial regression");
-    m.def("fishnet", &fishnet, "GLMNet Poisson regression");
-    m.def("coxnet", &coxnet, "GLMNet Cox regression");
-    m.def("mrelnet", &mrelnet, "GLMNet multi-response Gaussian regression");
-}
\ No newline at end of file
+    m.doc() = "glmnetpp path solvers.";
+    m.def("fit_logistic_regression", &fit_logistic_regression,
+          "Binomial elastic-net path on a dense matrix.",
+          py::arg("x"), py::arg("y"), py::arg("w"), py::arg("alpha"), py::arg("nlambda"),
+          py::arg("ne"), py::arg("nx"), py::arg("lambda_min_ratio"), py::arg("standardize"),
+          py::arg("thresh") = 1e-7, py::arg("maxit") = 100000);
+    m.def("fit_logistic_regression_sparse", &fit_logistic_regression_sparse,
+          "Binomial elastic-net path on a CSC matrix.",
+          py::arg("n_rows"), py::arg("n_cols"), py::arg("data"), py::arg("indices"),
+          py::arg("indptr"), py::arg("y"), py::arg("w"), py::arg("alpha"), py::arg("nlambda"),
+          py::arg("ne"), py::arg("nx"), py::arg("lambda_min_ratio"), py::arg("standardize"),
+          py::arg("thresh") = 1e-7, py::arg("maxit") = 100000);
+}
@@ -0,0 +1,133 @@
+"""
+This module contains the GramAccumulator class, which streams the sufficient
+statistics of a Gaussian model (weighted means, X'X and X'y) chunk by chunk.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+from .binding._design import _row_blocks
+
+
+class GramAccumulator:
+    """
+    Weighted sufficient statistics of a linear model, accumulated in chunks.
+
+    The statistics are kept centered: means plus centered cross-products,
+    combined across chunks with the pairwise update of Chan et al. This is
+    numerically stable for features with large offsets, and two accumulators
+    built on disjoint data (e.g. by parallel workers) can be merged exactly.
+
+    Parameters
+    ----------
+    n_features : int
+        The number of features of every chunk.
+
+    Attributes
+    ----------
+    n_samples_seen_ : int
+        The number of rows accumulated.
+    sum_weights_ : float
+        The total observation weight.
+    x_mean_ : ndarray of shape (n_features,)
+    y_mean_ : float
+        The weighted means.
+    xx_ : ndarray of shape (n_features, n_features)
+    xy_ : ndarray of shape (n_features,)
+    yy_ : float
+        The weighted, centered sums of squares and cross-products.
+    """
+
+    def __init__(self, n_features):
+        self.n_features = int(n_features)
+        self.n_samples_seen_ = 0
+        self.sum_weights_ = 0.0
+        self.x_mean_ = np.zeros(self.n_features)
+        self.y_mean_ = 0.0
+        self.xx_ = np.zeros((self.n_features, self.n_features))
+        self.xy_ = np.zeros(self.n_features)
+        self.yy_ = 0.0
+
+    def update(self, X, y, sample_weight=None):
+        """
+        Add a chunk of rows.
+
+        `X` may be dense or sparse. Sparse chunks are densified in small row
+        blocks, so they are never copied whole.
+
+        Returns
+        -------
+        self
+        """
+        n = X.shape[0]
+        if X.shape[1] != self.n_features:
+            raise ValueError(
+                f"X has {X.shape[1]} features, but the accumulator is expecting "
+                f"{self.n_features} features as input."
+            )
+        y = np.asarray(y, dtype=np.float64)
+        w = np.ones(n) if sample_weight is None else np.asarray(sample_weight, dtype=np.float64)
+        if not sp.issparse(X):
+            self._update(np.asarray(X, dtype=np.float64), y, w)
+            return self
+        # Sparse chunks are centered like dense ones, one dense row block at a
+        # time, rather than from raw second moments that cancel badly.
+        X = sp.csr_matrix(X)
+        for rows in _row_blocks(n, self.n_features):
+            self._update(X[rows].toarray(), y[rows], w[rows])
+        return self
+
+    def _update(self, X, y, w):
+        n = X.shape[0]
+        sw = w.sum()
+        if n == 0 or sw == 0:
+            self.n_samples_seen_ += n
+            return
+        x_mean = w @ X / sw
+        y_mean = w @ y / sw
+        yc = y - y_mean
+        xc = X - x_mean
+        xcw = xc * w[:, None]
+        self._combine(n, sw, x_mean, y_mean, xcw.T @ xc, xcw.T @ yc, w @ (yc * yc))
+
+    def merge(self, other):
+        """
+        Add the statistics of another accumulator, built on different rows.
+
+        Returns
+        -------
+        self
+        """
+        if other.n_features != self.n_features:
+            raise ValueError(
+                f"Cannot merge accumulators with {other.n_features} and "
+                f"{self.n_features} features."
+            )
+        if other.sum_weights_ == 0:
+            self.n_samples_seen_ += other.n_samples_seen_
+            return self
+        self._combine(other.n_samples_seen_, other.sum_weights_, other.x_mean_,
+                      other.y_mean_, other.xx_, other.xy_, other.yy_)
+        return self
+
+    def _combine(self, n, sw, x_mean, y_mean, xx, xy, yy):
+        total = self.sum_weights_ + sw
+        factor = self.sum_weights_ * sw / total
+        dx = x_mean - self.x_mean_
+        dy = y_mean - self.y_mean_
+        self.xx_ = self.xx_ + xx + factor * np.outer(dx, dx)
+        self.xy_ = self.xy_ + xy + factor * dx * dy
+        self.yy_ = self.yy_ + yy + factor * dy * dy
+        self.x_mean_ = self.x_mean_ + dx * (sw / total)
+        self.y_mean_ = self.y_mean_ + dy * (sw / total)
+        self.sum_weights_ = total
+        self.n_samples_seen_ += n
+
+    def covariance(self):
+        """
+        Return the weighted covariances (X'X, X'y, y'y), normalized by the total weight.
+        """
+        if self.sum_weights_ == 0:
+            raise ValueError("No samples with positive weight have been accumulated.")
+        return (self.xx_ / self.sum_weights_, self.xy_ / self.sum_weights_,
+                self.yy_ / self.sum_weights_)
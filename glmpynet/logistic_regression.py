@@ -3,16 +3,101 @@ This module contains the LogisticRegression class, a scikit-learn compatible wra
 for penalized logistic regression.
 """
 
+import os
+import warnings
+from typing import Union
+
 import numpy as np
+import scipy.sparse as sp
 from sklearn.base import BaseEstimator, ClassifierMixin
-from sklearn.linear_model import LogisticRegression as SklearnLogisticRegression
+from sklearn.exceptions import ConvergenceWarning
 from sklearn.utils._param_validation import InvalidParameterError
 from sklearn.utils.multiclass import unique_labels, type_of_target
-from sklearn.utils.validation import check_X_y, check_array, check_is_fitted, validate_data
+from sklearn.utils.validation import (
+    check_X_y, check_array, check_consistent_length, check_is_fitted, column_or_1d, validate_data
+)
 
-# Import our new binding interface and mock implementation
+# Bindings are resolved by name and imported lazily on first use
+from .binding import get_binding, resolve_binding
 from .binding.base import GlmNetBinding
-from .binding.mock import MockGlmNetBinding
+from .path import CoefficientPath
+from .scoring import LogisticScorer
+from .serialization import load_model, save_model
+from .shared import SharedDesign
+from .storage import check_on_disk_X_y, is_on_disk
+
+
+def _check_path_limits(estimator):
+    """Validate the `dfmax` and `pmax` parameters of an estimator."""
+    for name in ("dfmax", "pmax"):
+        value = getattr(estimator, name)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, np.integer))
+                                  or value < 1):
+            raise InvalidParameterError(
+                f"The '{name}' parameter of {type(estimator).__name__} must be a positive "
+                f"int or None. Got {value!r} instead."
+            )
+
+
+def _check_n_jobs(n_jobs):
+    """
+    Resolve `n_jobs` to a number of workers as joblib does: None means one,
+    and negative values count back from the number of CPUs (-1 uses all).
+    """
+    if n_jobs is None:
+        return 1
+    if isinstance(n_jobs, bool) or not isinstance(n_jobs, (int, np.integer)) or n_jobs == 0:
+        raise InvalidParameterError(f"n_jobs must be a nonzero int or None; got (n_jobs={n_jobs!r})")
+    if n_jobs < 0:
+        return max((os.cpu_count() or 1) + 1 + int(n_jobs), 1)
+    return int(n_jobs)
+
+
+def _check_codes(X, columns):
+    """
+    Return the integer category codes in the given columns of X.
+
+    Raises
+    ------
+    ValueError
+        If a code is negative or not an integer.
+    """
+    codes = X[:, columns]
+    codes = codes.toarray() if sp.issparse(codes) else np.asarray(codes)
+    if codes.size and (codes.min() < 0 or np.any(codes != np.floor(codes))):
+        raise ValueError("Categorical features must hold non-negative integer codes.")
+    return codes.astype(np.int64)
+
+
+def _check_jerr(jerr):
+    """
+    Surface glmnet's error flag: positive values are fatal, negative values
+    mean the path was truncated (e.g. the iteration limit was reached).
+    """
+    if jerr > 0:
+        raise RuntimeError(f"glmnet failed with error code {jerr}.")
+    if jerr < 0:
+        warnings.warn(
+            f"glmnet stopped the path early (error code {jerr}); the fit "
+            "may not have converged.",
+            ConvergenceWarning,
+        )
+
+
+def _check_path(results, n_features):
+    """
+    Check the error flag of a binding's results and build the fitted path.
+
+    Raises
+    ------
+    RuntimeError
+        If glmnet failed or did not fit any lambda value.
+    """
+    _check_jerr(results.get('jerr', 0))
+    path = CoefficientPath.from_results(results, n_features)
+    if path.n_lambdas == 0:
+        raise RuntimeError("glmnet did not fit any lambda value.")
+    return path
 
 
 class LogisticRegression(ClassifierMixin, BaseEstimator):
@@ -29,16 +114,50 @@ class LogisticRegression(ClassifierMixin, BaseEstimator):
     penalty : {'l1', 'l2'}, default='l2'
         Specifies the norm of the penalty.
     C : float, default=1.0
-        Inverse of regularization strength; must be a positive float.
+        Inverse of regularization strength; must be a positive float. It is
+        validated but does not yet select the lambda: the model is always
+        taken at index ``nlambda // 2`` of the path, so C is not worth
+        searching over.
     alpha : float, optional
         The elastic net mixing parameter, with 0 <= alpha <= 1. If provided,
         this will override the `penalty` parameter.
     nlambda : int, default=100
         The number of lambda values in the regularization path.
+    dfmax : int, optional
+        Stop the path once more than `dfmax` features are nonzero. Useful
+        for very wide L1 fits. None means no limit.
+    pmax : int, optional
+        The maximum number of features that may ever enter the model along
+        the path. It bounds the memory of the stored path; if it is reached
+        the path is truncated with a `ConvergenceWarning`. None uses glmnet's
+        default of ``min(2 * dfmax + 20, n_features)``.
+    standardize : bool, default=True
+        Standardize the features inside the solver (glmnet's ``isd``) instead
+        of in a separate ``StandardScaler`` step, which would copy X. The
+        penalty then treats all features alike, and `coef_` is reported on
+        the original scale of X. Sparse input is centered implicitly and
+        stays sparse.
+    categorical_features : array-like of int or bool, optional
+        Columns of `X` that hold non-negative integer category codes, given
+        as indices or as a boolean mask. Each is fitted with one coefficient
+        per level, as if it were one-hot encoded, without building the
+        encoded matrix. The coefficients are in `category_coef_` and the
+        entries of `coef_` for these columns are zero. Codes not seen in
+        `fit` contribute nothing at prediction time.
+    group_penalty : bool, default=False
+        Penalize the levels of each categorical feature as one group (group
+        lasso), so that a categorical feature enters the model as a whole.
+    binding : str or GlmNetBinding, optional
+        The backend that fits the path: a registered binding name such as
+        ``"native"`` or ``"reference"``, or a binding instance. Defaults to
+        the compiled ``"native"`` binding when it is built, and to the
+        pure-NumPy ``"reference"`` solver otherwise.
     """
 
     def __init__(self, penalty: str = 'l2', C: float = 1.0, alpha: float = None, nlambda: int = 100,
-                 binding: GlmNetBinding = None):
+                 dfmax: int = None, pmax: int = None, standardize: bool = True,
+                 categorical_features=None,
+                 group_penalty: bool = False, binding: Union[str, GlmNetBinding] = None):
         """
         Initializes the LogisticRegression model. The constructor is "lean"
         and only stores parameters. All validation and translation happens in `fit`.
@@ -47,6 +166,11 @@ class LogisticRegression(ClassifierMixin, BaseEstimator):
         self.C = C
         self.alpha = alpha
         self.nlambda = nlambda
+        self.dfmax = dfmax
+        self.pmax = pmax
+        self.standardize = standardize
+        self.categorical_features = categorical_features
+        self.group_penalty = group_penalty
         self.binding = binding
 
     def _validate_and_translate_params(self):
@@ -80,17 +204,39 @@ class LogisticRegression(ClassifierMixin, BaseEstimator):
                     f"Got '{self.penalty}' instead."
                 )
 
-        return {"alpha": final_alpha, "nlambda": self.nlambda}
+        _check_path_limits(self)
+
+        return {"alpha": final_alpha, "nlambda": self.nlambda,
+                "dfmax": self.dfmax, "pmax": self.pmax,
+                "standardize": bool(self.standardize)}
 
     def fit(self, X, y):
         """
         Fit the logistic regression model according to the given training data.
+
+        `X` may be an array-like, a sparse matrix, or a memory-mapped matrix
+        opened with `glmpynet.storage.open_npy` / `glmpynet.storage.open_csc`;
+        float64 memory maps are never copied into memory.
         """
         # Step 1: Validate and translate hyperparameters
         glmnet_params = self._validate_and_translate_params()
 
-        # Step 2: Validate input data
-        X, y = check_X_y(X, y, accept_sparse=True)
+        # Step 2: Validate input data. Memory-mapped float64 matrices are
+        # validated in chunks and passed through without an in-memory copy.
+        # Shared designs were validated when published; a fold of one is fit
+        # on the whole shared matrix with zero weight outside the fold.
+        weights = None
+        if isinstance(X, SharedDesign):
+            y = column_or_1d(y, warn=True)
+            check_consistent_length(X, y)
+            weights = X.weights()
+            X, y_fit = X.matrix, X.expand(y)
+        elif is_on_disk(X) and X.dtype == np.float64:
+            X, y = check_on_disk_X_y(X, y)
+            y_fit = y
+        else:
+            X, y = check_X_y(X, y, accept_sparse=True)
+            y_fit = y
         self.classes_ = unique_labels(y)
         self.n_features_in_ = X.shape[1]
 
@@ -102,34 +248,102 @@ class LogisticRegression(ClassifierMixin, BaseEstimator):
                 "Only binary classification is supported. The type of the target "
                 f"is {y_type}."
             )
+        if self.classes_.shape[0] < 2:
+            raise ValueError("Classifier can't train when only one class is present.")
 
-        # Step 3: Instantiate the binding
-        if self.binding is None:
-            self.binding_ = MockGlmNetBinding()
-        else:
-            self.binding_ = self.binding
+        # Categorical columns are passed as codes and expanded by the binding
+        self.categorical_features_ = self._categorical_indices()
+        self.n_categories_ = np.zeros(len(self.categorical_features_), dtype=np.int64)
+        if len(self.categorical_features_):
+            self.n_categories_ = _check_codes(X, self.categorical_features_).max(axis=0) + 1
 
-        # Step 4: Call the binding's fit method with the translated parameters
-        results = self.binding_.fit(
+        # Step 3: Resolve the binding (imported on first use)
+        self.binding_ = resolve_binding(self.binding)
+
+        # Step 4: Call the binding's fit method with the translated parameters.
+        # A default binding without support for the request (e.g. categorical
+        # columns) falls back to the reference solver.
+        kwargs = dict(
             x=X,
-            y=y,
+            y=y_fit,
             alpha=glmnet_params['alpha'],
-            nlambda=glmnet_params['nlambda']
+            nlambda=glmnet_params['nlambda'],
+            dfmax=glmnet_params['dfmax'],
+            pmax=glmnet_params['pmax'],
+            standardize=glmnet_params['standardize'],
+            weights=weights,
+            categorical=self.categorical_features_ if len(self.categorical_features_) else None,
+            group_penalty=self.group_penalty,
         )
+        try:
+            results = self.binding_.fit(**kwargs)
+        except NotImplementedError:
+            if self.binding is not None:
+                raise
+            self.binding_ = get_binding("reference")
+            results = self.binding_.fit(**kwargs)
 
-        # Step 5: Store the fitted coefficients
-        lambda_idx_to_use = self.nlambda // 2
-        self.intercept_ = np.array([results['a0'][lambda_idx_to_use]])
-        self.coef_ = results['ca'][:, lambda_idx_to_use].T.reshape(1, -1)
+        # Step 5: Keep the full path and store the selected coefficients.
+        # glmnet may stop the path early, so the index is clamped to it.
+        n_expanded = self.n_features_in_ + int(self.n_categories_.sum())
+        self.path_ = _check_path(results, n_expanded)
+        self.lambda_index_ = min(self.nlambda // 2, self.path_.n_lambdas - 1)
+        self.intercept_ = np.array([self.path_.a0[self.lambda_index_]])
+        coef = self.path_.coef(self.lambda_index_)
+        self.coef_ = coef[:self.n_features_in_].reshape(1, -1)
+        self.category_coef_ = np.split(coef[self.n_features_in_:],
+                                       np.cumsum(self.n_categories_)[:-1]) \
+            if len(self.n_categories_) else []
 
         return self
 
+    def _categorical_indices(self):
+        """Resolve `categorical_features` to sorted column indices."""
+        if self.categorical_features is None:
+            return np.zeros(0, dtype=np.int64)
+        features = np.asarray(self.categorical_features)
+        if features.dtype == bool:
+            if features.shape != (self.n_features_in_,):
+                raise ValueError(
+                    f"The boolean mask categorical_features has {features.size} entries, "
+                    f"but X has {self.n_features_in_} features."
+                )
+            return np.flatnonzero(features)
+        features = np.unique(features.astype(np.int64))
+        if features.size and (features[0] < 0 or features[-1] >= self.n_features_in_):
+            raise ValueError(
+                f"categorical_features must be column indices in [0, {self.n_features_in_}); "
+                f"got {self.categorical_features!r}."
+            )
+        return features
+
     def _decision_function(self, X):
         """Calculate the linear decision function."""
         check_is_fitted(self)
+        if isinstance(X, SharedDesign):
+            # Score the rows of a shared design chunk by chunk, without
+            # gathering the whole selection into memory.
+            if X.shape[1] != self.n_features_in_:
+                raise ValueError(
+                    f"X has {X.shape[1]} features, but LogisticRegression is expecting "
+                    f"{self.n_features_in_} features as input."
+                )
+            return np.vstack([self._scores(chunk) for chunk in X.iter_chunks()])
         # Use validate_data to ensure n_features_in_ is checked correctly
         X = validate_data(self, X, accept_sparse=True, reset=False)
-        return (X @ self.coef_.T) + self.intercept_
+        return self._scores(X)
+
+    def _scores(self, X):
+        """The decision function of validated rows."""
+        scores = np.asarray(X @ self.coef_.T) + self.intercept_
+        categorical = getattr(self, "categorical_features_", ())
+        if len(categorical):
+            codes = _check_codes(X, categorical)
+            for column, table in zip(codes.T, self.category_coef_):
+                # Unseen codes contribute nothing, like an all-zero one-hot row.
+                known = column < len(table)
+                scores[known, 0] += table[column[known]]
+        return scores
 
     def predict(self, X):
         """
@@ -148,6 +362,49 @@ class LogisticRegression(ClassifierMixin, BaseEstimator):
         prob_class_0 = 1 - prob_class_1
         return np.vstack((prob_class_0, prob_class_1)).T
 
+    def make_scorer(self):
+        """
+        Return a prevalidated scorer for low-latency online prediction.
+
+        The returned `LogisticScorer` holds a contiguous copy of the fitted
+        coefficients and skips the per-call validation done by `predict_proba`.
+        It is a snapshot of the current fit.
+        """
+        check_is_fitted(self)
+        return LogisticScorer(self.coef_, self.intercept_, self.classes_,
+                              categorical=getattr(self, "categorical_features_", None),
+                              category_coef=getattr(self, "category_coef_", None))
+
+    def save(self, path):
+        """
+        Save the fitted model, including its full path, in the compact model format.
+
+        Parameters
+        ----------
+        path : str or path-like
+            Destination file. An existing file is replaced atomically.
+        """
+        check_is_fitted(self)
+        save_model(self, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load a model written by `save`.
+
+        Parameters
+        ----------
+        path : str or path-like
+            The model file.
+        mmap : bool, default=True
+            Map the coefficient arrays read-only instead of reading them into
+            memory. Worker processes loading the same file then share pages.
+        """
+        model = load_model(path, mmap=mmap)
+        if not isinstance(model, cls):
+            raise TypeError(f"{path} contains a {type(model).__name__}, not a {cls.__name__}.")
+        return model
+
     def _more_tags(self):
         """
         Provides custom metadata to scikit-learn's tag system. This is the
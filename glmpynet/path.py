@@ -0,0 +1,130 @@
+"""
+This module contains the CoefficientPath class, the compressed representation
+of a fitted regularization path used by glmnet.
+"""
+
+import numpy as np
+
+
+class CoefficientPath:
+    """
+    A regularization path in glmnet's compressed coefficient format.
+
+    glmnet does not return a dense (n_features, n_lambdas) matrix. It returns
+    the coefficients of the features that ever entered the model, in the order
+    in which they entered, together with the number of entered features at
+    each lambda. This class stores that representation and expands single
+    solutions on demand.
+
+    Parameters
+    ----------
+    a0 : ndarray of shape (n_lambdas,)
+        The intercept at each lambda.
+    ca : ndarray of shape (nx, n_lambdas)
+        Compressed coefficients. Row `k` holds the coefficients of feature
+        `ia[k]`; only the first `nin[l]` rows are meaningful at lambda `l`.
+    ia : ndarray of shape (nx,)
+        Zero-based feature indices of the rows of `ca`.
+    nin : ndarray of shape (n_lambdas,)
+        The number of entered features at each lambda.
+    alm : ndarray of shape (n_lambdas,)
+        The lambda values.
+    n_features : int
+        The total number of features.
+    dev : ndarray of shape (n_lambdas,), optional
+        The fraction of null deviance explained at each lambda.
+    """
+
+    def __init__(self, a0, ca, ia, nin, alm, n_features, dev=None):
+        self.a0 = a0
+        self.ca = ca
+        self.ia = ia
+        self.nin = nin
+        self.alm = alm
+        self.n_features = int(n_features)
+        self.dev = dev
+
+    @property
+    def n_lambdas(self):
+        """The number of fitted lambda values."""
+        return self.a0.shape[0]
+
+    @classmethod
+    def from_dense(cls, a0, coef, alm=None, dev=None):
+        """
+        Build a compressed path from a dense (n_features, n_lambdas) matrix.
+        """
+        coef = np.asarray(coef, dtype=np.float64)
+        a0 = np.asarray(a0, dtype=np.float64)
+        n_features, n_lambdas = coef.shape
+        nonzero = coef != 0
+        ever = nonzero.any(axis=1)
+        first = np.where(ever, nonzero.argmax(axis=1), n_lambdas)
+        # Order the features by the lambda at which they first entered.
+        ia = np.argsort(first, kind="stable")[: np.count_nonzero(ever)]
+        nin = np.searchsorted(np.sort(first[ia]), np.arange(n_lambdas), side="right")
+        if alm is None:
+            alm = np.full(n_lambdas, np.nan)
+        return cls(
+            a0=a0,
+            ca=np.ascontiguousarray(coef[ia]),
+            ia=ia.astype(np.int64),
+            nin=nin.astype(np.int64),
+            alm=np.asarray(alm, dtype=np.float64),
+            n_features=n_features,
+            dev=dev,
+        )
+
+    @classmethod
+    def from_results(cls, results, n_features):
+        """
+        Build a path from the dictionary returned by `GlmNetBinding.fit`.
+
+        Bindings that return the compressed `ia`/`nin` arrays are used as-is,
+        otherwise `ca` is treated as a dense (n_features, n_lambdas) matrix.
+        """
+        dev = results.get("dev")
+        if "ia" in results and "nin" in results:
+            # Bindings may return buffers sized for nlambda and stop the path
+            # early; `lmu` is the number of lambdas actually fitted.
+            n_lambdas = int(results.get("lmu", len(results["a0"])))
+            a0 = np.asarray(results["a0"], dtype=np.float64)[:n_lambdas]
+            nin = np.asarray(results["nin"], dtype=np.int64)[:n_lambdas]
+            nx = int(nin.max()) if n_lambdas else 0
+            return cls(
+                a0=a0,
+                ca=np.asarray(results["ca"], dtype=np.float64)[:nx, :n_lambdas],
+                ia=np.asarray(results["ia"], dtype=np.int64)[:nx],
+                nin=nin,
+                alm=np.asarray(results.get("alm", np.full(n_lambdas, np.nan)),
+                               dtype=np.float64)[:n_lambdas],
+                n_features=n_features,
+                dev=None if dev is None else np.asarray(dev, dtype=np.float64)[:n_lambdas],
+            )
+        return cls.from_dense(results["a0"], results["ca"], results.get("alm"), dev)
+
+    def coef(self, index):
+        """
+        Return the dense coefficient vector of shape (n_features,) at a lambda index.
+        """
+        beta = np.zeros(self.n_features)
+        k = int(self.nin[index])
+        beta[self.ia[:k]] = self.ca[:k, index]
+        return beta
+
+    def to_dense(self):
+        """
+        Return the full dense coefficient matrix of shape (n_features, n_lambdas).
+        """
+        dense = np.zeros((self.n_features, self.n_lambdas))
+        for index in range(self.n_lambdas):
+            k = int(self.nin[index])
+            dense[self.ia[:k], index] = self.ca[:k, index]
+        return dense
+
+    def arrays(self):
+        """Return the named arrays backing this path."""
+        arrays = {"a0": self.a0, "ca": self.ca, "ia": self.ia, "nin": self.nin, "alm": self.alm}
+        if self.dev is not None:
+            arrays["dev"] = self.dev
+        return arrays
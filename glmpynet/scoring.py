@@ -0,0 +1,222 @@
+"""
+This module contains the LogisticScorer class, a prevalidated scorer for
+low-latency online prediction with a fitted LogisticRegression.
+"""
+
+import math
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.special import expit
+
+
+class LogisticScorer:
+    """
+    A lightweight, prevalidated scorer for a fitted binary logistic model.
+
+    The estimator's `predict_proba` validates its input and checks that the
+    model is fitted on every call, which dominates the cost of scoring a
+    single row. A scorer is validated once, when it is created with
+    `LogisticRegression.make_scorer()`, and afterwards only checks the number
+    of features. It holds a contiguous float64 copy of the coefficients and
+    can score single rows, sparse feature mappings and small batches with
+    minimal allocation.
+
+    Models with categorical features keep one table of level coefficients
+    per categorical column; the code in that column selects the entry that
+    is added to the score. Codes beyond the fitted levels add nothing.
+
+    The scorer is a snapshot: refitting the estimator does not update it.
+
+    Parameters
+    ----------
+    coef : array-like of shape (n_features,) or (1, n_features)
+        The fitted coefficients.
+    intercept : float
+        The fitted intercept.
+    classes : array-like of shape (2,)
+        The class labels, ordered as in the estimator's `classes_`.
+    categorical : array-like of int, optional
+        The indices of the categorical columns.
+    category_coef : list of array-like, optional
+        The level coefficients of each categorical column, in the order of
+        `categorical`.
+    """
+
+    __slots__ = ("coef", "intercept", "classes", "n_features_in_", "categorical", "category_coef")
+
+    def __init__(self, coef, intercept, classes, categorical=None, category_coef=None):
+        self.coef = np.ascontiguousarray(coef, dtype=np.float64).ravel()
+        self.intercept = float(np.ravel(intercept)[0])
+        self.classes = np.asarray(classes)
+        self.n_features_in_ = self.coef.shape[0]
+        self.categorical = np.zeros(0, dtype=np.intp) if categorical is None else \
+            np.asarray(categorical, dtype=np.intp)
+        self.category_coef = [np.ascontiguousarray(table, dtype=np.float64)
+                              for table in (category_coef or ())]
+        if len(self.category_coef) != len(self.categorical):
+            raise ValueError(
+                f"Got {len(self.category_coef)} level tables for "
+                f"{len(self.categorical)} categorical columns."
+            )
+
+    def _check_n_features(self, n_features):
+        if n_features != self.n_features_in_:
+            raise ValueError(
+                f"X has {n_features} features, but LogisticScorer is expecting "
+                f"{self.n_features_in_} features as input."
+            )
+
+    def decision_function(self, X, out=None):
+        """
+        Compute the linear decision function.
+
+        Parameters
+        ----------
+        X : array-like of shape (n_features,) or (n_samples, n_features), or sparse matrix
+            A single row or a batch of rows.
+        out : ndarray of shape (n_samples,), optional
+            Preallocated float64 buffer to write batch scores into.
+
+        Returns
+        -------
+        float or ndarray of shape (n_samples,)
+            A float for a single 1-D row, an array otherwise.
+        """
+        if sp.issparse(X):
+            self._check_n_features(X.shape[1])
+            scores = np.asarray(X @ self.coef).ravel()
+            if out is None:
+                out = scores
+            else:
+                out[:] = scores
+            out += self.intercept
+            if len(self.categorical):
+                out += self._category_scores(X[:, self.categorical].toarray())
+            return out
+
+        X = np.asarray(X)
+        self._check_n_features(X.shape[-1])
+        if X.ndim == 1:
+            score = float(X @ self.coef) + self.intercept
+            if len(self.categorical):
+                score += float(self._category_scores(X[self.categorical].reshape(1, -1))[0])
+            return score
+        out = np.matmul(X, self.coef, out=out)
+        out += self.intercept
+        if len(self.categorical):
+            out += self._category_scores(X[:, self.categorical])
+        return out
+
+    def _category_scores(self, codes):
+        """The summed level coefficients of rows of category codes."""
+        if codes.size and (codes.min() < 0 or np.any(codes != np.floor(codes))):
+            raise ValueError("Categorical features must hold non-negative integer codes.")
+        codes = codes.astype(np.intp)
+        scores = np.zeros(codes.shape[0])
+        for column, table in zip(codes.T, self.category_coef):
+            known = column < len(table)
+            scores[known] += table[column[known]]
+        return scores
+
+    def score_one(self, x):
+        """
+        Probability of the positive class (`classes[1]`) for a single row.
+
+        Parameters
+        ----------
+        x : array-like of shape (n_features,)
+
+        Returns
+        -------
+        float
+        """
+        return _sigmoid(self.decision_function(x))
+
+    def score_dict(self, features):
+        """
+        Probability of the positive class for a sparse row given as a mapping.
+
+        Parameters
+        ----------
+        features : dict of {int: float}
+            Feature index to value. Missing features are zero, which is
+            code 0 for a categorical column.
+
+        Returns
+        -------
+        float
+        """
+        n = len(features)
+        offset = self.intercept
+        if len(self.categorical):
+            codes = np.array([[features.get(int(c), 0.0) for c in self.categorical]])
+            offset += float(self._category_scores(codes)[0])
+        if n == 0:
+            return _sigmoid(offset)
+        idx = np.fromiter(features.keys(), dtype=np.intp, count=n)
+        val = np.fromiter(features.values(), dtype=np.float64, count=n)
+        if idx.min() < 0 or idx.max() >= self.n_features_in_:
+            raise IndexError(
+                f"Feature indices must be in [0, {self.n_features_in_}); "
+                f"got {idx.min()} to {idx.max()}."
+            )
+        return _sigmoid(float(self.coef[idx] @ val) + offset)
+
+    def score(self, X, out=None):
+        """
+        Probability of the positive class for a row, a mapping or a batch.
+
+        Dispatches to `score_dict` for mappings and `score_one` for 1-D rows.
+        Batches return an array of shape (n_samples,), written into `out`
+        when it is given.
+        """
+        if isinstance(X, dict):
+            return self.score_dict(X)
+        if not sp.issparse(X) and np.ndim(X) == 1:
+            return self.score_one(X)
+        scores = self.decision_function(X, out=out)
+        return expit(scores, out=scores)
+
+    def predict_proba(self, X, out=None):
+        """
+        Probability estimates for a batch, as returned by the estimator.
+
+        Parameters
+        ----------
+        X : array-like of shape (n_samples, n_features), or sparse matrix
+        out : ndarray of shape (n_samples, 2), optional
+            Preallocated float64 buffer for the result.
+
+        Returns
+        -------
+        ndarray of shape (n_samples, 2)
+        """
+        if not sp.issparse(X):
+            X = np.asarray(X)
+            if X.ndim == 1:
+                X = X.reshape(1, -1)
+        if out is None:
+            out = np.empty((X.shape[0], 2))
+        p1 = out[:, 1]
+        p1[:] = self.decision_function(X)
+        expit(p1, out=p1)
+        np.subtract(1.0, p1, out=out[:, 0])
+        return out
+
+    def predict(self, X):
+        """
+        Predict class labels for a single row or a batch.
+        """
+        scores = self.decision_function(X)
+        if np.ndim(scores) == 0:
+            return self.classes[int(scores > 0)]
+        return self.classes[(scores > 0).astype(int)]
+
+
+def _sigmoid(z):
+    """Numerically stable logistic function for a Python float."""
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
@@ -0,0 +1,212 @@
+"""
+This module implements the compact, array-backed model format used by
+`LogisticRegression.save` and `LogisticRegression.load`.
+
+File layout (all integers little-endian)::
+
+    magic          8 bytes   b"GLMPYNET"
+    version        uint32    FORMAT_VERSION
+    header_length  uint32    length of the JSON header in bytes
+    header         JSON      estimator name, parameters, scalar attributes
+                             and an index of the arrays below
+    padding        to a multiple of ALIGNMENT bytes
+    arrays         raw C-ordered array data, each starting at a multiple of
+                   ALIGNMENT bytes from the start of the data section
+
+Version 2 adds the categorical columns, their numbers of levels and the
+concatenated level coefficients; version 1 files load as models without
+categorical features.
+
+Because arrays are stored uncompressed and aligned, they can be mapped
+read-only straight from the file, so loading only parses the header and many
+processes loading the same model share the same physical pages.
+"""
+
+import json
+import os
+import struct
+
+import numpy as np
+from sklearn.utils.validation import check_is_fitted
+
+from ._version import __version__
+from .path import CoefficientPath
+
+MAGIC = b"GLMPYNET"
+FORMAT_VERSION = 2
+ALIGNMENT = 64
+
+_PREAMBLE = struct.Struct("<8sII")
+_PATH_ARRAYS = ("a0", "ca", "ia", "nin", "alm", "dev")
+
+
+def _aligned(n):
+    return -(-n // ALIGNMENT) * ALIGNMENT
+
+
+def _json_value(value):
+    """
+    Convert a parameter to a JSON value. NumPy scalars, and lists, tuples or
+    arrays of numbers (e.g. `categorical_features`), become Python values.
+
+    Returns
+    -------
+    value : object
+    serializable : bool
+        False for values that cannot be written, such as binding objects.
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value, True
+    if isinstance(value, np.generic):
+        return value.item(), True
+    if isinstance(value, (list, tuple, np.ndarray)):
+        items = np.asarray(value)
+        if items.ndim == 1 and items.dtype.kind in "biuf":
+            return items.tolist(), True
+    return None, False
+
+
+def save_model(estimator, path):
+    """
+    Write a fitted estimator to `path` in the compact model format.
+
+    The file is written to a temporary name and moved into place, so readers
+    never observe a partially written model.
+    """
+    check_is_fitted(estimator)
+
+    categorical = getattr(estimator, "categorical_features_", [])
+    category_coef = getattr(estimator, "category_coef_", [])
+    arrays = {
+        "coef_": np.asarray(estimator.coef_, dtype=np.float64),
+        "intercept_": np.asarray(estimator.intercept_, dtype=np.float64),
+        "categorical_features_": np.asarray(categorical, dtype=np.int64),
+        "n_categories_": np.asarray([len(table) for table in category_coef], dtype=np.int64),
+        "category_coef_": np.concatenate([np.zeros(0)] + [np.asarray(table, dtype=np.float64)
+                                                          for table in category_coef]),
+    }
+    for name, array in estimator.path_.arrays().items():
+        arrays[name] = np.asarray(array)
+
+    params = {}
+    for key, value in estimator.get_params(deep=False).items():
+        value, serializable = _json_value(value)
+        if serializable:
+            params[key] = value
+
+    index = {}
+    offset = 0
+    for name, array in arrays.items():
+        index[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _aligned(offset + array.nbytes)
+
+    classes = np.asarray(estimator.classes_)
+    header = json.dumps({
+        "estimator": type(estimator).__name__,
+        "glmpynet_version": __version__,
+        "params": params,
+        "attributes": {
+            "n_features_in_": int(estimator.n_features_in_),
+            "lambda_index_": int(estimator.lambda_index_),
+            "classes_": classes.tolist(),
+            "classes_dtype": classes.dtype.str if classes.dtype != object else None,
+        },
+        "arrays": index,
+    }).encode("utf-8")
+
+    data_start = _aligned(_PREAMBLE.size + len(header))
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(data_start + index[name]["offset"])
+                f.write(np.ascontiguousarray(array).data)
+            f.truncate(data_start + offset)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_header(path):
+    """
+    Read and validate the header of a model file.
+
+    Returns
+    -------
+    header : dict
+        The decoded JSON header.
+    data_start : int
+        The byte offset of the data section.
+    """
+    with open(path, "rb") as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) != _PREAMBLE.size:
+            raise ValueError(f"{path} is not a glmpynet model file.")
+        magic, version, header_length = _PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a glmpynet model file.")
+        if version > FORMAT_VERSION:
+            raise ValueError(
+                f"{path} uses model format version {version}, but this version of "
+                f"glmpynet only reads versions up to {FORMAT_VERSION}."
+            )
+        header = json.loads(f.read(header_length).decode("utf-8"))
+    return header, _aligned(_PREAMBLE.size + header_length)
+
+
+def load_model(path, mmap=True):
+    """
+    Load an estimator written by `save_model`.
+
+    Parameters
+    ----------
+    path : str or path-like
+        The model file.
+    mmap : bool, default=True
+        If True, arrays are read-only views of a single memory map of the
+        file and are paged in lazily. If False, arrays are read into memory.
+    """
+    from .logistic_regression import LogisticRegression
+
+    estimators = {"LogisticRegression": LogisticRegression}
+
+    header, data_start = read_header(path)
+    name = header["estimator"]
+    if name not in estimators:
+        raise ValueError(f"Unknown estimator '{name}' in {path}.")
+
+    if mmap:
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    else:
+        with open(path, "rb") as f:
+            buffer = np.frombuffer(f.read(), dtype=np.uint8)
+
+    arrays = {}
+    for key, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        start = data_start + spec["offset"]
+        nbytes = dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+        array = buffer[start:start + nbytes].view(dtype).reshape(shape)
+        arrays[key] = array if mmap else array.copy()
+
+    estimator = estimators[name](**header["params"])
+    attributes = header["attributes"]
+    estimator.classes_ = np.asarray(attributes["classes_"], dtype=attributes["classes_dtype"])
+    estimator.n_features_in_ = attributes["n_features_in_"]
+    estimator.lambda_index_ = attributes["lambda_index_"]
+    estimator.coef_ = arrays["coef_"]
+    estimator.intercept_ = arrays["intercept_"]
+    estimator.categorical_features_ = arrays.get("categorical_features_", np.zeros(0, dtype=np.int64))
+    estimator.n_categories_ = arrays.get("n_categories_", np.zeros(0, dtype=np.int64))
+    estimator.category_coef_ = np.split(arrays.get("category_coef_", np.zeros(0)),
+                                        np.cumsum(estimator.n_categories_)[:-1]) \
+        if len(estimator.n_categories_) else []
+    estimator.path_ = CoefficientPath(
+        n_features=attributes["n_features_in_"] + int(np.sum(estimator.n_categories_)),
+        **{key: arrays.get(key) for key in _PATH_ARRAYS},
+    )
+    return estimator
@@ -0,0 +1,247 @@
+"""
+This module contains `share`, which publishes a validated design matrix once
+for all the worker processes of a cross-validation or search, and the
+`SharedDesign` handle it returns.
+
+Dense matrices are copied once, in Fortran order, into a
+`multiprocessing.shared_memory` block. Sparse matrices are written once as
+CSC arrays into a temporary directory with `glmpynet.storage.save_csc` and
+memory-mapped. A `SharedDesign` pickles to a few bytes (the block name or
+directory plus optional row indices); unpickling it in a worker attaches to
+the same pages instead of receiving a copy.
+
+Indexing a handle with row indices, which is what scikit-learn does to cut
+folds, returns another handle over the same matrix. Estimators fit such a
+fold by passing observation weights (the row counts) to the binding over the
+full matrix, so no fold ever copies X.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.utils.validation import check_array
+
+from .storage import open_csc, save_csc
+
+#: Default number of rows scored per chunk by `SharedDesign.iter_chunks`.
+DEFAULT_CHUNK_ROWS = 65536
+
+
+_attach_lock = threading.Lock()
+
+
+def _attach(name):
+    """Attach to an existing shared memory block without tracking it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python >= 3.13
+    except TypeError:
+        pass
+    # Before Python 3.13 attaching registers the block with the resource
+    # tracker, which then either unlinks it when the worker exits or, if the
+    # tracker is shared with the publisher, loses track of the publisher's
+    # registration. Only the publisher should track the block.
+    register = resource_tracker.register
+
+    def register_others(resource, rtype):
+        if rtype != "shared_memory":
+            register(resource, rtype)
+
+    with _attach_lock:
+        resource_tracker.register = register_others
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedDesign:
+    """
+    A handle to a design matrix published with `share`, optionally restricted to rows.
+
+    Attributes
+    ----------
+    shape : tuple of int
+        ``(n_rows, n_features)``, where `n_rows` is the number of selected rows.
+    rows : ndarray of shape (n_rows,) or None
+        Indices of the selected rows of the published matrix; None selects
+        all rows in order.
+    """
+
+    def __init__(self, location, shape, sparse, shm=None, owner=False):
+        self._location = location
+        self._full_shape = tuple(shape)
+        self._sparse = sparse
+        self._owner = owner
+        self.rows = None
+        self._shm = shm
+        self._attach()
+
+    def _attach(self):
+        # Only the handle that opened a shared memory block closes it.
+        self._closes = self._shm is None and not self._sparse
+        if self._sparse:
+            self._matrix = open_csc(self._location)
+        else:
+            if self._shm is None:
+                self._shm = _attach(self._location)
+            self._matrix = np.ndarray(self._full_shape, dtype=np.float64,
+                                      buffer=self._shm.buf, order="F")
+            self._matrix.flags.writeable = False
+
+    @property
+    def matrix(self):
+        """The full published matrix (a read-only view; never a copy)."""
+        return self._matrix
+
+    @property
+    def shape(self):
+        n_rows = self._full_shape[0] if self.rows is None else len(self.rows)
+        return n_rows, self._full_shape[1]
+
+    @property
+    def dtype(self):
+        return np.dtype(np.float64)
+
+    @property
+    def ndim(self):
+        return 2
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, rows):
+        """Select rows; returns a new handle over the same published matrix."""
+        if isinstance(rows, tuple):
+            # scikit-learn indexes arrays as X[rows, ...]
+            rows, *rest = rows
+            if any(key is not Ellipsis and key != slice(None) for key in rest):
+                raise IndexError("SharedDesign only supports selecting rows.")
+        index = np.arange(self.shape[0])[rows]
+        if index.ndim != 1:
+            raise IndexError("SharedDesign only supports selecting rows.")
+        selected = index if self.rows is None else self.rows[index]
+        view = object.__new__(SharedDesign)
+        view.__dict__.update(self.__dict__)
+        view._owner = view._closes = False
+        view.rows = selected
+        return view
+
+    def weights(self):
+        """
+        Observation weights over the full matrix that represent the selected rows.
+
+        Returns None when all rows are selected once. Rows selected several
+        times (e.g. by a bootstrap) get their multiplicity as weight.
+        """
+        if self.rows is None:
+            return None
+        return np.bincount(self.rows, minlength=self._full_shape[0]).astype(np.float64)
+
+    def expand(self, y):
+        """
+        Scatter a target aligned with the selected rows onto all rows of the matrix.
+
+        Rows that are not selected get the first target value; they carry
+        zero weight.
+        """
+        y = np.asarray(y)
+        if self.rows is None:
+            return y
+        full = np.full(self._full_shape[0], y[0], dtype=y.dtype)
+        full[self.rows] = y
+        return full
+
+    def iter_chunks(self, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Yield the selected rows as in-memory blocks of at most `chunk_rows` rows."""
+        rows = np.arange(self._full_shape[0]) if self.rows is None else self.rows
+        for start in range(0, len(rows), chunk_rows):
+            index = rows[start:start + chunk_rows]
+            if self.rows is None:
+                yield self._matrix[index[0]:index[-1] + 1]
+            else:
+                yield self._matrix[index]
+
+    def __getstate__(self):
+        return {"location": self._location, "shape": self._full_shape,
+                "sparse": self._sparse, "rows": self.rows}
+
+    def __setstate__(self, state):
+        self._location = state["location"]
+        self._full_shape = tuple(state["shape"])
+        self._sparse = state["sparse"]
+        self._owner = False
+        self._shm = None
+        self.rows = state["rows"]
+        self._attach()
+
+    def close(self):
+        """
+        Release this handle. The publishing handle also removes the shared data.
+        """
+        self._matrix = None
+        if self._shm is not None and (self._closes or self._owner):
+            try:
+                self._shm.close()
+            except BufferError:
+                # Views handed out by this process still use the mapping; it
+                # is released together with the last of them.
+                pass
+            if self._owner:
+                self._shm.unlink()
+        if self._owner and self._sparse:
+            shutil.rmtree(os.path.dirname(self._location), ignore_errors=True)
+        self._shm = None
+        self._owner = self._closes = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        kind = "sparse" if self._sparse else "dense"
+        return f"SharedDesign({kind}, shape={self.shape})"
+
+
+def share(X, temp_dir=None):
+    """
+    Validate X once and publish it for worker processes.
+
+    Parameters
+    ----------
+    X : array-like of shape (n_samples, n_features), or sparse matrix
+        The design matrix. It is validated as `LogisticRegression.fit` would
+        validate it and converted to float64.
+    temp_dir : str, optional
+        Parent directory for the memory-mapped arrays of sparse matrices.
+        Defaults to the system temporary directory.
+
+    Returns
+    -------
+    SharedDesign
+        The publishing handle. Use it as a context manager, or call `close`,
+        to free the shared data once the workers are done.
+
+    Examples
+    --------
+    >>> with share(X) as Xs:                                  # doctest: +SKIP
+    ...     GridSearchCV(LogisticRegression(), grid, n_jobs=-1).fit(Xs, y)
+    """
+    X = check_array(X, accept_sparse=["csc", "csr", "coo"], dtype=np.float64)
+    if sp.issparse(X):
+        directory = tempfile.mkdtemp(prefix="glmpynet-", dir=temp_dir)
+        location = os.path.join(directory, "X")
+        save_csc(location, X)
+        return SharedDesign(location, X.shape, sparse=True, owner=True)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(X.nbytes, 1))
+    target = np.ndarray(X.shape, dtype=np.float64, buffer=shm.buf, order="F")
+    target[...] = X
+    del target
+    return SharedDesign(shm.name, X.shape, sparse=False, shm=shm, owner=True)
@@ -0,0 +1,206 @@
+"""
+This module contains `stability_path`, which runs stability selection for
+binary logistic regression, and the `StabilityPath` it returns.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.utils import check_random_state
+from sklearn.utils._param_validation import InvalidParameterError
+from sklearn.utils.multiclass import type_of_target, unique_labels
+from sklearn.utils.validation import check_X_y
+
+from .binding import resolve_binding
+from .logistic_regression import _check_jerr, _check_n_jobs
+from .shared import share
+
+# The data a `stability_path` worker process fits its resamples on.
+_worker_state = {}
+
+
+class StabilityPath:
+    """
+    Selection frequencies of each feature along a common lambda path.
+
+    Parameters
+    ----------
+    lambdas : ndarray of shape (n_lambdas,)
+        The decreasing lambda sequence shared by all resamples.
+    frequencies : ndarray of shape (n_features, n_lambdas)
+        The fraction of resamples in which each feature had a nonzero
+        coefficient at each lambda.
+    n_resamples : int
+        The number of subsamples that were fitted.
+    """
+
+    def __init__(self, lambdas, frequencies, n_resamples):
+        self.lambdas_ = lambdas
+        self.frequencies_ = frequencies
+        self.n_resamples_ = n_resamples
+        self.n_features_in_ = frequencies.shape[0]
+
+    @property
+    def max_frequencies_(self):
+        """The highest selection frequency of each feature over the path."""
+        if self.frequencies_.shape[1] == 0:
+            return np.zeros(self.n_features_in_)
+        return self.frequencies_.max(axis=1)
+
+    def selected(self, threshold=0.6):
+        """
+        Return the indices of the stable features.
+
+        A feature is stable if it was selected in at least a fraction
+        `threshold` of the resamples at some lambda.
+        """
+        if not 0 < threshold <= 1:
+            raise InvalidParameterError(f"threshold must be in (0, 1]; got (threshold={threshold})")
+        return np.flatnonzero(self.max_frequencies_ >= threshold)
+
+
+def stability_path(X, y, n_resamples=100, sample_fraction=0.5, alpha=1.0, *,
+                   nlambda=100, lambda_min_ratio=None, standardize=True,
+                   binding="reference", n_jobs=None, random_state=None):
+    """
+    Fit the binomial elastic-net path on many subsamples and count selections.
+
+    X is validated once. Each subsample is drawn as a weight vector over the
+    rows of that one matrix (one for the drawn rows, zero elsewhere) and
+    fitted on the lambda sequence of the full data, so subsampled copies of
+    X are never built and all paths share one grid. With several jobs, X is
+    published once with `glmpynet.share` and the fits run in a process pool
+    whose workers attach to it; each task only sends the drawn rows. Only
+    the entered coefficients of each path are kept while the counts are
+    accumulated.
+
+    Parameters
+    ----------
+    X : array-like of shape (n_samples, n_features), or sparse matrix
+    y : array-like of shape (n_samples,)
+        Binary target.
+    n_resamples : int, default=100
+        The number of subsamples.
+    sample_fraction : float, default=0.5
+        The fraction of the rows drawn, without replacement, for each subsample.
+    alpha : float, default=1.0
+        The elastic net mixing parameter, with 0 < alpha <= 1.
+    nlambda : int, default=100
+        The number of lambda values in the common path.
+    lambda_min_ratio : float, optional
+        The smallest lambda as a fraction of the largest. Stability selection
+        is usually restricted to the sparse end of the path; near lambda = 0
+        every feature is selected. By default the binding's path is cut at
+        the last lambda where the mean number of features selected per
+        subsample is at most sqrt(0.8 * n_features), which bounds the
+        expected number of falsely selected features by one at a threshold
+        of 0.9 (Meinshausen and Buhlmann, 2010).
+    standardize : bool, default=True
+        Standardize the features inside the solver.
+    binding : str or GlmNetBinding, default="reference"
+        The backend. It must accept a user-supplied `lambdas` sequence and
+        provide `lambda_sequence`, like the ``"reference"`` binding, and be
+        picklable when ``n_jobs`` is set.
+    n_jobs : int, optional
+        Number of worker processes; -1 uses all CPUs and -2 all but one.
+        None fits the subsamples sequentially in this process.
+    random_state : int, RandomState instance or None, default=None
+        Controls the subsamples.
+
+    Returns
+    -------
+    StabilityPath
+    """
+    if not (isinstance(n_resamples, (int, np.integer)) and n_resamples >= 1):
+        raise InvalidParameterError(f"n_resamples must be a positive integer; got (n_resamples={n_resamples})")
+    if not 0 < sample_fraction <= 1:
+        raise InvalidParameterError(
+            f"sample_fraction must be in (0, 1]; got (sample_fraction={sample_fraction})")
+    if not 0 < alpha <= 1:
+        raise InvalidParameterError(f"alpha must be in (0, 1]; got (alpha={alpha})")
+    if not (isinstance(nlambda, (int, np.integer)) and nlambda >= 1):
+        raise InvalidParameterError(f"nlambda must be a positive integer; got (nlambda={nlambda})")
+    n_workers = _check_n_jobs(n_jobs)
+
+    X, y = check_X_y(X, y, accept_sparse="csc", dtype=np.float64, order="F")
+    y_type = type_of_target(y)
+    if y_type != "binary":
+        raise ValueError(
+            "Only binary classification is supported. The type of the target "
+            f"is {y_type}."
+        )
+    classes = unique_labels(y)
+    n_samples, n_features = X.shape
+    n_drawn = int(round(sample_fraction * n_samples))
+    positive = y == classes[-1]
+
+    rng = check_random_state(random_state)
+    draws = [rng.choice(n_samples, n_drawn, replace=False) for _ in range(n_resamples)]
+    for rows in draws:
+        if positive[rows].all() or not positive[rows].any():
+            raise ValueError(
+                "A subsample contains only one class; increase sample_fraction."
+            )
+
+    binding_ = resolve_binding(binding)
+    standardize = bool(standardize)
+    lambdas = binding_.lambda_sequence(X, y, alpha=alpha, nlambda=nlambda,
+                                       standardize=standardize,
+                                       lambda_min_ratio=lambda_min_ratio)
+
+    params = dict(alpha=alpha, nlambda=nlambda, standardize=standardize)
+    counts = np.zeros((n_features, len(lambdas)))
+    if n_workers == 1:
+        state = dict(X=X, y=y, binding=binding_, lambdas=lambdas, params=params)
+        _accumulate(counts, (_fit_resample(state, rows) for rows in draws))
+    else:
+        with share(X) as shared, ProcessPoolExecutor(
+                max_workers=min(n_workers, n_resamples), initializer=_start_worker,
+                initargs=(shared, y, binding_, lambdas, params)) as pool:
+            _accumulate(counts, pool.map(_fit_in_worker, draws))
+
+    if lambda_min_ratio is None:
+        keep = _sparse_end(counts / n_resamples, n_features)
+        lambdas, counts = lambdas[:keep], counts[:, :keep]
+    return StabilityPath(lambdas, counts / n_resamples, n_resamples)
+
+
+def _sparse_end(frequencies, n_features):
+    """
+    The number of leading lambdas whose mean model size is small enough.
+
+    The mean number of features selected per subsample, q, bounds the
+    expected number of false selections at threshold t by
+    q**2 / ((2*t - 1) * n_features); q <= sqrt(0.8 * n_features) keeps it
+    at one for t = 0.9. The largest lambda is always kept.
+    """
+    too_large = np.flatnonzero(frequencies.sum(axis=0) > np.sqrt(0.8 * n_features))
+    return max(int(too_large[0]), 1) if len(too_large) else frequencies.shape[1]
+
+
+def _start_worker(shared, y, binding, lambdas, params):
+    """Attach a pool worker to the shared design and keep what every fit needs."""
+    _worker_state.update(shared=shared, X=shared.matrix, y=y, binding=binding,
+                         lambdas=lambdas, params=params)
+
+
+def _fit_in_worker(rows):
+    return _fit_resample(_worker_state, rows)
+
+
+def _fit_resample(state, rows):
+    """Fit the common lambda path with weight one on `rows` and zero elsewhere."""
+    weights = np.zeros(state["X"].shape[0])
+    weights[rows] = 1.0
+    return state["binding"].fit(x=state["X"], y=state["y"], weights=weights,
+                                lambdas=state["lambdas"], **state["params"])
+
+
+def _accumulate(counts, fitted):
+    """Add the nonzero pattern of each compressed path to the selection counts."""
+    for results in fitted:
+        _check_jerr(results.get('jerr', 0))
+        lmu = int(results['lmu'])
+        nx = len(results['ia'])
+        ca = np.asarray(results['ca'])[:nx, :lmu]
+        counts[np.asarray(results['ia']), :lmu] += ca != 0
@@ -0,0 +1,184 @@
+"""
+This module contains helpers for fitting on design matrices that live on disk.
+
+Dense matrices are stored as ordinary `.npy` files (preferably in Fortran
+order, which is the column-major layout the glmnet engine works in) and
+opened with `open_npy`. Sparse matrices are stored as a directory holding
+the CSC `data`, `indices` and `indptr` arrays as separate `.npy` files plus a
+small JSON metadata file, written with `save_csc` and opened with `open_csc`.
+
+In both cases the arrays are memory-mapped read-only. `check_on_disk_X_y`
+validates such matrices in bounded-size chunks and hands them back
+unchanged, so the estimator never materializes an in-memory copy.
+"""
+
+import json
+import mmap
+import os
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.utils.validation import check_consistent_length, column_or_1d
+
+_CSC_META = "meta.json"
+_CSC_ARRAYS = ("data", "indices", "indptr")
+
+#: Default number of bytes of X examined per validation chunk.
+DEFAULT_CHUNK_BYTES = 64 * 2**20
+
+
+def open_npy(path):
+    """
+    Memory-map a 2-D `.npy` file read-only.
+
+    Parameters
+    ----------
+    path : str or path-like
+        A `.npy` file holding a 2-D array.
+
+    Returns
+    -------
+    numpy.memmap of shape (n_samples, n_features)
+    """
+    X = np.load(path, mmap_mode="r")
+    if X.ndim != 2:
+        raise ValueError(f"Expected a 2-D array in {path}, got an array of shape {X.shape}.")
+    return X
+
+
+def save_fortran_npy(path, X):
+    """
+    Write a dense 2-D array to `path` as a Fortran-order `.npy` file.
+
+    The output is written through a memory map column block by column block,
+    so `X` itself may be a memory map larger than RAM.
+    """
+    n_samples, n_features = X.shape
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64,
+                                    shape=(n_samples, n_features), fortran_order=True)
+    step = max(1, DEFAULT_CHUNK_BYTES // (8 * max(n_samples, 1)))
+    for start in range(0, n_features, step):
+        out[:, start:start + step] = X[:, start:start + step]
+    out.flush()
+    del out
+
+
+def save_csc(directory, X):
+    """
+    Write a sparse matrix to `directory` as memory-mappable CSC arrays.
+
+    Parameters
+    ----------
+    directory : str or path-like
+        Created if it does not exist.
+    X : sparse matrix of shape (n_samples, n_features)
+    """
+    X = sp.csc_matrix(X)
+    X.sum_duplicates()
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, "data.npy"), X.data.astype(np.float64, copy=False))
+    np.save(os.path.join(directory, "indices.npy"), X.indices)
+    np.save(os.path.join(directory, "indptr.npy"), X.indptr)
+    with open(os.path.join(directory, _CSC_META), "w") as f:
+        json.dump({"format": "csc", "shape": list(X.shape)}, f)
+
+
+def open_csc(directory):
+    """
+    Open a sparse matrix written by `save_csc` without reading it into memory.
+
+    Returns
+    -------
+    scipy.sparse.csc_matrix
+        A CSC matrix whose `data`, `indices` and `indptr` are read-only memory maps.
+    """
+    with open(os.path.join(directory, _CSC_META)) as f:
+        meta = json.load(f)
+    if meta.get("format") != "csc":
+        raise ValueError(f"{directory} does not contain a CSC matrix.")
+    data, indices, indptr = (
+        np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in _CSC_ARRAYS
+    )
+    return sp.csc_matrix((data, indices, indptr), shape=tuple(meta["shape"]), copy=False)
+
+
+def _is_memory_mapped(array):
+    """Return True if `array` is, or is a view of, a memory map."""
+    while array is not None:
+        if isinstance(array, (np.memmap, mmap.mmap)):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+def is_on_disk(X):
+    """
+    Return True if X is a memory-mapped dense array or a CSC/CSR matrix
+    whose data array is memory-mapped.
+    """
+    if sp.issparse(X):
+        return X.format in ("csc", "csr") and _is_memory_mapped(X.data)
+    return isinstance(X, np.ndarray) and _is_memory_mapped(X)
+
+
+def _iter_chunks(X, chunk_bytes):
+    """Yield the stored values of X in blocks of roughly `chunk_bytes` bytes."""
+    if sp.issparse(X):
+        step = max(1, chunk_bytes // X.data.itemsize)
+        for start in range(0, X.data.shape[0], step):
+            yield X.data[start:start + step]
+        return
+    n_samples, n_features = X.shape
+    if X.flags.f_contiguous:
+        step = max(1, chunk_bytes // (X.itemsize * max(n_samples, 1)))
+        for start in range(0, n_features, step):
+            yield X[:, start:start + step]
+    else:
+        step = max(1, chunk_bytes // (X.itemsize * max(n_features, 1)))
+        for start in range(0, n_samples, step):
+            yield X[start:start + step]
+
+
+def check_on_disk_X_y(X, y, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Validate a memory-mapped design matrix and target without copying X.
+
+    This mirrors the checks `check_X_y` performs for numeric input, but scans
+    X in chunks of at most `chunk_bytes` bytes and returns it unchanged.
+    Only float64 data is accepted, since any other dtype would require a
+    converted copy.
+
+    Returns
+    -------
+    X : numpy.memmap or sparse matrix
+        The input, unchanged.
+    y : ndarray of shape (n_samples,)
+    """
+    if X.ndim != 2:
+        raise ValueError(f"Expected 2D array, got array of shape {X.shape} instead.")
+    dtype = X.dtype
+    if dtype != np.float64:
+        raise ValueError(
+            f"On-disk design matrices must be float64 to be used without copying; got {dtype}."
+        )
+    n_samples, n_features = X.shape
+    if n_samples < 1:
+        raise ValueError(
+            f"Found array with {n_samples} sample(s) (shape={X.shape}) while a "
+            "minimum of 1 is required."
+        )
+    if n_features < 1:
+        raise ValueError(
+            f"Found array with {n_features} feature(s) (shape={X.shape}) while a "
+            "minimum of 1 is required."
+        )
+    if sp.issparse(X):
+        X.check_format(full_check=False)
+
+    for chunk in _iter_chunks(X, chunk_bytes):
+        if not np.isfinite(chunk).all():
+            raise ValueError("Input X contains NaN or infinity.")
+
+    y = column_or_1d(y, warn=True)
+    check_consistent_length(X, y)
+    return X, y
@@ -0,0 +1,73 @@
+"""
+Build script for the compiled glmnetpp extension, ``glmpynet._glmnet``.
+
+The project metadata lives in pyproject.toml; this script only declares the
+extension. It is compiled from ``glmpynet/glmnet_binding.cpp`` against the
+header-only glmnetpp sources shipped with the R package in ``glmnet/`` and
+against Eigen, which is looked up in ``EIGEN_INCLUDE_DIR``, the active
+environment and the usual system locations.
+
+The extension is optional: without Eigen, or if compiling fails, glmpynet
+is installed without it and the estimators use the pure-NumPy reference
+solver. Set ``GLMPYNET_REQUIRE_EXTENSION=1`` to make either an error.
+"""
+
+import os
+import sys
+
+from pybind11.setup_helpers import Pybind11Extension, build_ext
+from setuptools import setup
+
+GLMNETPP_INCLUDE = os.path.join("glmnet", "glmnet_4_1_9", "src", "glmnetpp", "include")
+REQUIRE_EXTENSION = os.environ.get("GLMPYNET_REQUIRE_EXTENSION", "") not in ("", "0")
+
+
+def eigen_include_dir():
+    """Return the first directory that contains Eigen's headers, or None."""
+    candidates = [
+        os.environ.get("EIGEN_INCLUDE_DIR"),
+        os.path.join(sys.prefix, "include", "eigen3"),
+        os.path.join(sys.prefix, "Library", "include", "eigen3"),  # conda on Windows
+        "/usr/include/eigen3",
+        "/usr/local/include/eigen3",
+        "/opt/homebrew/include/eigen3",
+    ]
+    for candidate in candidates:
+        if candidate and os.path.isdir(os.path.join(candidate, "Eigen")):
+            return candidate
+    return None
+
+
+class OptionalBuildExt(build_ext):
+    """Build the extension if possible; glmpynet works without it."""
+
+    def run(self):
+        try:
+            super().run()
+        except Exception as exc:
+            if REQUIRE_EXTENSION:
+                raise
+            print(f"WARNING: not building glmpynet._glmnet ({exc}); "
+                  "the 'reference' binding will be used.", file=sys.stderr)
+
+
+def extensions():
+    eigen = eigen_include_dir()
+    if eigen is None:
+        if REQUIRE_EXTENSION:
+            raise RuntimeError("Eigen was not found; set EIGEN_INCLUDE_DIR.")
+        print("WARNING: Eigen was not found (set EIGEN_INCLUDE_DIR); not building "
+              "glmpynet._glmnet.", file=sys.stderr)
+        return []
+    return [
+        Pybind11Extension(
+            "glmpynet._glmnet",
+            ["glmpynet/glmnet_binding.cpp"],
+            include_dirs=[GLMNETPP_INCLUDE, eigen],
+            define_macros=[("EIGEN_PERMANENTLY_DISABLE_STUPID_WARNINGS", None)],
+            cxx_std=17,
+        )
+    ]
+
+
+setup(ext_modules=extensions(), cmdclass={"build_ext": OptionalBuildExt})
@@ -73,6 +73,25 @@ class TestLogisticRegressionE2E(unittest.TestCase):
         # Example: self.assertTrue(len(self.mock_binding._fit_calls) > 0)
         # However, for a high-level E2E test, focusing on public API behavior is usually sufficient.
 
+    def test_internal_standardization_replaces_scaler(self):
+        """Test that standardize=True on raw X matches a StandardScaler pipeline."""
+        pipeline = Pipeline([
+            ("scaler", StandardScaler()),
+            ("logistic_net", LogisticRegression(penalty="l1", binding=self.mock_binding))
+        ])
+        pipeline.fit(self.X_train, self.y_train)
+
+        # No scaled copy of X: the solver standardizes internally
+        model = LogisticRegression(penalty="l1", standardize=True, binding=self.mock_binding)
+        model.fit(self.X_train, self.y_train)
+
+        np.testing.assert_allclose(model.predict_proba(self.X_test),
+                                   pipeline.predict_proba(self.X_test), atol=1e-6)
+        scaler = pipeline.named_steps["scaler"]
+        np.testing.assert_allclose(model.coef_ * scaler.scale_,
+                                   pipeline.named_steps["logistic_net"].coef_, atol=1e-6)
+        self.assertGreater(accuracy_score(self.y_test, model.predict(self.X_test)), 0.7)
+
     def test_performance_metrics_l1(self):
         """Test performance metrics for LogisticRegression with L1 penalty."""
         # Instantiate with L1 penalty and the mock binding
@@ -0,0 +1,117 @@
+import unittest
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+from sklearn.datasets import make_classification
+from sklearn.exceptions import ConvergenceWarning
+
+from glmpynet.batch import ModelCollection, fit_many
+from glmpynet.binding.reference import ReferenceGlmNetBinding
+from glmpynet.logistic_regression import LogisticRegression
+
+
+class FailingBinding(ReferenceGlmNetBinding):
+    """A binding whose results carry a fixed glmnet error flag on group 'c'."""
+
+    def __init__(self, jerr, empty=False):
+        self.jerr = jerr
+        self.empty = empty
+
+    def fit(self, x, y, alpha, nlambda, **kwargs):
+        results = super().fit(x, y, alpha, nlambda, **kwargs)
+        if x.shape[0] == 60 and x[0, 0] == FailingBinding.first_row_c:
+            results['jerr'] = self.jerr
+            if self.empty:
+                results['lmu'] = 0
+        return results
+
+
+class TestFitMany(unittest.TestCase):
+    """
+    A test suite for fitting many small models with fit_many.
+    """
+
+    def setUp(self):
+        """Build a dataset with four interleaved groups."""
+        self.X, self.y = make_classification(
+            n_samples=240, n_features=6, n_informative=4, n_classes=2, random_state=42
+        )
+        self.groups = np.tile(np.array(["a", "b", "c", "d"]), 60)
+
+    def test_matches_individual_fits(self):
+        """Tests that each group's model equals a model fitted on that group alone."""
+        models = fit_many(self.groups, self.X, self.y, alpha=1.0, nlambda=20)
+        self.assertIsInstance(models, ModelCollection)
+        self.assertEqual(len(models), 4)
+        for g, group in enumerate(models.groups_):
+            mask = self.groups == group
+            single = LogisticRegression(alpha=1.0, nlambda=20).fit(self.X[mask], self.y[mask])
+            np.testing.assert_allclose(models.coef_[g], single.coef_[0], rtol=1e-6, atol=1e-8)
+            np.testing.assert_allclose(models.intercept_[g], single.intercept_[0], rtol=1e-6, atol=1e-8)
+
+    def test_parallel_matches_sequential(self):
+        """Tests that the worker processes produce the same models."""
+        sequential = fit_many(self.groups, self.X, self.y, nlambda=10)
+        for n_jobs in (2, -2):
+            parallel = fit_many(self.groups, self.X, self.y, nlambda=10, n_jobs=n_jobs)
+            np.testing.assert_array_equal(sequential.coef_, parallel.coef_)
+        parallel = fit_many(self.groups, csr_matrix(self.X), self.y, nlambda=10, n_jobs=2)
+        np.testing.assert_allclose(parallel.coef_, sequential.coef_, atol=1e-8)
+
+    def test_vectorized_predict_proba(self):
+        """Tests per-row scoring by group against the per-group scorers."""
+        models = fit_many(self.groups, self.X, self.y, nlambda=10)
+        proba = models.predict_proba(self.X, self.groups)
+        self.assertEqual(proba.shape, (self.X.shape[0], 2))
+        for i in range(0, self.X.shape[0], 17):
+            expected = models.make_scorer(self.groups[i]).score_one(self.X[i])
+            self.assertAlmostEqual(proba[i, 1], expected)
+        np.testing.assert_array_equal(
+            models.predict(self.X, self.groups), models.classes_[(proba[:, 1] > 0.5).astype(int)]
+        )
+
+    def test_sparse_predict(self):
+        """Tests that sparse rows score like dense rows."""
+        models = fit_many(self.groups, self.X, self.y, nlambda=10)
+        np.testing.assert_allclose(
+            models.decision_function(csr_matrix(self.X), self.groups),
+            models.decision_function(self.X, self.groups),
+        )
+
+    def test_unknown_group(self):
+        """Tests that scoring an unfitted group raises a KeyError."""
+        models = fit_many(self.groups, self.X, self.y, nlambda=10)
+        with pytest.raises(KeyError, match="No model was fitted"):
+            models.predict_proba(self.X[:2], ["a", "z"])
+
+    def test_single_class_group(self):
+        """Tests that a group without both classes is reported."""
+        groups = self.groups.copy()
+        groups[np.flatnonzero(self.y == 1)[0]] = "lonely"
+        with pytest.raises(ValueError, match="contain only one class"):
+            fit_many(groups, self.X, self.y, nlambda=10)
+
+    def test_group_errors_are_checked(self):
+        """Tests that glmnet errors and empty paths of a group are not accepted silently."""
+        FailingBinding.first_row_c = self.X[self.groups == "c"][0, 0]
+        for n_jobs in (None, 2):
+            with pytest.raises(RuntimeError,
+                               match="group 'c' failed: glmnet failed with error code 7777"):
+                fit_many(self.groups, self.X, self.y, nlambda=10, binding=FailingBinding(7777),
+                         n_jobs=n_jobs)
+        with pytest.raises(RuntimeError, match="group 'c' failed: glmnet did not fit any lambda"):
+            fit_many(self.groups, self.X, self.y, nlambda=10, binding=FailingBinding(0, empty=True))
+        with pytest.warns(ConvergenceWarning, match="stopped the path early"):
+            fit_many(self.groups, self.X, self.y, nlambda=10, binding=FailingBinding(-3))
+
+    def test_invalid_parameters(self):
+        """Tests that parameters are validated like the estimator's."""
+        with self.assertRaises(ValueError):
+            fit_many(self.groups, self.X, self.y, C=-1.0)
+        with pytest.raises(ValueError, match="n_jobs"):
+            fit_many(self.groups, self.X, self.y, n_jobs=0)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,134 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pytest
+
+HARNESS_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "glmnet", "glmnet_4_1_9", "src",
+    "glmnetpp", "benchmark", "analyze", "harness.py"
+)
+_spec = importlib.util.spec_from_file_location("harness", HARNESS_PATH)
+harness = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(harness)
+
+CSV_HEADER = ("name,iterations,real_time,cpu_time,time_unit,bytes_per_second,"
+              "items_per_second,label,error_occurred,error_message,n,p\n")
+
+
+def benchmark_csv(times, error_rows=()):
+    """Google Benchmark csv output with one row per repetition and its aggregates."""
+    lines = ["Running ./binomial_benchmark\n", CSV_HEADER]
+    for engine, values in times.items():
+        for i, t in enumerate(values):
+            failed = "true" if i in error_rows else ""
+            message = '"solver failed"' if failed else ""
+            real = "" if failed else t
+            lines.append(f'"fit/{engine}/100/10",10,{real},{real},ms,,,,{failed},{message},100,10\n')
+        lines.append(f'"fit/{engine}/100/10_mean",10,{np.mean(values)},{np.mean(values)},ms,,,,,,100,10\n')
+    return "".join(lines)
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    """
+    A test suite for parsing, recording and comparing benchmark runs.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store_path = os.path.join(self.tmpdir.name, "store", "results.csv")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def record(self, commit, times, machine="m"):
+        df = harness.parse(benchmark_csv(times), "binomial_benchmark")
+        ctx = {"commit": commit, "dirty": commit.endswith("-dirty"),
+               "machine": machine, "timestamp": "2026-01-01T00:00:00+00:00"}
+        return harness.append(df, ctx, self.store_path)
+
+    def test_parse(self):
+        """Tests that aggregates are dropped and times are converted to seconds."""
+        df = harness.parse(benchmark_csv({"glmnetpp": [1.0, 2.0], "legacy": [3.0, 4.0]}),
+                           "binomial_benchmark")
+        self.assertEqual(len(df), 4)
+        self.assertEqual(set(df["engine"]), {"glmnetpp", "legacy"})
+        self.assertEqual(set(df["config"]), {"fit/100/10"})
+        np.testing.assert_allclose(df["real_time"], [1e-3, 2e-3, 3e-3, 4e-3])
+        np.testing.assert_array_equal(df["repetition"], [0, 1, 0, 1])
+        self.assertEqual(df["counters"][0], '{"n": 100.0, "p": 10.0}')
+
+    def test_parse_drops_failed_repetitions(self):
+        """Tests that repetitions flagged with error_occurred are not kept."""
+        text = benchmark_csv({"glmnetpp": [1.0, 2.0, 3.0]}, error_rows=(1,))
+        df = harness.parse(text, "binomial_benchmark")
+        np.testing.assert_allclose(df["real_time"], [1e-3, 3e-3])
+        self.assertFalse(df["real_time"].isna().any())
+
+        # The flag is read as bool when every repetition failed.
+        df = harness.parse(benchmark_csv({"glmnetpp": [1.0]}, error_rows=(0,)),
+                           "binomial_benchmark")
+        self.assertTrue(df.empty)
+
+    def test_record_appends_to_store(self):
+        """Tests that appended runs are tagged with their context and reloaded."""
+        self.assertTrue(harness.load(self.store_path).empty)
+        self.record("a" * 40, {"glmnetpp": [1.0, 1.1]})
+        self.record("b" * 40, {"glmnetpp": [1.0, 1.1]})
+        store = harness.load(self.store_path)
+        self.assertEqual(len(store), 4)
+        self.assertEqual(list(store["commit"].unique()), ["a" * 40, "b" * 40])
+        self.assertEqual(set(store["machine"]), {"m"})
+
+    def test_compare_flags_regressions(self):
+        """Tests the Welch test and tolerance on a slowed-down candidate."""
+        rng = np.random.RandomState(0)
+        base = 1.0 + 0.01 * rng.randn(8)
+        self.record("a" * 40, {"glmnetpp": base, "legacy": base})
+        self.record("b" * 40, {"glmnetpp": 1.5 * base, "legacy": base[::-1]})
+        result = harness.compare(harness.load(self.store_path), "aaaa", "bbbb", machine="m")
+        flags = dict(zip(result["engine"], result["regression"]))
+        self.assertEqual(flags, {"glmnetpp": True, "legacy": False})
+
+        with pytest.raises(ValueError, match="No stored results"):
+            harness.compare(harness.load(self.store_path), "aaaa", "bbbb", machine="other")
+
+    def test_dirty_runs_are_kept_apart(self):
+        """Tests that dirty-tree runs do not join the samples of the clean commit."""
+        self.record("a" * 40, {"glmnetpp": [1.0, 1.01, 0.99]})
+        self.record("a" * 40 + "-dirty", {"glmnetpp": [2.0, 2.01, 1.99]})
+        self.record("b" * 40, {"glmnetpp": [1.0, 1.01, 0.99]})
+        store = harness.load(self.store_path)
+
+        clean = harness.compare(store, "aaaa", "bbbb", machine="m")
+        self.assertAlmostEqual(clean["baseline"][0], 1.0e-3)
+        dirty = harness.compare(store, "bbbb", "aaaa-dirty", machine="m")
+        self.assertTrue(dirty["regression"][0])
+
+    def test_context_marks_dirty_trees(self):
+        """Tests that a working tree with uncommitted changes gets its own key."""
+        repo = self.tmpdir.name
+        try:
+            for args in (["init", "-q"], ["config", "user.email", "a@b"],
+                         ["config", "user.name", "a"]):
+                harness.subprocess.check_call(["git", *args], cwd=repo)
+            with open(os.path.join(repo, "engine.cpp"), "w") as f:
+                f.write("int x;\n")
+            harness.subprocess.check_call(["git", "add", "engine.cpp"], cwd=repo)
+            harness.subprocess.check_call(["git", "commit", "-qm", "init"], cwd=repo)
+        except (OSError, harness.subprocess.CalledProcessError):
+            self.skipTest("git is not available")
+
+        clean = harness.context(repo)
+        self.assertFalse(clean["dirty"])
+        with open(os.path.join(repo, "engine.cpp"), "a") as f:
+            f.write("int y;\n")
+        dirty = harness.context(repo)
+        self.assertTrue(dirty["dirty"])
+        self.assertEqual(dirty["commit"], clean["commit"] + harness.DIRTY_SUFFIX)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+import subprocess
+import sys
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+import pytest
+from scipy.sparse import csc_matrix
+from sklearn.datasets import make_classification
+
+from glmpynet import binding as registry
+from glmpynet import share
+from glmpynet.binding import native
+from glmpynet.binding.base import GlmNetBinding
+from glmpynet.binding.mock import MockGlmNetBinding
+from glmpynet.binding.reference import ReferenceGlmNetBinding
+from glmpynet.logistic_regression import LogisticRegression
+
+
+def _modules_after(statement):
+    """Run `statement` in a fresh interpreter and return the loaded module names."""
+    code = f"import sys\n{statement}\nprint('\\n'.join(sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], check=True,
+                         capture_output=True, text=True).stdout
+    return set(out.split())
+
+
+class RecordingBinding(MockGlmNetBinding):
+    """A binding that records how often it was used."""
+
+    calls = 0
+
+    def fit(self, x, y, alpha, nlambda, **kwargs):
+        RecordingBinding.calls += 1
+        return super().fit(x, y, alpha, nlambda, **kwargs)
+
+
+class TestBindingRegistry(unittest.TestCase):
+    """
+    A test suite for looking up bindings by name.
+    """
+
+    def setUp(self):
+        self.X, self.y = make_classification(n_samples=60, n_features=5, random_state=0)
+
+    def tearDown(self):
+        registry._registry.pop("recording", None)
+
+    def test_builtin_names(self):
+        """Tests that the built-in bindings are listed."""
+        self.assertIn("native", registry.available_bindings())
+        self.assertIn("reference", registry.available_bindings())
+        self.assertIn("mock", registry.available_bindings())
+
+    def test_default_binding(self):
+        """Tests that the default falls back to the reference solver without the extension."""
+        try:
+            import glmpynet._glmnet  # noqa: F401
+        except ImportError:
+            self.assertIsInstance(registry.resolve_binding(None), ReferenceGlmNetBinding)
+        else:  # pragma: no cover - only with a compiled build
+            self.assertEqual(type(registry.resolve_binding(None)).__name__, "NativeGlmNetBinding")
+
+    def test_get_mock_binding(self):
+        """Tests that a binding is instantiated by name."""
+        self.assertIsInstance(registry.get_binding("mock"), MockGlmNetBinding)
+
+    def test_unknown_binding(self):
+        """Tests that unknown names raise a helpful error."""
+        with pytest.raises(ValueError, match="Unknown binding 'nope'"):
+            registry.get_binding("nope")
+        with pytest.raises(ValueError, match="Unknown binding"):
+            LogisticRegression(binding="nope").fit(self.X, self.y)
+
+    def test_native_requires_extension(self):
+        """Tests that 'native' fails clearly when the extension is not built."""
+        try:
+            import glmpynet._glmnet  # noqa: F401
+        except ImportError:
+            with pytest.raises(ImportError, match="compiled extension"):
+                registry.get_binding("native")
+        else:  # pragma: no cover - only with a compiled build
+            self.assertIsInstance(registry.get_binding("native"), GlmNetBinding)
+
+    def test_outdated_extension_is_not_used(self):
+        """Tests that an extension without the path entry points falls back to 'reference'."""
+        outdated = types.SimpleNamespace(lognet=lambda *args: None)
+        with mock.patch.object(native.importlib.util, "find_spec", return_value=object()), \
+                mock.patch.object(native.NativeGlmNetBinding, "_extension", return_value=outdated):
+            with pytest.raises(ImportError, match="out of date"):
+                registry.get_binding("native")
+            self.assertIsInstance(registry.resolve_binding(None), ReferenceGlmNetBinding)
+
+    def test_native_leaves_mapped_input_to_reference(self):
+        """Tests that the default binding fits shared and memory-mapped X with 'reference'."""
+        received = []
+
+        def fit_logistic_regression(x, y, w, alpha, nlambda, **kwargs):
+            received.append(x)
+            return ReferenceGlmNetBinding().fit(x, y, alpha, nlambda, weights=w)
+
+        extension = types.SimpleNamespace(fit_logistic_regression=fit_logistic_regression,
+                                          fit_logistic_regression_sparse=None)
+        with mock.patch.object(native.importlib.util, "find_spec", return_value=object()), \
+                mock.patch.object(native.NativeGlmNetBinding, "_extension", return_value=extension):
+            model = LogisticRegression().fit(self.X, self.y)
+            self.assertIsInstance(model.binding_, native.NativeGlmNetBinding)
+            self.assertTrue(np.shares_memory(received[0], self.X))
+            with share(self.X) as shared:
+                model = LogisticRegression().fit(shared, self.y)
+                with pytest.raises(NotImplementedError, match="memory-mapped or shared"):
+                    LogisticRegression(binding="native").fit(shared, self.y)
+            self.assertIsInstance(model.binding_, ReferenceGlmNetBinding)
+        self.assertEqual(len(received), 1)
+
+    def test_native_grows_default_pmax(self):
+        """Tests that the native binding starts with few coefficient rows and refits with more."""
+        calls = []
+
+        def fit_logistic_regression(x, y, w, alpha, nlambda, ne, nx, lambda_min_ratio, standardize):
+            calls.append(nx)
+            return ReferenceGlmNetBinding().fit(x, y, alpha, nlambda, dfmax=ne, pmax=nx, weights=w,
+                                                lambda_min_ratio=lambda_min_ratio)
+
+        extension = types.SimpleNamespace(fit_logistic_regression=fit_logistic_regression,
+                                          fit_logistic_regression_sparse=None)
+        X, y = make_classification(n_samples=150, n_features=200, n_informative=50,
+                                   random_state=0)
+        with mock.patch.object(native.importlib.util, "find_spec", return_value=object()), \
+                mock.patch.object(native.NativeGlmNetBinding, "_extension", return_value=extension):
+            binding = registry.get_binding("native")
+            grown = binding.fit(X, y, alpha=1.0, nlambda=50)
+            self.assertEqual(calls[0], native.INITIAL_NX)
+            self.assertGreater(len(calls), 1)
+            self.assertGreater(grown["jerr"], -10000)
+            self.assertGreater(len(grown["ia"]), native.INITIAL_NX)
+            limited = binding.fit(X, y, alpha=1.0, nlambda=50, pmax=10)
+            self.assertEqual(calls[-1], 10)
+            self.assertLessEqual(limited["jerr"], -10000)
+
+    def test_native_matches_reference(self):
+        """Tests the compiled path solver against the reference solver."""
+        try:
+            binding = registry.get_binding("native")
+        except ImportError:
+            self.skipTest("the compiled extension is not built")
+        X, y = make_classification(n_samples=200, n_features=10, random_state=0)
+        X[:, 0] *= 10
+        w = np.random.RandomState(0).rand(200)
+        reference = ReferenceGlmNetBinding().fit(X, y, 0.5, 20, weights=w, thresh=1e-14)
+        for x in (X, csc_matrix(X)):
+            results = binding.fit(x, y, 0.5, 20, weights=w)
+            self.assertEqual(results["jerr"], 0)
+            n = min(results["lmu"], reference["lmu"])
+            np.testing.assert_allclose(results["alm"][:n], reference["alm"][:n])
+            np.testing.assert_allclose(results["a0"][:n], reference["a0"][:n], atol=1e-3)
+
+    def test_register_by_path(self):
+        """Tests that registered dotted paths are used by the estimator."""
+        registry.register_binding("recording", f"{__name__}:RecordingBinding")
+        before = RecordingBinding.calls
+        model = LogisticRegression(binding="recording").fit(self.X, self.y)
+        self.assertEqual(RecordingBinding.calls, before + 1)
+        self.assertIsInstance(model.binding_, RecordingBinding)
+
+    def test_resolve_instance(self):
+        """Tests that binding instances are used as they are."""
+        instance = MockGlmNetBinding()
+        self.assertIs(registry.resolve_binding(instance), instance)
+
+
+class TestImportBudget(unittest.TestCase):
+    """
+    Keeps the cost of importing glmpynet in check for forked serving workers.
+    """
+
+    def test_import_package_is_lightweight(self):
+        """Tests that `import glmpynet` does not import scikit-learn at all."""
+        modules = _modules_after("import glmpynet")
+        self.assertNotIn("sklearn", modules)
+        self.assertNotIn("glmpynet.logistic_regression", modules)
+
+    def test_import_estimator_skips_solvers_and_backends(self):
+        """Tests that the estimator module loads no solver stack or backend."""
+        modules = _modules_after("from glmpynet import LogisticRegression")
+        self.assertIn("glmpynet.logistic_regression", modules)
+        self.assertFalse(any(m.startswith("sklearn.linear_model") for m in modules))
+        self.assertNotIn("glmpynet.binding.mock", modules)
+        self.assertNotIn("glmpynet.binding.reference", modules)
+        self.assertNotIn("glmpynet.binding.native", modules)
+        self.assertNotIn("glmpynet._glmnet", modules)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
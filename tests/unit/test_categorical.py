@@ -0,0 +1,165 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+
+from glmpynet.binding._design import make_design
+from glmpynet.binding.base import GlmNetBinding
+from glmpynet.binding.reference import ReferenceGlmNetBinding
+from glmpynet.logistic_regression import LogisticRegression
+
+
+class WithoutCategoricals(GlmNetBinding):
+    """A binding that cannot fit categorical columns, like the native one."""
+
+    def fit(self, x, y, alpha, nlambda, categorical=None, **kwargs):
+        raise NotImplementedError("categorical columns are not supported")
+
+
+def _make_data(n=1500, seed=0):
+    """Numeric columns 0, 1, 3, 4 and integer-coded categoricals in columns 2 and 5."""
+    rng = np.random.default_rng(seed)
+    numeric = rng.normal(size=(n, 4))
+    color = rng.integers(0, 6, n)
+    size = rng.integers(0, 4, n)
+    eta = (numeric[:, 0] - numeric[:, 1] + np.array([0, 1, -1, 2, 0, 0])[color]
+           + np.array([0, 0, 1.5, 0])[size])
+    y = (rng.uniform(size=n) < 1 / (1 + np.exp(-eta))).astype(int)
+    X = np.column_stack((numeric[:, :2], color, numeric[:, 2:], size)).astype(float)
+    return X, y, color, size
+
+
+class TestCategoricalFeatures(unittest.TestCase):
+    """
+    A test suite for integer-coded categorical columns.
+    """
+
+    def setUp(self):
+        self.X, self.y, self.color, self.size = _make_data()
+        self.categorical = [2, 5]
+
+    def _one_hot(self):
+        numeric = self.X.copy()
+        numeric[:, self.categorical] = 0.0
+        return np.column_stack((numeric, np.eye(6)[self.color], np.eye(4)[self.size]))
+
+    def test_binding_matches_one_hot(self):
+        """Tests that codes give the same path as an explicit one-hot matrix."""
+        binding = ReferenceGlmNetBinding()
+        coded = binding.fit(self.X, self.y, alpha=1.0, nlambda=40, categorical=self.categorical)
+        encoded = binding.fit(self._one_hot(), self.y, alpha=1.0, nlambda=40)
+        np.testing.assert_array_equal(coded['ia'], encoded['ia'])
+        np.testing.assert_allclose(coded['ca'], encoded['ca'], atol=1e-10)
+        np.testing.assert_allclose(coded['a0'], encoded['a0'], atol=1e-10)
+
+    def test_design_products_on_column_subsets(self):
+        """Tests the implicit products on some levels against the one-hot matrix."""
+        design = make_design(self.X, self.categorical)
+        encoded = self._one_hot()
+        v = np.random.default_rng(1).uniform(size=len(self.y))
+        for cols in (np.array([0, 3, 7, 9, 13, 15]), np.array([2, 8, 11, 12]), np.array([1, 4])):
+            center = encoded[:, cols].mean(axis=0)
+            sub = encoded[:, cols] - center
+            xx, xv = design.gram(cols, v, center)
+            np.testing.assert_allclose(xx, (sub * v[:, None]).T @ sub, atol=1e-9)
+            np.testing.assert_allclose(xv, v @ sub, atol=1e-9)
+            np.testing.assert_allclose(design.rmatvec(v, cols, center), sub.T @ v, atol=1e-9)
+            beta = np.arange(1.0, len(cols) + 1)
+            np.testing.assert_allclose(design.matvec(cols, beta, center), sub @ beta, atol=1e-9)
+        np.testing.assert_allclose(design.rmatvec(v), encoded.T @ v, atol=1e-9)
+
+    def test_estimator_coefficients(self):
+        """Tests the shapes of `coef_` and `category_coef_` and the predictions."""
+        model = LogisticRegression(alpha=0.5, categorical_features=self.categorical)
+        model.fit(self.X, self.y)
+        self.assertEqual(model.coef_.shape, (1, 6))
+        np.testing.assert_array_equal(model.coef_[0, self.categorical], 0.0)
+        self.assertEqual([len(c) for c in model.category_coef_], [6, 4])
+
+        reference = LogisticRegression(alpha=0.5, binding="reference").fit(self._one_hot(), self.y)
+        np.testing.assert_allclose(model.predict_proba(self.X),
+                                   reference.predict_proba(self._one_hot()), atol=1e-8)
+
+    def test_boolean_mask_and_sparse_input(self):
+        """Tests that a boolean mask and sparse input select the same model."""
+        mask = np.zeros(6, dtype=bool)
+        mask[self.categorical] = True
+        dense = LogisticRegression(categorical_features=self.categorical).fit(self.X, self.y)
+        sparse = LogisticRegression(categorical_features=mask).fit(csr_matrix(self.X), self.y)
+        np.testing.assert_allclose(sparse.coef_, dense.coef_, atol=1e-10)
+        np.testing.assert_allclose(sparse.predict_proba(self.X), dense.predict_proba(self.X))
+
+    def test_unseen_codes_contribute_nothing(self):
+        """Tests that codes beyond the fitted levels score like an all-zero one-hot row."""
+        model = LogisticRegression(categorical_features=self.categorical).fit(self.X, self.y)
+        row = self.X[:1].copy()
+        row[0, 2] = 17
+        scores = model._decision_function(row).ravel()
+        expected = model.intercept_[0] + row[0] @ model.coef_[0] + model.category_coef_[1][int(row[0, 5])]
+        self.assertAlmostEqual(scores[0], expected)
+
+    def test_group_penalty_enters_whole_groups(self):
+        """Tests that grouped levels enter the path together."""
+        model = LogisticRegression(alpha=1.0, categorical_features=self.categorical,
+                                   group_penalty=True).fit(self.X, self.y)
+        path = model.path_
+        color_levels = set(range(6 + 0, 6 + 6))
+        for index in range(path.n_lambdas):
+            entered = set(path.ia[:path.nin[index]].tolist()) & color_levels
+            self.assertIn(len(entered), (0, 6))
+
+    def test_invalid_codes(self):
+        """Tests that negative or fractional codes are rejected."""
+        X = self.X.copy()
+        X[0, 2] = 1.5
+        with pytest.raises(ValueError, match="integer codes"):
+            LogisticRegression(categorical_features=self.categorical).fit(X, self.y)
+        with pytest.raises(ValueError, match="column indices"):
+            LogisticRegression(categorical_features=[9]).fit(self.X, self.y)
+
+    def test_scorer_matches_estimator(self):
+        """Tests that the scorer adds the level coefficients of every input kind."""
+        model = LogisticRegression(categorical_features=self.categorical).fit(self.X, self.y)
+        scorer = model.make_scorer()
+        expected = model.predict_proba(self.X)
+        np.testing.assert_allclose(scorer.predict_proba(self.X), expected)
+        np.testing.assert_allclose(scorer.predict_proba(csr_matrix(self.X)), expected)
+        self.assertAlmostEqual(scorer.score_one(self.X[3]), expected[3, 1])
+        # Missing keys are zero, so an absent categorical column has code 0.
+        row = {j: v for j, v in enumerate(self.X[3]) if v != 0}
+        self.assertAlmostEqual(scorer.score_dict(row), expected[3, 1])
+        with pytest.raises(ValueError, match="integer codes"):
+            scorer.score_one(np.where(np.arange(6) == 2, -1.0, self.X[3]))
+
+    def test_save_and_load(self):
+        """Tests that saved models keep their categorical columns and levels."""
+        model = LogisticRegression(categorical_features=self.categorical).fit(self.X, self.y)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "model.glmpynet")
+            model.save(path)
+            loaded = LogisticRegression.load(path, mmap=False)
+        self.assertEqual(loaded.get_params(), model.get_params())
+        np.testing.assert_array_equal(loaded.categorical_features_, model.categorical_features_)
+        np.testing.assert_array_equal(loaded.n_categories_, model.n_categories_)
+        for actual, expected in zip(loaded.category_coef_, model.category_coef_):
+            np.testing.assert_array_equal(actual, expected)
+        np.testing.assert_allclose(loaded.predict_proba(self.X), model.predict_proba(self.X))
+        np.testing.assert_array_equal(loaded.path_.to_dense(), model.path_.to_dense())
+
+    def test_default_binding_falls_back(self):
+        """Tests that a default binding without categorical support falls back to the reference solver."""
+        with mock.patch("glmpynet.logistic_regression.resolve_binding",
+                        return_value=WithoutCategoricals()):
+            model = LogisticRegression(categorical_features=self.categorical).fit(self.X, self.y)
+            self.assertIsInstance(model.binding_, ReferenceGlmNetBinding)
+            self.assertEqual([len(c) for c in model.category_coef_], [6, 4])
+            with pytest.raises(NotImplementedError):
+                LogisticRegression(categorical_features=self.categorical,
+                                   binding=WithoutCategoricals()).fit(self.X, self.y)
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,113 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+from sklearn.linear_model import ElasticNet as SklearnElasticNet
+from sklearn.preprocessing import StandardScaler
+from sklearn.utils._param_validation import InvalidParameterError
+from sklearn.utils.estimator_checks import check_estimator
+
+from glmpynet.binding.base import GlmNetBinding
+from glmpynet.binding.reference import ReferenceGlmNetBinding
+from glmpynet.elastic_net import ElasticNet
+from glmpynet.gram import GramAccumulator
+
+
+class PathOnlyBinding(GlmNetBinding):
+    """A binding without support for sufficient statistics."""
+
+    def fit(self, x, y, alpha, nlambda, **kwargs):
+        raise AssertionError("not used")
+
+
+class TestElasticNet(unittest.TestCase):
+    """
+    A test suite for the ElasticNet class.
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(600, 15)) * rng.uniform(0.5, 5.0, 15) + 10.0
+        self.y = self.X[:, :4] @ np.array([1.0, -2.0, 0.5, 3.0]) + rng.normal(size=600)
+
+    def test_matches_sklearn(self):
+        """Tests that the selected solution solves scikit-learn's elastic-net problem."""
+        model = ElasticNet(alpha=0.5).fit(self.X, self.y)
+        lam = model.path_.alm[model.lambda_index_]
+        reference = SklearnElasticNet(alpha=lam, l1_ratio=0.5, tol=1e-12, max_iter=100000)
+        reference.fit(StandardScaler().fit_transform(self.X), self.y)
+        np.testing.assert_allclose(model.coef_, reference.coef_ / self.X.std(axis=0), atol=1e-6)
+
+    def test_partial_fit_matches_fit(self):
+        """Tests that streaming chunks gives the same model as one fit."""
+        full = ElasticNet().fit(self.X, self.y)
+        streamed = ElasticNet()
+        for rows in np.array_split(np.arange(600), 5):
+            streamed.partial_fit(self.X[rows], self.y[rows])
+        np.testing.assert_allclose(streamed.coef_, full.coef_, atol=1e-10)
+        self.assertAlmostEqual(streamed.intercept_, full.intercept_)
+        self.assertEqual(streamed.stats_.n_samples_seen_, 600)
+
+    def test_partial_fit_solves_lazily(self):
+        """Tests that streamed chunks are solved once, when the model is first used."""
+        model = ElasticNet()
+        with mock.patch.object(ReferenceGlmNetBinding, "fit_gram",
+                               autospec=True, side_effect=ReferenceGlmNetBinding.fit_gram) as fit_gram:
+            for rows in np.array_split(np.arange(600), 5):
+                model.partial_fit(self.X[rows], self.y[rows])
+            self.assertEqual(fit_gram.call_count, 0)
+            first = model.predict(self.X[:10])
+            model.predict(self.X[:10])
+            self.assertEqual(fit_gram.call_count, 1)
+
+            # A further chunk discards the solved path.
+            model.partial_fit(self.X[:100], self.y[:100])
+            self.assertIsNone(model._solution)
+            self.assertFalse(np.allclose(model.predict(self.X[:10]), first))
+            self.assertEqual(fit_gram.call_count, 2)
+        with pytest.raises(AttributeError):
+            ElasticNet().coef_
+        self.assertFalse(hasattr(ElasticNet(), "path_"))
+
+    def test_fit_stats_from_merged_workers(self):
+        """Tests fitting from accumulators merged across workers."""
+        full = ElasticNet().fit(self.X, self.y)
+        parts = [GramAccumulator(15).update(self.X[rows], self.y[rows])
+                 for rows in np.array_split(np.arange(600), 3)]
+        merged = parts[0].merge(parts[1]).merge(parts[2])
+        model = ElasticNet().fit_stats(merged)
+        np.testing.assert_allclose(model.coef_, full.coef_, atol=1e-10)
+        np.testing.assert_allclose(model.predict(self.X), full.predict(self.X))
+
+    def test_sparse_input(self):
+        """Tests that sparse chunks give the same model as dense ones."""
+        X = np.where(self.X > 12.0, self.X, 0.0)
+        dense = ElasticNet(alpha=0.2).fit(X, self.y)
+        sparse = ElasticNet(alpha=0.2).fit(csr_matrix(X), self.y)
+        np.testing.assert_allclose(sparse.coef_, dense.coef_, atol=1e-10)
+
+    def test_lasso_is_sparse(self):
+        """Tests that the first features to enter the lasso path are the informative ones."""
+        model = ElasticNet(alpha=1.0).fit(self.X, self.y)
+        self.assertEqual(model.path_.nin[0], 0)
+        self.assertEqual(set(model.path_.ia[:4].tolist()), set(range(4)))
+
+    def test_binding_without_gram(self):
+        """Tests that an explicit binding without `fit_gram` fails clearly."""
+        with pytest.raises(NotImplementedError, match="sufficient statistics"):
+            ElasticNet(binding=PathOnlyBinding()).fit(self.X, self.y)
+
+    def test_invalid_alpha(self):
+        """Tests that alpha outside [0, 1] is rejected."""
+        with pytest.raises(InvalidParameterError):
+            ElasticNet(alpha=1.5).fit(self.X, self.y)
+
+    def test_sklearn_compatibility(self):
+        """Tests that the estimator passes scikit-learn's estimator checks."""
+        check_estimator(ElasticNet())
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,81 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+
+from glmpynet.gram import GramAccumulator
+
+
+class TestGramAccumulator(unittest.TestCase):
+    """
+    A test suite for streaming sufficient statistics.
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # Large offsets make the naive uncentered formulas lose precision.
+        self.X = rng.normal(size=(400, 6)) + 1e4
+        self.y = rng.normal(size=400)
+        self.w = rng.uniform(0.5, 2.0, size=400)
+
+    def _expected(self):
+        w = self.w / self.w.sum()
+        xc = self.X - w @ self.X
+        yc = self.y - w @ self.y
+        return (xc * w[:, None]).T @ xc, (xc * w[:, None]).T @ yc, w @ (yc * yc)
+
+    def test_chunks_match_single_pass(self):
+        """Tests that chunked updates give the weighted covariances of all rows."""
+        stats = GramAccumulator(6)
+        for rows in np.array_split(np.arange(400), 7):
+            stats.update(self.X[rows], self.y[rows], self.w[rows])
+        for actual, expected in zip(stats.covariance(), self._expected()):
+            np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-12)
+        self.assertEqual(stats.n_samples_seen_, 400)
+
+    def test_merge(self):
+        """Tests that merging accumulators of disjoint rows equals one accumulator."""
+        left = GramAccumulator(6).update(self.X[:150], self.y[:150], self.w[:150])
+        right = GramAccumulator(6).update(self.X[150:], self.y[150:], self.w[150:])
+        merged = left.merge(right)
+        for actual, expected in zip(merged.covariance(), self._expected()):
+            np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(merged.x_mean_, np.average(self.X, axis=0, weights=self.w))
+
+    def test_sparse_chunks(self):
+        """Tests that sparse chunks give the same statistics as dense ones."""
+        X = np.where(self.X > 1e4 + 0.5, self.X - 1e4, 0.0)
+        dense = GramAccumulator(6).update(X, self.y)
+        sparse = GramAccumulator(6).update(csr_matrix(X), self.y)
+        for actual, expected in zip(sparse.covariance(), dense.covariance()):
+            np.testing.assert_allclose(actual, expected, atol=1e-12)
+
+    def test_sparse_chunks_are_centered(self):
+        """Tests that sparse chunks with large offsets keep the precision of dense ones."""
+        # One sparse column; the others are stored in full with large offsets.
+        X = self.X.copy()
+        X[X[:, 0] < 1e4, 0] = 0.0
+        w = self.w / self.w.sum()
+        xc = X - w @ X
+        expected = (xc * w[:, None]).T @ xc
+        # Small blocks, so every chunk spans several of them.
+        with mock.patch("glmpynet.binding._design.BLOCK_ELEMENTS", 60):
+            stats = GramAccumulator(6)
+            for rows in np.array_split(np.arange(400), 3):
+                stats.update(csr_matrix(X[rows]), self.y[rows], self.w[rows])
+        np.testing.assert_allclose(stats.covariance()[0], expected, rtol=1e-9)
+        self.assertEqual(stats.n_samples_seen_, 400)
+
+    def test_feature_mismatch(self):
+        """Tests that chunks and accumulators must agree on the number of features."""
+        stats = GramAccumulator(6)
+        with pytest.raises(ValueError, match="features"):
+            stats.update(self.X[:, :3], self.y)
+        with pytest.raises(ValueError, match="Cannot merge"):
+            stats.merge(GramAccumulator(3))
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -160,6 +160,11 @@ class TestLogisticRegression(unittest.TestCase):
             "C": 0.5,
             "alpha": 0.9,
             "nlambda": 50,
+            "dfmax": None,
+            "pmax": None,
+            "standardize": True,
+            "categorical_features": None,
+            "group_penalty": False,
             "binding": None
         }
         self.assertEqual(params, expected_params)
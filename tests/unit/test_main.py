@@ -0,0 +1,137 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.datasets import dump_svmlight_file, make_classification
+
+from glmpynet.__main__ import load_data, main
+from glmpynet.logistic_regression import LogisticRegression
+from glmpynet.storage import save_csc
+
+
+class TestCommandLine(unittest.TestCase):
+    """
+    A test suite for the `python -m glmpynet` batch entry point.
+    """
+
+    def setUp(self):
+        """Write a dataset to a scratch directory in several formats."""
+        self.X, self.y = make_classification(
+            n_samples=200, n_features=20, n_informative=10, n_classes=2, random_state=42
+        )
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.X_path = self.file("X.npy")
+        self.y_path = self.file("y.npy")
+        self.model_path = self.file("model.glmpynet")
+        np.save(self.X_path, np.asfortranarray(self.X))
+        np.save(self.y_path, self.y)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def file(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_fit_then_predict_npy(self):
+        """Tests a fit job followed by a chunked predict job."""
+        self.assertEqual(main(["fit", "--X", self.X_path, "--y", self.y_path,
+                               "--alpha", "1.0", "--output", self.model_path]), 0)
+        out_path = self.file("proba.npy")
+        self.assertEqual(main(["predict", "--model", self.model_path, "--X", self.X_path,
+                               "--output", out_path, "--chunk-size", "37"]), 0)
+
+        expected = LogisticRegression(alpha=1.0, binding="reference").fit(self.X, self.y).predict_proba(self.X)[:, 1]
+        np.testing.assert_allclose(np.load(out_path), expected)
+
+    def test_predict_labels_to_text(self):
+        """Tests that labels can be streamed to a text file."""
+        main(["fit", "--X", self.X_path, "--y", self.y_path, "--output", self.model_path])
+        out_path = self.file("labels.txt")
+        main(["predict", "--model", self.model_path, "--X", self.X_path,
+              "--output", out_path, "--labels", "--chunk-size", "50"])
+        model = LogisticRegression.load(self.model_path)
+        np.testing.assert_array_equal(np.loadtxt(out_path), model.predict(self.X))
+
+    def test_predict_csc_matches_dense(self):
+        """Tests that a CSC directory is scored like the same dense file."""
+        main(["fit", "--X", self.X_path, "--y", self.y_path, "--output", self.model_path])
+        csc_dir = self.file("csc")
+        save_csc(csc_dir, csr_matrix(self.X))
+        model = LogisticRegression.load(self.model_path)
+
+        out_path = self.file("proba.npy")
+        main(["predict", "--model", self.model_path, "--X", csc_dir,
+              "--output", out_path, "--chunk-size", "37"])
+        np.testing.assert_allclose(np.load(out_path), model.predict_proba(self.X)[:, 1])
+
+        labels_path = self.file("labels.txt")
+        main(["predict", "--model", self.model_path, "--X", csc_dir,
+              "--output", labels_path, "--labels", "--chunk-size", "37"])
+        np.testing.assert_array_equal(np.loadtxt(labels_path), model.predict(self.X))
+
+    def test_cv_with_workers_over_shared_input(self):
+        """Tests that cv with --n-jobs fits over shared X like a serial run."""
+        parallel_path = self.file("parallel.glmpynet")
+        main(["cv", "--X", self.X_path, "--y", self.y_path, "--alpha-grid", "0.5", "1.0",
+              "--folds", "3", "--output", self.model_path])
+        main(["cv", "--X", self.X_path, "--y", self.y_path, "--alpha-grid", "0.5", "1.0",
+              "--folds", "3", "--n-jobs", "2", "--output", parallel_path])
+        serial = LogisticRegression.load(self.model_path)
+        parallel = LogisticRegression.load(parallel_path)
+        self.assertEqual(parallel.alpha, serial.alpha)
+        np.testing.assert_allclose(parallel.predict_proba(self.X), serial.predict_proba(self.X),
+                                   atol=1e-6)
+
+    def test_cv_writes_best_model(self):
+        """Tests that the cv job writes a loadable model with a grid value."""
+        main(["cv", "--X", self.X_path, "--y", self.y_path, "--alpha-grid", "0.5", "1.0",
+              "--folds", "3", "--output", self.model_path])
+        model = LogisticRegression.load(self.model_path)
+        self.assertIn(model.alpha, [0.5, 1.0])
+
+    def test_cv_requires_a_grid(self):
+        """Tests that cv refuses to run without a parameter grid."""
+        with self.assertRaises(ValueError):
+            main(["cv", "--X", self.X_path, "--y", self.y_path, "--output", self.model_path])
+        # C does not select the lambda, so it is not offered as a grid.
+        with self.assertRaises(SystemExit):
+            main(["cv", "--X", self.X_path, "--y", self.y_path, "--C-grid", "0.1", "1.0",
+                  "--output", self.model_path])
+
+    def test_missing_target(self):
+        """Tests that fit reports a missing target clearly."""
+        with self.assertRaisesRegex(ValueError, "No target found"):
+            main(["fit", "--X", self.X_path, "--output", self.model_path])
+
+    def test_load_svmlight(self):
+        """Tests that svmlight files provide both X and y."""
+        path = self.file("data.svm")
+        dump_svmlight_file(self.X, self.y, path)
+        X, y = load_data(path)
+        self.assertEqual(X.shape, self.X.shape)
+        np.testing.assert_array_equal(y, self.y)
+
+    def test_load_npz_and_csc(self):
+        """Tests dense npz archives and memory-mapped CSC directories."""
+        npz_path = self.file("data.npz")
+        np.savez(npz_path, X=self.X, y=self.y)
+        X, y = load_data(npz_path)
+        np.testing.assert_array_equal(X, self.X)
+        np.testing.assert_array_equal(y, self.y)
+
+        csc_dir = self.file("csc")
+        save_csc(csc_dir, csr_matrix(self.X))
+        X, y = load_data(csc_dir)
+        self.assertIsNone(y)
+        np.testing.assert_allclose(X.toarray(), self.X)
+
+    def test_unsupported_format(self):
+        """Tests that unknown file types are rejected."""
+        with self.assertRaisesRegex(ValueError, "Unsupported input format"):
+            load_data(self.file("data.xlsx"))
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,292 @@
+import os
+import tempfile
+import time
+import tracemalloc
+import unittest
+import warnings
+
+import numpy as np
+import pytest
+from scipy.sparse import csc_matrix
+from sklearn.datasets import make_classification
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.linear_model import LogisticRegression as SklearnLogisticRegression
+from sklearn.preprocessing import StandardScaler
+from sklearn.utils._param_validation import InvalidParameterError
+
+from glmpynet.binding import _design, reference
+from glmpynet.binding.reference import ReferenceGlmNetBinding
+from glmpynet.logistic_regression import LogisticRegression
+from glmpynet.path import CoefficientPath
+
+
+class TestReferenceGlmNetBinding(unittest.TestCase):
+    """
+    A test suite for the pure-NumPy reference solver.
+    """
+
+    def setUp(self):
+        self.X, self.y = make_classification(
+            n_samples=300, n_features=12, n_informative=4, random_state=0
+        )
+        self.binding = ReferenceGlmNetBinding()
+
+    def _path(self, results):
+        return CoefficientPath.from_results(results, self.X.shape[1])
+
+    def _sklearn_coef(self, lam, penalty):
+        """Solve the same penalized problem with scikit-learn on standardized data."""
+        Z = StandardScaler().fit_transform(self.X)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            model = SklearnLogisticRegression(
+                penalty=penalty, C=1 / (len(self.y) * lam), solver="liblinear",
+                tol=1e-10, intercept_scaling=1e4, max_iter=10000,
+            ).fit(Z, self.y)
+        return model.coef_.ravel() / self.X.std(axis=0)
+
+    def test_lasso_matches_sklearn(self):
+        """Tests that lasso path points solve the same problem as scikit-learn."""
+        results = self.binding.fit(self.X, self.y, alpha=1.0, nlambda=50)
+        path = self._path(results)
+        for index in (10, 25):
+            expected = self._sklearn_coef(path.alm[index], "l1")
+            np.testing.assert_allclose(path.coef(index), expected, atol=1e-3)
+
+    def test_ridge_matches_sklearn(self):
+        """Tests that ridge path points solve the same problem as scikit-learn."""
+        results = self.binding.fit(self.X, self.y, alpha=0.0, nlambda=50)
+        path = self._path(results)
+        expected = self._sklearn_coef(path.alm[30], "l2")
+        np.testing.assert_allclose(path.coef(30), expected, atol=1e-4)
+
+    def test_path_structure(self):
+        """Tests the lambda sequence, the null model and the deviance ratio."""
+        results = self.binding.fit(self.X, self.y, alpha=1.0, nlambda=100)
+        lmu = results['lmu']
+        self.assertEqual(results['jerr'], 0)
+        self.assertTrue(np.all(np.diff(results['alm'][:lmu]) < 0))
+        self.assertEqual(results['nin'][0], 0)
+        self.assertTrue(np.all(np.diff(results['dev'][:lmu]) >= -1e-10))
+        self.assertEqual(len(set(results['ia'].tolist())), len(results['ia']))
+
+    def test_sparse_matches_dense(self):
+        """Tests that sparse input gives the same path as dense input."""
+        dense = self.binding.fit(self.X, self.y, alpha=0.5, nlambda=30)
+        sparse = self.binding.fit(csc_matrix(self.X), self.y, alpha=0.5, nlambda=30)
+        self.assertEqual(dense['lmu'], sparse['lmu'])
+        np.testing.assert_allclose(sparse['ca'], dense['ca'], atol=1e-10)
+        np.testing.assert_allclose(sparse['a0'], dense['a0'], atol=1e-10)
+
+    def test_memmap_columns_are_not_copied(self):
+        """Tests that fitting a memory map only allocates bounded row blocks."""
+        rng = np.random.RandomState(0)
+        X = np.asfortranarray(rng.randn(40000, 50))
+        y = (X[:, :4].sum(axis=1) + rng.randn(40000) > 0).astype(int)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "X.npy")
+            np.save(path, X)
+            X_map = np.load(path, mmap_mode="r")
+            tracemalloc.start()
+            try:
+                results = self.binding.fit(X_map, y, alpha=1.0, nlambda=10)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            del X_map
+        # All columns are active at the end of the path, so one copy of the
+        # active columns would already take X.nbytes.
+        self.assertLess(peak, 0.75 * X.nbytes)
+        in_memory = self.binding.fit(X, y, alpha=1.0, nlambda=10)
+        np.testing.assert_allclose(results['ca'], in_memory['ca'])
+
+    def test_row_blocks_match_whole_products(self):
+        """Tests the blocked dense products against products with copied columns."""
+        design = _design.DenseDesign(self.X)
+        cols = np.array([0, 3, 7, 11])
+        center = self.X[:, cols].mean(axis=0)
+        v = np.random.RandomState(0).rand(self.X.shape[0])
+        original = _design.BLOCK_ELEMENTS, _design.GATHER_FRACTION
+        _design.BLOCK_ELEMENTS = 7 * len(cols)   # many small, uneven blocks
+        _design.GATHER_FRACTION = 1.0            # gather even most of the columns
+        try:
+            xx, xv = design.gram(cols, v, center)
+            matvec = design.matvec(cols, np.arange(4.0), center)
+            rmatvec = design.rmatvec(v, cols, center)
+            full = design.rmatvec(v, np.arange(12), self.X.mean(axis=0))
+        finally:
+            _design.BLOCK_ELEMENTS, _design.GATHER_FRACTION = original
+        wide = design.rmatvec(v, cols, center)   # one product over every column
+        np.testing.assert_allclose(wide, rmatvec)
+        np.testing.assert_allclose(design.matvec(cols, np.arange(4.0), center), matvec)
+        sub = self.X[:, cols] - center
+        np.testing.assert_allclose(full, (self.X - self.X.mean(axis=0)).T @ v)
+        np.testing.assert_allclose(xx, (sub * v[:, None]).T @ sub)
+        np.testing.assert_allclose(xv, v @ sub)
+        np.testing.assert_allclose(matvec, sub @ np.arange(4.0))
+        np.testing.assert_allclose(rmatvec, sub.T @ v)
+
+    def test_extended_hessian_matches_rebuilt(self):
+        """Tests that adding features to a kept Hessian matches building it anew."""
+        design = _design.StandardizedDesign(_design.DenseDesign(self.X), np.full(300, 1 / 300))
+        v = np.random.RandomState(0).rand(300) / 300
+        hessian = reference._Hessian(design)
+        hessian.gram(np.array([1, 4, 6, 9]), v)
+        cols = np.array([1, 2, 4, 6, 9, 11])
+        np.testing.assert_allclose(hessian.gram(cols, v * 1.1), design.gram(cols, v))
+
+    def test_offset_invariance(self):
+        """Tests that shifting the features by large offsets leaves the path unchanged."""
+        base = self.binding.fit(self.X, self.y, alpha=1.0, nlambda=50)
+        categorical = np.column_stack((self.X, np.arange(len(self.y)) % 4))
+        base_categorical = self.binding.fit(categorical, self.y, alpha=0.5, nlambda=20,
+                                            categorical=[12])
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            for offset, sparse in ((1e8, False), (1e6, True)):
+                X = self.X + offset
+                shifted = self.binding.fit(csc_matrix(X) if sparse else X, self.y,
+                                           alpha=1.0, nlambda=50)
+                self.assertEqual(shifted['lmu'], base['lmu'])
+                np.testing.assert_allclose(self._path(shifted).to_dense(),
+                                           self._path(base).to_dense(), atol=1e-6)
+                np.testing.assert_allclose(shifted['alm'], base['alm'], rtol=1e-6)
+
+            shifted = categorical.copy()
+            shifted[:, :12] += 1e8
+            shifted = self.binding.fit(shifted, self.y, alpha=0.5, nlambda=20, categorical=[12])
+            np.testing.assert_allclose(
+                CoefficientPath.from_results(shifted, 17).to_dense(),
+                CoefficientPath.from_results(base_categorical, 17).to_dense(), atol=1e-6)
+
+    def test_weights_match_repeated_rows(self):
+        """Tests that integer weights are equivalent to repeating rows."""
+        counts = np.random.default_rng(0).integers(0, 3, size=len(self.y))
+        weighted = self.binding.fit(self.X, self.y, alpha=1.0, nlambda=20, weights=counts)
+        rows = np.repeat(np.arange(len(self.y)), counts)
+        repeated = self.binding.fit(self.X[rows], self.y[rows], alpha=1.0, nlambda=20)
+        np.testing.assert_allclose(weighted['ca'], repeated['ca'], atol=1e-8)
+
+    def test_internal_standardization(self):
+        """Tests that `standardize=True` on raw data equals a fit on pre-scaled data."""
+        Z = StandardScaler().fit_transform(self.X)
+        internal = self.binding.fit(self.X, self.y, alpha=0.5, nlambda=30)
+        external = self.binding.fit(Z, self.y, alpha=0.5, nlambda=30, standardize=False)
+        np.testing.assert_array_equal(internal['ia'], external['ia'])
+        np.testing.assert_allclose(internal['ca'] * self.X.std(axis=0)[internal['ia'], None],
+                                   external['ca'], atol=1e-8)
+        np.testing.assert_allclose(internal['alm'], external['alm'])
+
+    def test_unstandardized_sparse_matches_dense(self):
+        """Tests that sparse input without standardization matches dense input."""
+        dense = self.binding.fit(self.X, self.y, alpha=1.0, nlambda=20, standardize=False)
+        sparse = self.binding.fit(csc_matrix(self.X), self.y, alpha=1.0, nlambda=20,
+                                  standardize=False)
+        np.testing.assert_allclose(sparse['ca'], dense['ca'], atol=1e-10)
+
+    def test_constant_columns_never_enter(self):
+        """Tests that zero-variance columns stay out of the model."""
+        X = np.column_stack((self.X, np.full(len(self.y), 3.0)))
+        results = self.binding.fit(X, self.y, alpha=1.0, nlambda=50)
+        self.assertNotIn(X.shape[1] - 1, results['ia'].tolist())
+
+    def test_iteration_limit_truncates_path(self):
+        """Tests that hitting `maxit` is reported as a negative error code."""
+        results = self.binding.fit(self.X, self.y, alpha=1.0, nlambda=50, maxit=20)
+        self.assertLess(results['jerr'], 0)
+        self.assertEqual(results['lmu'], -results['jerr'] - 1)
+
+    def test_dfmax_stops_path(self):
+        """Tests that the path stops right after more than `dfmax` features are nonzero."""
+        full = self.binding.fit(self.X, self.y, alpha=1.0, nlambda=100)
+        results = self.binding.fit(self.X, self.y, alpha=1.0, nlambda=100, dfmax=3)
+        path = self._path(results)
+        nonzero = [np.count_nonzero(path.coef(l)) for l in range(path.n_lambdas)]
+        self.assertLess(results['lmu'], full['lmu'])
+        self.assertTrue(all(k <= 3 for k in nonzero[:-1]))
+        self.assertGreater(nonzero[-1], 3)
+        self.assertEqual(results['jerr'], 0)
+
+    def test_pmax_bounds_coefficient_rows(self):
+        """Tests that `pmax` truncates the path and bounds the stored rows."""
+        results = self.binding.fit(self.X, self.y, alpha=1.0, nlambda=100, pmax=4)
+        self.assertLessEqual(results['ca'].shape[0], 4)
+        self.assertEqual(results['ca'].shape[0], len(results['ia']))
+        self.assertLess(results['jerr'], -10000)
+        self.assertEqual(results['lmu'], -results['jerr'] - 10000 - 1)
+
+    def test_coefficient_rows_grow_on_demand(self):
+        """Tests that `ca` is sized to the entered features of wide fits."""
+        X, y = make_classification(n_samples=100, n_features=300, n_informative=5,
+                                   random_state=0)
+        results = self.binding.fit(X, y, alpha=1.0, nlambda=30)
+        self.assertEqual(results['ca'].shape, (len(results['ia']), 30))
+        self.assertLess(results['ca'].shape[0], X.shape[1])
+
+
+class TruncatingBinding(ReferenceGlmNetBinding):
+    """A binding that always runs out of iterations part-way along the path."""
+
+    def fit(self, x, y, alpha, nlambda, **kwargs):
+        return super().fit(x, y, alpha, nlambda, maxit=30, **kwargs)
+
+
+class TestEstimatorWithReference(unittest.TestCase):
+    """
+    A test suite for how the estimator handles real, possibly truncated paths.
+    """
+
+    def test_truncated_path_warns_and_clamps(self):
+        """Tests that a truncated path warns and selects a fitted lambda."""
+        X, y = make_classification(n_samples=200, n_features=10, random_state=1)
+        with pytest.warns(ConvergenceWarning):
+            model = LogisticRegression(alpha=1.0, binding=TruncatingBinding()).fit(X, y)
+        self.assertLess(model.lambda_index_, model.path_.n_lambdas)
+
+    def test_pmax_truncates_with_warning(self):
+        """Tests that reaching `pmax` keeps the fitted part of the path and warns."""
+        X, y = make_classification(n_samples=200, n_features=30, random_state=1)
+        with pytest.warns(ConvergenceWarning):
+            model = LogisticRegression(alpha=1.0, pmax=5).fit(X, y)
+        self.assertLessEqual(np.count_nonzero(model.coef_), 5)
+        self.assertLessEqual(model.path_.ca.shape[0], 5)
+
+    def test_tall_fit_keeps_pace_with_saga(self):
+        """
+        Tests that a tall fit is not far slower than scikit-learn's saga solver.
+
+        The former mock binding fitted a single saga model. The reference
+        solver fits a whole path, so it may take a few times as long, but
+        rebuilding its Hessian at every IRLS step made it about 20 times
+        slower.
+        """
+        X, y = make_classification(n_samples=10000, n_features=200, n_informative=10,
+                                   random_state=0)
+        start = time.perf_counter()
+        LogisticRegression(binding="reference").fit(X, y)
+        reference_time = time.perf_counter() - start
+        start = time.perf_counter()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", ConvergenceWarning)
+            SklearnLogisticRegression(C=1e5, solver="saga", tol=1e-4, max_iter=1000,
+                                      random_state=42).fit(X, y)
+        saga_time = time.perf_counter() - start
+        self.assertLess(reference_time, 10 * saga_time)
+
+    def test_invalid_dfmax(self):
+        """Tests that non-positive limits are rejected."""
+        X, y = make_classification(n_samples=50, n_features=5, random_state=1)
+        with pytest.raises(InvalidParameterError, match="dfmax"):
+            LogisticRegression(dfmax=0).fit(X, y)
+        with pytest.raises(InvalidParameterError, match="pmax"):
+            LogisticRegression(pmax=2.5).fit(X, y)
+
+    def test_single_class_raises(self):
+        """Tests that a target with a single class is rejected."""
+        X = np.random.default_rng(0).normal(size=(20, 3))
+        with pytest.raises(ValueError, match="only one class"):
+            LogisticRegression().fit(X, np.ones(20))
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
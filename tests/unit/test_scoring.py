@@ -0,0 +1,100 @@
+import unittest
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+from sklearn.datasets import make_classification
+from sklearn.exceptions import NotFittedError
+
+from glmpynet.logistic_regression import LogisticRegression
+from glmpynet.scoring import LogisticScorer
+
+
+class TestLogisticScorer(unittest.TestCase):
+    """
+    A test suite for the LogisticScorer returned by make_scorer().
+    """
+
+    def setUp(self):
+        """Fit a model once for all scorer tests."""
+        self.X, self.y = make_classification(
+            n_samples=200, n_features=20, n_informative=10, n_classes=2, random_state=42
+        )
+        self.model = LogisticRegression(alpha=1.0).fit(self.X, self.y)
+        self.scorer = self.model.make_scorer()
+
+    def test_make_scorer_requires_fit(self):
+        """Tests that an unfitted model cannot produce a scorer."""
+        with self.assertRaises(NotFittedError):
+            LogisticRegression().make_scorer()
+
+    def test_predict_proba_matches_estimator(self):
+        """Tests that batch probabilities match the estimator's predict_proba."""
+        np.testing.assert_allclose(
+            self.scorer.predict_proba(self.X), self.model.predict_proba(self.X)
+        )
+
+    def test_predict_matches_estimator(self):
+        """Tests that batch and single-row labels match the estimator."""
+        np.testing.assert_array_equal(self.scorer.predict(self.X), self.model.predict(self.X))
+        self.assertEqual(self.scorer.predict(self.X[0]), self.model.predict(self.X[:1])[0])
+
+    def test_score_one(self):
+        """Tests that a single 1-D row returns a float probability."""
+        expected = self.model.predict_proba(self.X[:1])[0, 1]
+        p = self.scorer.score_one(self.X[0])
+        self.assertIsInstance(p, float)
+        self.assertAlmostEqual(p, expected)
+        self.assertAlmostEqual(self.scorer.score(self.X[0]), expected)
+
+    def test_score_dict(self):
+        """Tests scoring a row given as a mapping of feature index to value."""
+        row = np.zeros(self.X.shape[1])
+        row[[1, 5, 7]] = [0.5, -2.0, 3.0]
+        expected = self.model.predict_proba(row.reshape(1, -1))[0, 1]
+        self.assertAlmostEqual(self.scorer.score({1: 0.5, 5: -2.0, 7: 3.0}), expected)
+        self.assertAlmostEqual(
+            self.scorer.score_dict({}), self.model.predict_proba(np.zeros((1, 20)))[0, 1]
+        )
+
+    def test_score_dict_out_of_range(self):
+        """Tests that invalid feature indices are rejected."""
+        with pytest.raises(IndexError, match="Feature indices must be in"):
+            self.scorer.score_dict({20: 1.0})
+
+    def test_score_batch_into_buffer(self):
+        """Tests that micro-batches can be scored into a preallocated buffer."""
+        out = np.empty(5)
+        result = self.scorer.score(self.X[:5], out=out)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(out, self.model.predict_proba(self.X[:5])[:, 1])
+
+    def test_sparse_batch(self):
+        """Tests that sparse micro-batches are supported."""
+        X_sparse = csr_matrix(self.X[:10])
+        np.testing.assert_allclose(
+            self.scorer.predict_proba(X_sparse), self.model.predict_proba(self.X[:10])
+        )
+
+    def test_wrong_number_of_features(self):
+        """Tests that the feature count is still checked."""
+        with self.assertRaises(ValueError):
+            self.scorer.score_one(self.X[0, :-1])
+        with self.assertRaises(ValueError):
+            self.scorer.predict_proba(self.X[:, :-1])
+
+    def test_extreme_scores_are_stable(self):
+        """Tests that large negative and positive scores do not overflow."""
+        scorer = LogisticScorer(np.array([1.0]), 0.0, np.array([0, 1]))
+        self.assertEqual(scorer.score_one(np.array([-1e4])), 0.0)
+        self.assertEqual(scorer.score_one(np.array([1e4])), 1.0)
+
+    def test_snapshot_is_independent_of_refit(self):
+        """Tests that refitting the estimator does not change an existing scorer."""
+        before = self.scorer.score_one(self.X[0])
+        self.model.set_params(alpha=0.0).fit(self.X[:100], self.y[:100])
+        self.assertEqual(self.scorer.score_one(self.X[0]), before)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,119 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+
+from glmpynet.logistic_regression import LogisticRegression
+from glmpynet.path import CoefficientPath
+from glmpynet.serialization import FORMAT_VERSION, read_header
+
+
+class TestCoefficientPath(unittest.TestCase):
+    """
+    A test suite for the compressed CoefficientPath representation.
+    """
+
+    def test_dense_round_trip(self):
+        """Tests that compressing and expanding a dense path is lossless."""
+        coef = np.array([
+            [0.0, 0.0, 1.0, 2.0],
+            [0.0, 0.5, 0.7, 0.0],
+            [0.0, 0.0, 0.0, 0.0],
+            [0.0, 0.0, 0.0, 3.0],
+        ])
+        path = CoefficientPath.from_dense(np.arange(4.0), coef)
+        np.testing.assert_array_equal(path.ia, [1, 0, 3])
+        np.testing.assert_array_equal(path.nin, [0, 1, 2, 3])
+        self.assertEqual(path.ca.shape, (3, 4))
+        np.testing.assert_array_equal(path.to_dense(), coef)
+        np.testing.assert_array_equal(path.coef(2), coef[:, 2])
+
+
+class TestModelFormat(unittest.TestCase):
+    """
+    A test suite for LogisticRegression.save and LogisticRegression.load.
+    """
+
+    def setUp(self):
+        """Fit a model and create a scratch directory."""
+        self.X, self.y = make_classification(
+            n_samples=200, n_features=20, n_informative=10, n_classes=2, random_state=42
+        )
+        self.model = LogisticRegression(alpha=1.0, nlambda=50).fit(self.X, self.y)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "model.glmpynet")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip_mmap(self):
+        """Tests that a memory-mapped model predicts like the original."""
+        self.model.save(self.path)
+        loaded = LogisticRegression.load(self.path)
+
+        self.assertEqual(loaded.get_params(), self.model.get_params())
+        np.testing.assert_array_equal(loaded.classes_, self.model.classes_)
+        np.testing.assert_array_equal(loaded.coef_, self.model.coef_)
+        np.testing.assert_array_equal(loaded.predict_proba(self.X), self.model.predict_proba(self.X))
+        np.testing.assert_array_equal(loaded.path_.to_dense(), self.model.path_.to_dense())
+
+    def test_mmap_arrays_are_read_only(self):
+        """Tests that mapped coefficient arrays are shared read-only pages."""
+        self.model.save(self.path)
+        loaded = LogisticRegression.load(self.path, mmap=True)
+        self.assertIsInstance(loaded.path_.ca, np.memmap)
+        self.assertFalse(loaded.coef_.flags.writeable)
+
+    def test_load_into_memory(self):
+        """Tests that mmap=False returns ordinary writable arrays."""
+        self.model.save(self.path)
+        loaded = LogisticRegression.load(self.path, mmap=False)
+        self.assertNotIsInstance(loaded.path_.ca, np.memmap)
+        self.assertTrue(loaded.coef_.flags.writeable)
+        np.testing.assert_array_equal(loaded.predict(self.X), self.model.predict(self.X))
+
+    def test_string_classes(self):
+        """Tests that non-integer class labels survive a round trip."""
+        y = np.where(self.y == 1, "spam", "ham")
+        model = LogisticRegression().fit(self.X, y)
+        model.save(self.path)
+        loaded = LogisticRegression.load(self.path)
+        np.testing.assert_array_equal(loaded.predict(self.X), model.predict(self.X))
+
+    def test_header(self):
+        """Tests that the header records the format version and array index."""
+        self.model.save(self.path)
+        header, data_start = read_header(self.path)
+        self.assertEqual(header["estimator"], "LogisticRegression")
+        self.assertEqual(data_start % 64, 0)
+        self.assertIn("ca", header["arrays"])
+        self.assertEqual(header["params"]["nlambda"], 50)
+
+    def test_rejects_other_files(self):
+        """Tests that files without the magic bytes are rejected."""
+        with open(self.path, "wb") as f:
+            f.write(b"not a model file at all")
+        with pytest.raises(ValueError, match="not a glmpynet model file"):
+            LogisticRegression.load(self.path)
+
+    def test_rejects_newer_format(self):
+        """Tests that files from a newer format version are rejected."""
+        self.model.save(self.path)
+        with open(self.path, "r+b") as f:
+            f.seek(8)
+            f.write((FORMAT_VERSION + 1).to_bytes(4, "little"))
+        with pytest.raises(ValueError, match="model format version"):
+            LogisticRegression.load(self.path)
+
+    def test_save_unfitted(self):
+        """Tests that an unfitted model cannot be saved."""
+        with self.assertRaises(Exception):
+            LogisticRegression().save(self.path)
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,80 @@
+import pickle
+import unittest
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+from sklearn.datasets import make_classification
+from sklearn.model_selection import GridSearchCV, cross_val_score
+
+from glmpynet.logistic_regression import LogisticRegression
+from glmpynet.shared import SharedDesign, share
+
+
+class TestSharedDesign(unittest.TestCase):
+    """
+    A test suite for publishing design matrices to worker processes.
+    """
+
+    def setUp(self):
+        self.X, self.y = make_classification(n_samples=300, n_features=8, random_state=0)
+        self.shared = share(self.X)
+
+    def tearDown(self):
+        self.shared.close()
+
+    def test_handle_pickles_small(self):
+        """Tests that a handle pickles to a reference, not to the data."""
+        payload = pickle.dumps(self.shared[np.arange(100)])
+        self.assertLess(len(payload), self.X.nbytes // 10)
+        attached = pickle.loads(payload)
+        np.testing.assert_array_equal(attached.matrix, self.X)
+        self.assertEqual(attached.shape, (100, 8))
+        attached.close()
+
+    def test_row_selection_is_a_view(self):
+        """Tests that selecting rows returns a handle over the same matrix."""
+        view = self.shared[np.array([3, 1, 3])][1:]
+        self.assertIsInstance(view, SharedDesign)
+        self.assertIs(view.matrix, self.shared.matrix)
+        np.testing.assert_array_equal(view.rows, [1, 3])
+        self.assertEqual(view.weights()[[1, 3]].tolist(), [1.0, 1.0])
+        self.assertEqual(view.weights().sum(), 2)
+
+    def test_fold_fit_matches_copied_fold(self):
+        """Tests that fitting a view equals fitting the sliced copy."""
+        rows = np.arange(0, 300, 2)
+        on_view = LogisticRegression(alpha=1.0).fit(self.shared[rows], self.y[rows])
+        on_copy = LogisticRegression(alpha=1.0, binding="reference").fit(self.X[rows], self.y[rows])
+        np.testing.assert_allclose(on_view.coef_, on_copy.coef_, atol=1e-8)
+        np.testing.assert_allclose(on_view.predict_proba(self.shared[rows]),
+                                   on_copy.predict_proba(self.X[rows]), atol=1e-8)
+
+    def test_grid_search_in_processes(self):
+        """Tests a process-based search on a shared design against in-memory data."""
+        grid = {"alpha": [0.0, 1.0]}
+        shared = GridSearchCV(LogisticRegression(), grid, cv=3, n_jobs=2).fit(self.shared, self.y)
+        local = GridSearchCV(LogisticRegression(), grid, cv=3).fit(self.X, self.y)
+        np.testing.assert_allclose(shared.cv_results_["mean_test_score"],
+                                   local.cv_results_["mean_test_score"])
+
+    def test_sparse_design(self):
+        """Tests that sparse matrices are shared through memory-mapped CSC arrays."""
+        X = csr_matrix(np.where(self.X > 0.5, self.X, 0.0))
+        with share(X) as shared:
+            scores = cross_val_score(LogisticRegression(), shared, self.y, cv=3)
+        expected = cross_val_score(LogisticRegression(), X, self.y, cv=3)
+        np.testing.assert_allclose(scores, expected)
+
+    def test_close_unlinks(self):
+        """Tests that closing the publishing handle frees the shared block."""
+        shared = share(self.X)
+        name = shared._location
+        shared.close()
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
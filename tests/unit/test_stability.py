@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+import pytest
+from scipy.sparse import csc_matrix
+from sklearn.datasets import make_classification
+from sklearn.utils._param_validation import InvalidParameterError
+
+from glmpynet.binding.reference import ReferenceGlmNetBinding
+from glmpynet.stability import StabilityPath, stability_path
+
+
+class TestStabilityPath(unittest.TestCase):
+    """
+    A test suite for stability selection with stability_path.
+    """
+
+    def setUp(self):
+        """Build a dataset whose first four features are informative."""
+        self.X, self.y = make_classification(
+            n_samples=300, n_features=20, n_informative=4, n_redundant=0,
+            shuffle=False, random_state=0
+        )
+        self.kwargs = dict(n_resamples=12, nlambda=15, lambda_min_ratio=0.1, random_state=0)
+
+    def test_frequencies_match_fits_on_copies(self):
+        """Tests that weighted resamples select what fits on copied subsamples select."""
+        stability = stability_path(self.X, self.y, **self.kwargs)
+        self.assertIsInstance(stability, StabilityPath)
+        self.assertEqual(stability.frequencies_.shape, (20, 15))
+
+        binding = ReferenceGlmNetBinding()
+        rng = np.random.RandomState(0)
+        counts = np.zeros((20, 15))
+        for _ in range(12):
+            rows = rng.choice(300, 150, replace=False)
+            results = binding.fit(self.X[rows], self.y[rows], alpha=1.0, nlambda=15,
+                                  lambdas=stability.lambdas_)
+            nx, lmu = len(results['ia']), results['lmu']
+            counts[results['ia'], :lmu] += results['ca'][:nx, :lmu] != 0
+        np.testing.assert_allclose(stability.frequencies_, counts / 12)
+
+    def test_informative_features_are_stable(self):
+        """Tests that only informative features are stable."""
+        stability = stability_path(self.X, self.y, **self.kwargs)
+        np.testing.assert_array_equal(stability.selected(0.9), [1, 2, 3])
+        # The grid is decreasing and selections grow along it.
+        self.assertTrue(np.all(np.diff(stability.lambdas_) < 0))
+        self.assertLess(stability.frequencies_[:, 0].sum(), stability.frequencies_[:, -1].sum())
+
+    def test_default_path_stops_at_the_sparse_end(self):
+        """Tests that the default path ends before the mean model size exceeds sqrt(0.8 p)."""
+        kwargs = dict(self.kwargs, lambda_min_ratio=None, nlambda=50)
+        stability = stability_path(self.X, self.y, **kwargs)
+        full = stability_path(self.X, self.y, **dict(kwargs, lambda_min_ratio=1e-4))
+
+        n_kept = len(stability.lambdas_)
+        self.assertLess(n_kept, len(full.lambdas_))
+        np.testing.assert_allclose(stability.lambdas_, full.lambdas_[:n_kept])
+        np.testing.assert_allclose(stability.frequencies_, full.frequencies_[:, :n_kept])
+        model_sizes = stability.frequencies_.sum(axis=0)
+        self.assertTrue(np.all(model_sizes <= np.sqrt(0.8 * 20)))
+        self.assertGreater(full.frequencies_[:, n_kept].sum(), np.sqrt(0.8 * 20))
+        self.assertLess(len(stability.selected(0.6)), len(full.selected(0.6)))
+
+    def test_processes_and_sparse_input(self):
+        """Tests that the process pool and sparse input give the same frequencies."""
+        sequential = stability_path(self.X, self.y, **self.kwargs)
+        for X in (self.X, csc_matrix(self.X)):
+            parallel = stability_path(X, self.y, n_jobs=-2, **self.kwargs)
+            np.testing.assert_allclose(parallel.frequencies_, sequential.frequencies_)
+
+    def test_invalid_input(self):
+        """Tests parameter and target validation."""
+        with pytest.raises(InvalidParameterError):
+            stability_path(self.X, self.y, sample_fraction=0.0)
+        with pytest.raises(InvalidParameterError):
+            stability_path(self.X, self.y, alpha=0.0)
+        with pytest.raises(ValueError, match="Only binary"):
+            stability_path(self.X, np.arange(300) % 3)
+        for n_jobs in (0, 1.5, True):
+            with pytest.raises(InvalidParameterError, match="n_jobs"):
+                stability_path(self.X, self.y, n_jobs=n_jobs)
+        with pytest.raises(InvalidParameterError):
+            StabilityPath(np.ones(2), np.zeros((3, 2)), 1).selected(threshold=1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+from sklearn.datasets import make_classification
+
+from glmpynet.logistic_regression import LogisticRegression
+from glmpynet.storage import (
+    check_on_disk_X_y,
+    is_on_disk,
+    open_csc,
+    open_npy,
+    save_csc,
+    save_fortran_npy,
+)
+
+
+class TestOnDiskFitting(unittest.TestCase):
+    """
+    A test suite for fitting on memory-mapped design matrices.
+    """
+
+    def setUp(self):
+        """Write a dense and a sparse copy of a dataset to a scratch directory."""
+        self.X, self.y = make_classification(
+            n_samples=200, n_features=20, n_informative=10, n_classes=2, random_state=42
+        )
+        self.X[np.abs(self.X) < 0.5] = 0.0
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.npy_path = os.path.join(self.tmpdir.name, "X.npy")
+        self.csc_dir = os.path.join(self.tmpdir.name, "X_csc")
+        save_fortran_npy(self.npy_path, self.X)
+        save_csc(self.csc_dir, csr_matrix(self.X))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_open_npy_is_fortran_memmap(self):
+        """Tests that a saved dense matrix opens as a Fortran-order memory map."""
+        X = open_npy(self.npy_path)
+        self.assertTrue(is_on_disk(X))
+        self.assertTrue(X.flags.f_contiguous)
+        np.testing.assert_array_equal(X, self.X)
+
+    def test_open_csc_shares_memory_maps(self):
+        """Tests that the CSC arrays are memory maps rather than copies."""
+        X = open_csc(self.csc_dir)
+        self.assertTrue(is_on_disk(X))
+        self.assertEqual(X.format, "csc")
+        np.testing.assert_array_equal(X.toarray(), self.X)
+
+    def test_in_memory_inputs_are_not_on_disk(self):
+        """Tests that ordinary arrays and sparse matrices take the usual path."""
+        self.assertFalse(is_on_disk(self.X))
+        self.assertFalse(is_on_disk(csr_matrix(self.X)))
+
+    def test_check_returns_input_unchanged(self):
+        """Tests that chunked validation hands back the very same object."""
+        X = open_npy(self.npy_path)
+        X_checked, y_checked = check_on_disk_X_y(X, self.y, chunk_bytes=256)
+        self.assertIs(X_checked, X)
+        np.testing.assert_array_equal(y_checked, self.y)
+
+    def test_check_finds_non_finite_values(self):
+        """Tests that a NaN in a late chunk is still detected."""
+        X = self.X.copy()
+        X[-1, -1] = np.nan
+        save_fortran_npy(self.npy_path, X)
+        with pytest.raises(ValueError, match="NaN or infinity"):
+            check_on_disk_X_y(open_npy(self.npy_path), self.y, chunk_bytes=256)
+
+    def test_check_rejects_inconsistent_lengths(self):
+        """Tests that X and y must have the same number of samples."""
+        with self.assertRaises(ValueError):
+            check_on_disk_X_y(open_npy(self.npy_path), self.y[:-1])
+
+    def test_fit_dense_memmap(self):
+        """Tests that fitting on a memory map matches fitting in memory."""
+        on_disk = LogisticRegression().fit(open_npy(self.npy_path), self.y)
+        in_memory = LogisticRegression(binding="reference").fit(self.X, self.y)
+        np.testing.assert_allclose(on_disk.coef_, in_memory.coef_)
+        self.assertEqual(on_disk.n_features_in_, self.X.shape[1])
+
+    def test_fit_sparse_memmap(self):
+        """Tests that fitting on memory-mapped CSC arrays works."""
+        model = LogisticRegression().fit(open_csc(self.csc_dir), self.y)
+        self.assertEqual(model.coef_.shape, (1, self.X.shape[1]))
+        self.assertEqual(model.predict(open_csc(self.csc_dir)).shape, self.y.shape)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)